@@ -0,0 +1,255 @@
+"""
+계산기 마이크로 벤치마크 (처리량 / 지연 시간 + 기준선 회귀 검사)
+
+SmartCalculator.evaluate와 배치 경로를 수식 종류(단순 / 함수 / 깊은 중첩 / 긴 수식)별로,
+캐시가 빈 상태(cold)와 채워진 상태(warm)에서 측정한다. 정밀도 모드(float / fraction / decimal)별
+비용과, 계산기 하나를 스레드 여러 개가 공유할 때의 처리량도 함께 잰다.
+
+절대 처리량은 기계마다 다르므로 기준선과는 비율로 비교한다. 계산기와 무관한 순수 파이썬
+루프(reference/python)를 함께 재고, 각 케이스를 그 처리량으로 나눈 값끼리 비교하므로 다른
+기계에서 기록한 기준선으로도 대략적인 회귀를 잡을 수 있다. (인터프리터 버전이나 CPU 종류가
+크게 다르면 비율도 달라지므로, 그때는 --update-baseline으로 그 기계에서 다시 기록할 것)
+
+사용법:
+    uv run python benchmarks/bench_calculator.py                      # 결과 출력 + 기준선과 비교
+    uv run python benchmarks/bench_calculator.py -o results.json      # 결과를 JSON으로 저장
+    uv run python benchmarks/bench_calculator.py --update-baseline    # 현재 결과를 기준선으로 저장
+    uv run python benchmarks/bench_calculator.py --threshold 0.25     # 25% 넘게 느려지면 실패 (종료 코드 1)
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.smart_calculator.batch import run_batch
+from src.smart_calculator.calculator import SmartCalculator
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+# 기계 속도 기준 케이스 (다른 케이스는 이 처리량에 대한 비율로 기준선과 비교)
+REFERENCE = 'reference/python'
+
+def _nested(depth: int) -> str:
+    expression = '1'
+    for i in range(depth):
+        expression = f"({expression} {'+-*/'[i % 4]} {i % 7 + 2})"
+    return expression
+
+WORKLOADS: Dict[str, List[str]] = {
+    'simple': ['2 + 3 * 4', '10 - 4 / 2', '(1 + 2) * (3 + 4)', '2 ** 10 - 1', '17 // 5 + 0.5'],
+    'functions': [
+        'sqrt(16) + sin(pi / 4) * cos(pi / 4)',
+        'log(e ** 2) + exp(1.5) - log10(1000)',
+        'atan(1) * 4 + tanh(0.5) + floor(3.7) + ceil(2.1)',
+        'abs(-3.5) + round(2.675) + log2(1024) + cosh(0.3)',
+    ],
+    'nested': [_nested(30), _nested(60)],
+    'long': [' + '.join(f'{i} * {i % 5 + 1}' for i in range(200)),
+             ' * '.join(['1.0001'] * 150)],
+}
+
+# 정밀도 모드 비교용 (금액 계산 같은 10진 소수 연산 + 함수, 변수가 있어 상수 접기로 사라지지 않음)
+PRECISION_VARIABLES = {'price': '19.99', 'rate': '0.035', 'qty': '3'}
+PRECISION_WORKLOAD = [
+    'price * qty - 4.5 / 2', '(1 + rate / 12) ** 12 - 1', 'price * qty * (1 + 0.0725) + 0.01',
+    'round(price * rate, 2) + 0.1 + 0.2', 'sqrt(price) * 100 + price / 7',
+]
+
+def _percentile(sorted_ns: List[int], fraction: float) -> float:
+    return sorted_ns[min(len(sorted_ns) - 1, int(round(fraction * (len(sorted_ns) - 1))))] / 1000
+
+def measure(operation: Callable[[], Any], duration: float, rounds: int = 3, ops_per_call: int = 1) -> Dict[str, Any]:
+    """
+    duration초씩 rounds번 반복 실행하며 호출마다 지연 시간 기록
+
+    처리량은 잡음을 줄이기 위해 가장 빠른 라운드 값을 쓰고, 백분위는 전체 표본으로 계산한다.
+    한 호출이 여러 연산이면(배치) 연산당 값으로 환산한다.
+    """
+    operation()  # 워밍업 (임포트, 지연 초기화)
+    samples: List[int] = []
+    best = 0.0
+    clock = time.perf_counter_ns
+    for _ in range(max(1, rounds)):
+        calls = 0
+        started = clock()
+        deadline = started + int(duration * 1e9)
+        while True:
+            before = clock()
+            operation()
+            after = clock()
+            samples.append((after - before) // ops_per_call)
+            calls += 1
+            if after >= deadline and calls >= 10:
+                break
+        best = max(best, calls * ops_per_call / ((clock() - started) / 1e9))
+    samples.sort()
+    return {
+        'ops': len(samples) * ops_per_call,
+        'ops_per_sec': best,
+        'p50_us': _percentile(samples, 0.50),
+        'p99_us': _percentile(samples, 0.99),
+    }
+
+def _cycle(items: List[str]) -> Callable[[], str]:
+    state = {'index': 0}
+    def next_item() -> str:
+        item = items[state['index'] % len(items)]
+        state['index'] += 1
+        return item
+    return next_item
+
+def _reference_work() -> int:
+    """계산기 코드를 쓰지 않는 고정된 파이썬 작업 (함수 호출, 딕셔너리, 문자열, 정수 연산)"""
+    table: Dict[str, int] = {}
+    total = 0
+    for i in range(200):
+        key = str(i % 17)
+        table[key] = table.get(key, 0) + i
+        total += len(key) * (i & 7)
+    return total + sum(table.values())
+
+def run_benchmarks(duration: float = 0.5, rounds: int = 3) -> Dict[str, Dict[str, Any]]:
+    """모든 케이스 실행, {케이스 이름: 결과}"""
+    results: Dict[str, Dict[str, Any]] = {REFERENCE: measure(_reference_work, duration, rounds)}
+
+    for name, expressions in WORKLOADS.items():
+        # cold: 캐시 크기 0 -> 매번 파싱/컴파일
+        cold = SmartCalculator(cache_size=0)
+        next_expression = _cycle(expressions)
+        results[f'evaluate/{name}/cold'] = measure(lambda: cold.evaluate(next_expression()), duration, rounds)
+
+        warm = SmartCalculator()
+        for expression in expressions:
+            warm.evaluate(expression)
+        next_expression = _cycle(expressions)
+        results[f'evaluate/{name}/warm'] = measure(lambda: warm.evaluate(next_expression()), duration, rounds)
+
+    # 배치: 모든 종류를 섞은 입력을 한 번 통과하는 것이 한 호출
+    corpus = [expression for expressions in WORKLOADS.values() for expression in expressions] * 20
+    def batch_pass(calc: SmartCalculator):
+        for _ in run_batch(corpus, calc, chunk_size=100):
+            pass
+    cold = SmartCalculator(cache_size=0, history_size=0)
+    results['batch/mixed/cold'] = measure(lambda: batch_pass(cold), duration, rounds, len(corpus))
+    warm = SmartCalculator(history_size=0)
+    results['batch/mixed/warm'] = measure(lambda: batch_pass(warm), duration, rounds, len(corpus))
+
+    # 정밀도 모드별 비용 (같은 수식, float / fraction / decimal 28자리 / decimal 50자리)
+    for label, mode, digits in (('float', 'float', None), ('fraction', 'fraction', None),
+                                ('decimal28', 'decimal', None), ('decimal50', 'decimal', 50)):
+        cold = SmartCalculator(cache_size=0, precision=mode, digits=digits)
+        warm = SmartCalculator(precision=mode, digits=digits)
+        for calc in (cold, warm):
+            for name, value in PRECISION_VARIABLES.items():
+                calc.assign(name, value)
+        next_expression = _cycle(PRECISION_WORKLOAD)
+        results[f'precision/{label}/cold'] = measure(lambda: cold.evaluate(next_expression()), duration, rounds)
+        next_expression = _cycle(PRECISION_WORKLOAD)
+        results[f'precision/{label}/warm'] = measure(lambda: warm.evaluate(next_expression()), duration, rounds)
+
+    # 스레드: 계산기 하나를 여러 스레드가 공유 (스레드 생성 비용 포함, 한 호출 = 스레드당 200회)
+    shared = SmartCalculator()
+    expressions = WORKLOADS['simple'] + WORKLOADS['functions']
+    def threaded_pass(count: int):
+        def work():
+            for i in range(200):
+                shared.evaluate(expressions[i % len(expressions)])
+        threads = [threading.Thread(target=work) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    for count in (1, 4):
+        results[f'threads/{count}/warm'] = measure(lambda: threaded_pass(count), duration, rounds, count * 200)
+    return results
+
+def _scale(results: Dict[str, Dict[str, Any]]) -> Optional[float]:
+    """기준 케이스 처리량 (없으면 None - 예전 기준선)"""
+    return results.get(REFERENCE, {}).get('ops_per_sec') or None
+
+def change(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], name: str) -> Optional[float]:
+    """
+    기준선 대비 처리량 비율 (1.0 = 같음, 비교할 수 없으면 None)
+
+    양쪽에 기준 케이스가 있으면 각자 그 처리량으로 나눈 값끼리 비교해 기계 속도 차이를 지우고,
+    없으면(기준 케이스 전에 기록한 기준선) 절대 처리량끼리 비교한다.
+    """
+    reference = baseline.get(name, {}).get('ops_per_sec')
+    if not reference or name == REFERENCE:
+        return None
+    ratio = results[name]['ops_per_sec'] / reference
+    current_scale, baseline_scale = _scale(results), _scale(baseline)
+    if current_scale and baseline_scale:
+        ratio *= baseline_scale / current_scale
+    return ratio
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float) -> List[str]:
+    """기준선보다 (기계 속도를 보정한) 처리량이 threshold 비율 넘게 떨어진 케이스 설명 목록"""
+    regressions = []
+    basis = 'normalized' if _scale(results) and _scale(baseline) else 'absolute'
+    for name, result in results.items():
+        ratio = change(results, baseline, name)
+        if ratio is not None and ratio < 1 - threshold:
+            regressions.append(f"{name}: {result['ops_per_sec']:,.0f} ops/s vs baseline "
+                               f"{baseline[name]['ops_per_sec']:,.0f} ({(ratio - 1) * 100:+.1f}% {basis})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Calculator throughput / latency benchmark")
+    parser.add_argument("-o", "--output", help="write results JSON to this path")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed throughput drop vs baseline before failing (0.15 = 15%%)")
+    parser.add_argument("--duration", type=float, default=0.5, help="seconds per round")
+    parser.add_argument("--rounds", type=int, default=3, help="rounds per case (best throughput is kept)")
+    options = parser.parse_args()
+
+    results = run_benchmarks(options.duration, options.rounds)
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'duration': options.duration,
+            'rounds': options.rounds,
+        },
+        'results': results,
+    }
+
+    baseline = {}
+    if os.path.exists(options.baseline) and not options.update_baseline:
+        with open(options.baseline, encoding='utf-8') as f:
+            baseline = json.load(f).get('results', {})
+
+    if baseline and not (_scale(baseline) and _scale(results)):
+        print(f"(baseline has no {REFERENCE} case - comparing absolute ops/sec, "
+              "re-record it with --update-baseline on this machine)")
+    print(f"{'case':<28} {'ops/sec':>12} {'p50 (us)':>10} {'p99 (us)':>10} {'vs base':>9}")
+    for name, result in results.items():
+        ratio = change(results, baseline, name)
+        shown = f"{(ratio - 1) * 100:+8.1f}%" if ratio is not None else f"{'-':>9}"
+        print(f"{name:<28} {result['ops_per_sec']:12,.0f} {result['p50_us']:10.2f} {result['p99_us']:10.2f} {shown}")
+
+    for path in filter(None, [options.output, options.baseline if options.update_baseline else None]):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"Wrote {path}")
+
+    regressions = compare(results, baseline, options.threshold)
+    if regressions:
+        print(f"\nThroughput regressions (> {options.threshold:.0%} slower than baseline):")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
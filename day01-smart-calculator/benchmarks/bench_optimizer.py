@@ -0,0 +1,54 @@
+"""
+상수 접기 / 공통 부분식 제거 벤치마크
+
+사용법:
+    uv run python benchmarks/bench_optimizer.py [formulas.txt] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.smart_calculator.compiler import compile_expression
+
+BINDINGS = {'r': 1.75, 'x': 0.3, 'y': 2.5}
+
+def load_formulas(path):
+    with open(path, encoding='utf-8') as f:
+        return [line.strip().lower() for line in f if line.strip() and not line.startswith('#')]
+
+def time_formula(compiled, bindings, repeat):
+    function = compiled.function
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(**bindings)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare optimized and unoptimized compiled formulas")
+    parser.add_argument("corpus", nargs="?", default=os.path.join(os.path.dirname(__file__), "formulas.txt"))
+    parser.add_argument("--repeat", type=int, default=100_000)
+    options = parser.parse_args()
+
+    total_plain = total_optimized = 0.0
+    print(f"{'plain (us)':>11} {'optimized (us)':>15} {'speedup':>8}  formula")
+    for formula in load_formulas(options.corpus):
+        variables = [name for name in BINDINGS if name in formula]
+        bindings = {name: BINDINGS[name] for name in variables}
+        plain = compile_expression(formula, variables, optimize=False)
+        optimized = compile_expression(formula, variables, optimize=True)
+        assert abs(plain.evaluate(bindings) - optimized.evaluate(bindings)) <= 1e-9 * max(1.0, abs(plain.evaluate(bindings)))
+
+        t_plain = time_formula(plain, bindings, options.repeat)
+        t_optimized = time_formula(optimized, bindings, options.repeat)
+        total_plain += t_plain
+        total_optimized += t_optimized
+        print(f"{t_plain / options.repeat * 1e6:11.3f} {t_optimized / options.repeat * 1e6:15.3f} "
+              f"{t_plain / t_optimized:7.2f}x  {formula}")
+
+    print(f"\nTotal speedup: {total_plain / total_optimized:.2f}x")
+
+if __name__ == "__main__":
+    main()
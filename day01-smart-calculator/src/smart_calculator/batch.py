@@ -0,0 +1,133 @@
+"""
+스트리밍 배치 계산
+
+입력을 한 줄씩 읽어 계산하고 바로 출력한다. 메모리에는 처리 중인 청크만 올라가므로
+입력 크기와 관계없이 사용량이 일정하다.
+"""
+import csv
+import json
+import math
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .calculator import SmartCalculator, CalculatorError
+
+# (줄 번호, 수식, 결과, 오류 메시지)
+BatchResult = Tuple[int, str, Any, Optional[str]]
+
+FORMATS = ('text', 'jsonl', 'csv')
+
+def iter_expressions(stream: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """빈 줄과 '#' 주석을 건너뛰며 (줄 번호, 수식) 생성"""
+    for line_no, line in enumerate(stream, 1):
+        expression = line.strip()
+        if expression and not expression.startswith('#'):
+            yield line_no, expression
+
+def iter_chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """size개씩 묶어서 생성"""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def evaluate_chunk(calc: SmartCalculator, chunk: List[Tuple[int, str]]) -> List[BatchResult]:
+    """청크 하나 계산 (히스토리에는 기록하지 않음)"""
+    results = []
+    for line_no, expression in chunk:
+        try:
+            results.append((line_no, expression, calc.evaluate(expression, record=False), None))
+        except CalculatorError as e:
+            results.append((line_no, expression, None, str(e)))
+    return results
+
+_worker_calc: Optional[SmartCalculator] = None
+
+def _evaluate_chunk_in_worker(chunk: List[Tuple[int, str]], timeout: Optional[float] = None) -> List[BatchResult]:
+    """프로세스 풀 작업 함수 (프로세스마다 계산기/캐시 하나를 재사용)"""
+    global _worker_calc
+    if _worker_calc is None:
+        _worker_calc = SmartCalculator(history_size=0)
+    _worker_calc.timeout = timeout
+    return evaluate_chunk(_worker_calc, chunk)
+
+def run_batch(stream: Iterable[str], calc: Optional[SmartCalculator] = None,
+              workers: int = 1, chunk_size: int = 1000,
+              timeout: Optional[float] = None) -> Iterator[BatchResult]:
+    """
+    입력 스트림을 계산해서 입력 순서대로 결과 생성
+
+    Args:
+        stream: 한 줄에 수식 하나씩 들어 있는 텍스트 스트림
+        calc: 단일 프로세스 모드에서 사용할 계산기
+        workers: 2 이상이면 청크를 프로세스 풀로 분산
+        chunk_size: 한 번에 처리할 줄 수
+        timeout: 한 줄 계산의 벽시계 제한 (초, 초과하면 그 줄만 오류로 기록)
+    """
+    chunks = iter_chunks(iter_expressions(stream), chunk_size)
+
+    if workers <= 1:
+        calc = calc or SmartCalculator(history_size=0)
+        if timeout is not None:
+            calc.timeout = timeout
+        for chunk in chunks:
+            yield from evaluate_chunk(calc, chunk)
+        return
+
+    # 진행 중인 청크 수를 제한해서 메모리를 일정하게 유지하고, 제출 순서대로 꺼내 순서 보장
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_evaluate_chunk_in_worker, chunk, timeout))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def json_value(result: Any) -> Any:
+    """JSON으로 표현할 수 없는 값(inf, nan, 복소수)은 문자열로, 배열은 리스트로"""
+    if hasattr(result, 'tolist'):
+        result = result.tolist()
+    if isinstance(result, list):
+        return [json_value(item) for item in result]
+    if isinstance(result, bool) or result is None:
+        return result
+    if isinstance(result, int):
+        return result
+    if isinstance(result, float) and math.isfinite(result):
+        return result
+    return str(result)
+
+class BatchWriter:
+    """계산 결과를 text / jsonl / csv 형식으로 한 줄씩 출력"""
+
+    def __init__(self, output: TextIO, fmt: str = 'text'):
+        if fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 출력 형식: {fmt} ({', '.join(FORMATS)})")
+        self.output = output
+        self.fmt = fmt
+        self.count = 0
+        self.errors = 0
+        self._csv = None
+        if fmt == 'csv':
+            self._csv = csv.writer(output)
+            self._csv.writerow(['line', 'expression', 'result', 'error'])
+
+    def write(self, item: BatchResult):
+        line_no, expression, result, error = item
+        self.count += 1
+        if error is not None:
+            self.errors += 1
+
+        if self.fmt == 'jsonl':
+            record = {'line': line_no, 'expression': expression,
+                      'result': json_value(result), 'error': error}
+            self.output.write(json.dumps(record, ensure_ascii=False) + '\n')
+        elif self.fmt == 'csv':
+            self._csv.writerow([line_no, expression, '' if result is None else result, error or ''])
+        elif error is not None:
+            self.output.write(f"{line_no}: {expression} -> Error: {error}\n")
+        else:
+            self.output.write(f"{line_no}: {expression} = {result}\n")
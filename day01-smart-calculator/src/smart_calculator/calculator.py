@@ -1,63 +1,433 @@
 """
 스마트 계산기 엔진
 """
-import math
-import re
-from datetime import datetime
-from typing import List, Dict, Any
+import threading
+from time import perf_counter_ns
+from typing import Iterable, List, Dict, Any, Optional, Tuple
+
+from .cells import CellGraph
+from .compiler import CompiledExpression, ExpressionCache
+from .history import HistoryBuffer
+from .limits import DEFAULT_MAX_DIGITS, time_limit
+from .matrix import summarize
+from .numeric import NUMERIC_COMMANDS, NumericResult, split_command
+from .precision import Precision
+from .profiling import PhaseProfiler
+from .registry import ArrayImpl, DEFAULT_REGISTRY, Registry
+from . import numeric
+from .storage import PersistentHistory
+
+# 히스토리에 그대로 남기는 결과 타입 (그 외 벡터/행렬은 요약해서 남김)
+_NUMBER_TYPES = (int, float)
 
 class CalculatorError(Exception):
     """계산기 예외"""
     pass
 
 class SmartCalculator:
-    def __init__(self):
-        self.history: List[Dict[str, Any]] = []
-        self.memory: float = 0.0
+    """
+    수식 계산기
+    
+    한 인스턴스를 여러 스레드가 함께 써도 된다. evaluate()는 잠금을 잡지 않는다
+    (컴파일 캐시는 공유, 히스토리는 스레드별 버퍼를 조회할 때 합침). 변수 정의 / 삭제와
+    함수 등록만 잠금으로 한 번에 하나씩 처리하고, 그 사이의 evaluate()는 변경 전이나 후의
+    값 중 하나를 본다. 시간 제한(timeout)은 메인 스레드에서만 적용된다.
+    
+    precision='fraction' / 'decimal'이면 같은 컴파일 과정에서 리터럴만 Fraction / Decimal로
+    바꿔 정확한 결과를 낸다 (0.1 + 0.2 == 3/10). 기본 float 모드의 평가 경로는 그대로다.
+    """
     
-    def evaluate(self, expression: str) -> float:
-        """수학 표현식 계산"""
+    def __init__(self, cache: Optional[ExpressionCache] = None, cache_size: int = 1024,
+                 history_size: Optional[int] = 1000, history_path: Optional[str] = None,
+                 max_digits: Optional[int] = DEFAULT_MAX_DIGITS, timeout: Optional[float] = None,
+                 profile: bool = False, registry: Optional[Registry] = None,
+                 precision: str = 'float', digits: Optional[int] = None):
+        # history_path가 있으면 SQLite에 영구 저장, 없으면 최근 history_size개만 메모리에 보관
+        # (None: 제한 없음, 0: 기록 끔)
+        if history_path is not None:
+            self.history = PersistentHistory(history_path)
+        else:
+            self.history = HistoryBuffer(history_size)
+        # 같은 수식은 한 번만 파싱/컴파일 (여러 계산기가 캐시를 공유할 수 있음)
+        # max_digits: 정수 결과 자릿수 예산 (컴파일 시 검사), timeout: 평가 1회의 벽시계 제한 (초)
+        # 함수/상수 레지스트리와 정밀도 모드는 캐시에 딸려 있음 (캐시를 공유하면 함께 공유)
+        if cache is None:
+            try:
+                mode = Precision(precision, digits)
+            except ValueError as e:
+                raise CalculatorError(str(e))
+            cache = ExpressionCache(cache_size, max_digits,
+                                    registry if registry is not None else DEFAULT_REGISTRY.copy(), mode)
+        self.cache = cache
+        self.registry = cache.registry
+        self.timeout = timeout
+        # 이름 붙은 결과 (a = 3, b = a * 2 ...)
+        self.cells = CellGraph(self.cache)
+        # 변수 정의 / 삭제, 함수 등록을 직렬화 (evaluate는 잡지 않음)
+        self._write_lock = threading.RLock()
+        # 단계별 시간 측정 (None이면 꺼짐 - evaluate()는 속성 검사 한 번만 추가로 함)
+        self.profiler: Optional[PhaseProfiler] = PhaseProfiler() if profile else None
+    
+    def evaluate(self, expression: str, record: bool = True) -> float:
+        """
+        수학 표현식 계산 (record=False면 히스토리에 남기지 않음)
+        
+        프로파일링이 켜져 있으면 같은 경로에서 단계별 시간을 기록한다 (꺼져 있으면 단계마다
+        None 검사 한 번씩만 추가됨).
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.calls += 1
+            start = perf_counter_ns()
         try:
             # 기본 정리
             expression = expression.strip().lower()
-            original_expr = expression
+            if profiler is not None:
+                start = profiler.lap('normalize', start)
+            
+            if expression.startswith(NUMERIC_COMMANDS) and self.is_numeric_command(expression):
+                # integrate(sin(x), 0, pi) 같은 수치 해석 명령
+                result = self.evaluate_numeric(expression, record).value
+                if profiler is not None:
+                    profiler.lap('numeric', start)
+                return result
             
-            # 특수 함수 처리
-            expression = self._process_functions(expression)
+            # 컴파일 (캐시 적중 시 파싱 생략, 프로파일링 중이면 미스는 compile / 적중은 cache로 기록)
+            # 정의된 변수가 있으면 수식의 이름을 변수로 추론해서 셀 값을 바인딩
+            misses = self.cache.misses
+            compiled = self.cache.get(expression, infer=bool(self.cells.cells))
+            if profiler is not None:
+                start = profiler.lap('compile' if self.cache.misses != misses else 'cache', start)
             
-            # 안전한 계산을 위한 문자 검증 (수학 함수 허용)
-            if not re.match(r'^[0-9+\-*/().\sa-z_]+$', expression):
-                raise CalculatorError("허용되지 않은 문자가 포함되어 있습니다")
+            bindings = None
+            if compiled.variables:
+                bindings = self.cells.bindings(compiled.variables)
+                if profiler is not None:
+                    start = profiler.lap('bind', start)
             
             # 계산 실행
-            result = eval(expression)
+            if self.timeout:
+                with time_limit(self.timeout):
+                    result = compiled.evaluate(bindings)
+            else:
+                result = compiled.evaluate(bindings)
+            if profiler is not None:
+                start = profiler.lap('evaluate', start)
             
             # 히스토리 저장
-            self.history.append({
-                'expression': original_expr,
-                'result': result,
-                'timestamp': datetime.now().isoformat()
-            })
+            if record:
+                self.history.append(expression, result if type(result) in _NUMBER_TYPES else summarize(result))
+                if profiler is not None:
+                    profiler.lap('history', start)
             
             return result
             
+        except CalculatorError:
+            if profiler is not None:
+                profiler.errors += 1
+            raise
         except ZeroDivisionError:
+            if profiler is not None:
+                profiler.errors += 1
             raise CalculatorError("0으로 나눌 수 없습니다")
         except Exception as e:
+            if profiler is not None:
+                profiler.errors += 1
             raise CalculatorError(f"계산 오류: {str(e)}")
     
-    def _process_functions(self, expression: str) -> str:
-        """수학 함수 처리"""
-        # sqrt(x) -> math.sqrt(x)
-        expression = re.sub(r'sqrt\(([^)]+)\)', r'math.sqrt(\1)', expression)
-        # pi, e 상수
-        expression = expression.replace('pi', str(math.pi))
-        expression = expression.replace('e', str(math.e))
-        return expression
+    def enable_profiling(self):
+        """단계별 시간 측정 시작 (이미 켜져 있으면 누적 유지)"""
+        if self.profiler is None:
+            self.profiler = PhaseProfiler()
+    
+    def disable_profiling(self):
+        """단계별 시간 측정 중지 (모은 통계도 버림)"""
+        self.profiler = None
+    
+    def reset_stats(self):
+        """단계별 통계와 캐시 적중/미스 횟수 초기화"""
+        if self.profiler is not None:
+            self.profiler.reset()
+        self.cache.hits = self.cache.misses = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        계산기 상태와 성능 통계
+        
+        Returns:
+            {'profiling': 켜짐 여부, 'precision': 정밀도 모드, 'cache': 캐시 통계, 'history': 기록 수, 'variables': 변수 수,
+             'calls', 'errors', 'total_ms', 'phases': {단계: {'count', 'total_ms', 'mean_us', 'share'}}}
+            (마지막 네 항목은 프로파일링이 켜져 있을 때만)
+        """
+        stats: Dict[str, Any] = {
+            'profiling': self.profiler is not None,
+            'precision': str(self.precision),
+            'cache': self.cache_stats(),
+            'history': len(self.history),
+            'variables': len(self.cells),
+        }
+        if self.profiler is not None:
+            stats.update(self.profiler.stats())
+        return stats
+    
+    def assign(self, name: str, expression: str) -> List[Tuple[str, Any, Optional[str]]]:
+        """
+        이름 붙은 결과 정의 (예: calc.assign('b', 'a * 2 + sqrt(a)'))
+        
+        name을 참조하는 셀들만 위상 정렬 순서로 다시 계산한다.
+        
+        Returns:
+            [(이름, 값, 오류)] - 다시 계산된 셀들 (name 자신이 첫 번째)
+        """
+        name = name.strip().lower()
+        expression = expression.strip().lower()
+        try:
+            with self._write_lock, time_limit(self.timeout):
+                updates = self.cells.assign(name, expression)
+        except Exception as e:
+            raise CalculatorError(f"변수 정의 오류: {str(e)}")
+        
+        _, value, error = updates[0]
+        if error is None:
+            self.history.append(f"{name} = {expression}", summarize(value))
+        return updates
+    
+    # ------------------------------------------------------------------ 함수 / 상수 등록
+    def register_function(self, name: str, scalar: Any, ufunc: Optional[ArrayImpl] = None,
+                          min_args: int = 1, max_args: Optional[int] = 1, pure: bool = True,
+                          int_result: bool = False) -> List[Tuple[str, Any, Optional[str]]]:
+        """
+        수식에서 쓸 함수 등록 (예: calc.register_function('sigmoid', f, ufunc=vf))
+        
+        Args:
+            scalar: 스칼라 구현
+            ufunc: NumPy 구현 (numpy 속성 이름 또는 배열 함수). 없으면 evaluate_array는
+                   fallback=True일 때만 원소별로 계산한다.
+            min_args / max_args: 인자 개수 (max_args=None이면 가변 인자)
+            pure: False면 상수 인자라도 컴파일 시점에 미리 계산하지 않음 (난수 등)
+            int_result: 정수 인자에 정수를 돌려주는 함수 (계산 비용 추정용)
+            
+        Returns:
+            다시 계산된 변수들 [(이름, 값, 오류)]
+        """
+        return self._change_registry(name, lambda: self.registry.register_function(
+            name, scalar, ufunc, min_args, max_args, pure, int_result))
+    
+    def register_constant(self, name: str, value: float) -> List[Tuple[str, Any, Optional[str]]]:
+        """수식에서 쓸 상수 등록"""
+        return self._change_registry(name, lambda: self.registry.register_constant(name, value))
+    
+    def unregister(self, name: str) -> List[Tuple[str, Any, Optional[str]]]:
+        """등록한 함수/상수 해제 (기본 함수도 해제할 수 있음)"""
+        return self._change_registry(name, lambda: self.registry.unregister(name))
+    
+    def _change_registry(self, name: str, change) -> List[Tuple[str, Any, Optional[str]]]:
+        if isinstance(name, str) and name in self.cells:
+            raise CalculatorError(f"변수로 쓰이고 있는 이름입니다: {name}")
+        if name in NUMERIC_COMMANDS:
+            raise CalculatorError(f"예약된 이름입니다: {name}")
+        with self._write_lock:
+            saved = self.registry.copy()
+            try:
+                change()
+                # 변수들은 컴파일된 함수를 들고 있으므로 새 레지스트리로 다시 컴파일
+                return self.cells.refresh()
+            except Exception as e:
+                self.registry.restore(saved)
+                raise CalculatorError(f"함수/상수 등록 오류: {str(e)}")
+    
+    # ------------------------------------------------------------------ 정밀도
+    @property
+    def precision(self) -> Precision:
+        """현재 정밀도 모드"""
+        return self.cache.precision
+    
+    def set_precision(self, mode: str, digits: Optional[int] = None) -> List[Tuple[str, Any, Optional[str]]]:
+        """
+        정밀도 모드 변경 ('float' / 'fraction' / 'decimal', decimal은 digits 자리)
+        
+        컴파일 캐시를 비우고 변수들을 새 모드로 다시 계산한다.
+        
+        Returns:
+            다시 계산된 변수들 [(이름, 값, 오류)]
+        """
+        try:
+            precision = Precision(mode, digits)
+        except ValueError as e:
+            raise CalculatorError(str(e))
+        with self._write_lock:
+            previous = self.cache.precision
+            self.cache.set_precision(precision)
+            try:
+                return self.cells.refresh()
+            except Exception as e:
+                self.cache.set_precision(previous)
+                self.cells.refresh()
+                raise CalculatorError(f"정밀도 변경 오류: {str(e)}")
+    
+    def get_variable(self, name: str) -> Any:
+        """변수 값 조회"""
+        try:
+            return self.cells.get(name.strip().lower())
+        except Exception as e:
+            raise CalculatorError(str(e))
+    
+    def delete_variable(self, name: str) -> List[Tuple[str, Any, Optional[str]]]:
+        """변수 삭제 (참조하던 셀들은 오류 상태로 다시 계산됨)"""
+        try:
+            with self._write_lock:
+                return self.cells.delete(name.strip().lower())
+        except Exception as e:
+            raise CalculatorError(str(e))
+    
+    @property
+    def variables(self) -> Dict[str, Any]:
+        """정의된 변수와 현재 값"""
+        return self.cells.values()
+    
+    def compile(self, expression: str, vars: Iterable[str] = ()) -> CompiledExpression:
+        """
+        수식을 컴파일해서 반환 (캐시 사용)
+        
+        Args:
+            expression: 수식 문자열
+            vars: 수식에서 사용할 자유 변수 이름들 (예: ('x', 'y'))
+            
+        Returns:
+            evaluate()/evaluate_array()로 반복 평가할 수 있는 CompiledExpression
+        """
+        try:
+            return self.cache.get(expression.strip().lower(), vars)
+        except Exception as e:
+            raise CalculatorError(f"컴파일 오류: {str(e)}")
+    
+    def evaluate_array(self, expression: str, bindings: Optional[Dict[str, Any]] = None,
+                       fallback: bool = False, **arrays: Any) -> Any:
+        """
+        자유 변수가 있는 수식을 NumPy 배열 전체에 대해 한 번에 계산
+        
+        예: calc.evaluate_array("x**2 + sqrt(y)", x=xs, y=ys)
+        
+        Args:
+            expression: 수식 문자열
+            bindings: {'변수명': 배열} (키워드 인자와 합쳐짐)
+            fallback: 벡터화할 수 없는 함수가 있을 때 원소별 스칼라 평가 허용
+            
+        Returns:
+            결과 numpy 배열 (히스토리에는 기록하지 않음)
+        """
+        values = {**(bindings or {}), **arrays}
+        compiled = self.compile(expression, values.keys())
+        try:
+            return compiled.evaluate_array(values, fallback=fallback)
+        except Exception as e:
+            raise CalculatorError(f"배열 계산 오류: {str(e)}")
+    
+    # ------------------------------------------------------------------ 수치 해석
+    def is_numeric_command(self, text: str) -> bool:
+        """
+        solve / integrate / derive 명령인지
+        
+        미지수가 없는 solve(행렬, 벡터)는 수치 해석이 아니라 연립방정식 함수로 본다.
+        """
+        text = text.strip().lower()
+        if not text.startswith(NUMERIC_COMMANDS):
+            return False
+        command = split_command(text)
+        if command is None:
+            return False
+        op, args = command
+        if op != 'solve':
+            return True
+        try:
+            compiled = self.cache.get(args[0], infer=True)
+        except Exception:
+            return True
+        return any(name not in self.cells for name in compiled.variables)
+    
+    def evaluate_numeric(self, text: str, record: bool = True) -> NumericResult:
+        """
+        수치 해석 명령 실행
+
+        예: 'integrate(sin(x), 0, pi)', 'solve(x**3 - 2*x - 5, 2)', 'solve(cos(x) - x, 0, 1)',
+        'derive(sin(x), 0)'. 구간/점 인자는 일반 수식으로 계산한다.
+        """
+        text = text.strip().lower()
+        command = split_command(text)
+        if command is None:
+            raise CalculatorError(f"수치 해석 명령이 아닙니다: {text}")
+        op, args = command
+        arity = {'solve': (2, 3), 'integrate': (3, 3), 'derive': (2, 2)}[op]
+        if not arity[0] <= len(args) <= arity[1]:
+            usage = {'solve': "solve(수식, 초깃값) 또는 solve(수식, 시작, 끝)",
+                     'integrate': "integrate(수식, 시작, 끝)", 'derive': "derive(수식, 점)"}[op]
+            raise CalculatorError(f"사용법: {usage}")
+        points = [self._evaluate_point(arg) for arg in args[1:]]
+        return self._numeric(op, args[0], points, None, text, record)
+
+    def solve(self, expression: str, a: float, b: Optional[float] = None,
+              variable: Optional[str] = None) -> NumericResult:
+        """f(x) = 0의 근 (b가 없으면 a에서 뉴턴법, 있으면 [a, b]에서 브렌트법)"""
+        points = [a] if b is None else [a, b]
+        return self._numeric('solve', expression, points, variable)
+
+    def integrate(self, expression: str, a: float, b: float, variable: Optional[str] = None) -> NumericResult:
+        """[a, b] 정적분 (적응형 가우스-크론로드)"""
+        return self._numeric('integrate', expression, [a, b], variable)
+
+    def derive(self, expression: str, x: float, variable: Optional[str] = None) -> NumericResult:
+        """x에서의 도함수 값"""
+        return self._numeric('derive', expression, [x], variable)
+
+    def _evaluate_point(self, text: str) -> float:
+        """구간 / 점 인자 계산 (벡터 / 행렬 / 복소수면 CalculatorError)"""
+        value = self.evaluate(text, record=False)
+        if isinstance(value, complex) or getattr(value, 'ndim', 0) != 0:
+            raise CalculatorError(f"구간/점은 실수 하나여야 합니다: {text}")
+        try:
+            return float(value)
+        except (TypeError, ValueError) as e:
+            raise CalculatorError(f"구간/점은 실수 하나여야 합니다: {text} ({str(e)})")
+
+    def _numeric(self, op: str, expression: str, points: List[float], variable: Optional[str] = None,
+                 label: Optional[str] = None, record: bool = True) -> NumericResult:
+        expression = expression.strip().lower()
+        try:
+            compiled = self.cache.get(expression, infer=True)
+            # 정의된 변수가 아닌 이름 하나가 적분/미분/풀이 변수
+            if variable is None:
+                free = [name for name in compiled.variables if name not in self.cells]
+                if len(free) != 1:
+                    raise CalculatorError(f"수식에 정의되지 않은 변수가 하나여야 합니다: {', '.join(free) or '없음'}")
+                variable = free[0]
+            variable = variable.strip().lower()
+            fixed = self.cells.bindings(tuple(name for name in compiled.variables if name != variable))
+            compiled.check_bindings(fixed)
+            with time_limit(self.timeout):
+                result = getattr(numeric, op)(compiled, variable, *points, fixed=fixed)
+        except CalculatorError:
+            raise
+        except Exception as e:
+            raise CalculatorError(f"계산 오류: {str(e)}")
+
+        if record:
+            if label is None:
+                label = f"{op}({expression}, {', '.join(f'{point:g}' for point in points)})"
+            self.history.append(label, result.value)
+        return result
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """컴파일 캐시 통계 (적중/미스 횟수 등)"""
+        return self.cache.stats()
     
     def get_history(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """계산 히스토리 조회"""
-        return self.history[-limit:]
+        """계산 히스토리 조회 (최근 limit개)"""
+        return self.history.latest(limit)
+    
+    def search_history(self, text: Optional[str] = None, min_result: Optional[float] = None,
+                       max_result: Optional[float] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """수식 부분 문자열 / 결과 범위로 히스토리 검색 (최근 순)"""
+        return self.history.search(text, min_result, max_result, limit)
     
     def clear_history(self):
         """히스토리 초기화"""
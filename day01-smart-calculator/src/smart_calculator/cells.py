@@ -0,0 +1,232 @@
+"""
+이름 붙은 계산 결과(셀)와 의존성 그래프
+
+`b = a*2 + sqrt(a)`처럼 다른 셀을 참조하는 셀을 정의하면, `a`가 바뀔 때
+`a`에 (직간접적으로) 의존하는 셀만 위상 정렬 순서로 다시 계산한다.
+각 셀은 컴파일된 수식을 보관하므로 재계산 시 파싱하지 않는다.
+"""
+from collections import deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .compiler import CompiledExpression, ExpressionCache, check_variables
+from .limits import CostLimitError
+
+class CellError(Exception):
+    """셀 정의/계산 오류"""
+    pass
+
+class Cell:
+    """
+    이름 붙은 수식 하나
+
+    값과 오류는 (값, 오류) 튜플 하나로 바꿔 끼우므로, 다른 스레드에서 읽어도
+    새 값과 이전 오류가 섞여 보이지 않는다.
+    """
+    __slots__ = ('name', 'expression', 'compiled', 'state')
+
+    def __init__(self, name: str, expression: str, compiled: CompiledExpression):
+        self.name = name
+        self.expression = expression
+        self.compiled = compiled
+        self.state: Tuple[Any, Optional[str]] = (None, None)
+
+    @property
+    def value(self) -> Any:
+        return self.state[0]
+
+    @property
+    def error(self) -> Optional[str]:
+        return self.state[1]
+
+    @property
+    def deps(self) -> Tuple[str, ...]:
+        return self.compiled.variables
+
+class CellGraph:
+    """
+    셀 저장소 + 역방향 의존성(누가 나를 참조하는가) 인덱스
+
+    읽기(get / bindings / values)는 잠금 없이 여러 스레드에서 해도 되지만,
+    정의 / 삭제 / refresh는 한 번에 하나씩 해야 한다 (SmartCalculator가 잠금으로 보장).
+    """
+
+    def __init__(self, cache: ExpressionCache):
+        self.cache = cache
+        self.cells: Dict[str, Cell] = {}
+        # 이름 -> 그 이름을 참조하는 셀들 (아직 정의되지 않은 이름도 포함)
+        self.dependents: Dict[str, Set[str]] = {}
+        self.recomputed = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.cells
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def values(self) -> Dict[str, Any]:
+        """정상적으로 계산된 셀 값들"""
+        cells = list(self.cells.values())  # 다른 스레드의 정의와 겹쳐도 안전하도록 복사
+        return {cell.name: value for cell in cells for value, error in (cell.state,) if error is None}
+
+    def get(self, name: str) -> Any:
+        cell = self.cells.get(name)
+        if cell is None:
+            raise CellError(f"정의되지 않은 변수: {name}")
+        value, error = cell.state
+        if error is not None:
+            raise CellError(f"변수 {name}의 값에 오류가 있습니다")
+        return value
+
+    def bindings(self, names: Tuple[str, ...]) -> Dict[str, Any]:
+        """수식 평가용 {이름: 값} (정의되지 않았거나 오류 상태면 CellError)"""
+        return {name: self.get(name) for name in names}
+
+    # ------------------------------------------------------------------ 정의 / 삭제
+    def assign(self, name: str, expression: str) -> List[Tuple[str, Any, Optional[str]]]:
+        """
+        셀 정의(또는 재정의) 후 영향받는 셀 재계산
+
+        Returns:
+            [(이름, 값, 오류)] - 다시 계산된 셀들 (name 자신이 첫 번째)
+
+        Raises:
+            CostLimitError: 참조하는 셀들의 정수 값으로 계산하면 비용 예산을 넘음 (정의하지 않음)
+        """
+        check_variables([name], self.cache.registry)
+        compiled = self.cache.get(expression, infer=True)
+        if name in compiled.variables or self._downstream_contains(name, compiled.variables):
+            raise CellError(f"순환 참조: {name}")
+
+        # 다른 스레드가 값이 없는 셀을 보지 않도록 등록 전에 먼저 계산
+        cell = Cell(name, expression, compiled)
+        first = self._evaluate(cell, strict=True)
+        old = self.cells.get(name)
+        if old is not None:
+            for dep in old.deps:
+                self._unlink(dep, name)
+        self.cells[name] = cell
+        for dep in compiled.variables:
+            self.dependents.setdefault(dep, set()).add(name)
+
+        return self._recompute(name, first)
+
+    def delete(self, name: str) -> List[Tuple[str, Any, Optional[str]]]:
+        """셀 삭제 (참조하던 셀들은 오류 상태가 됨)"""
+        cell = self.cells.pop(name, None)
+        if cell is None:
+            raise CellError(f"정의되지 않은 변수: {name}")
+        for dep in cell.deps:
+            self._unlink(dep, name)
+        return self._recompute(name)
+
+    def clear(self):
+        self.cells.clear()
+        self.dependents.clear()
+
+    def refresh(self) -> List[Tuple[str, Any, Optional[str]]]:
+        """
+        함수/상수 레지스트리가 바뀐 뒤 모든 셀을 다시 컴파일하고 의존성 순서대로 다시 계산
+
+        다시 컴파일할 수 없는 셀이 있으면 아무것도 바꾸지 않고 예외를 그대로 던진다.
+        """
+        compiled = {name: self.cache.get(cell.expression, infer=True) for name, cell in self.cells.items()}
+        self.dependents.clear()
+        for name, cell in self.cells.items():
+            cell.compiled = compiled[name]
+            for dep in cell.deps:
+                self.dependents.setdefault(dep, set()).add(name)
+
+        indegree = {name: sum(dep in self.cells for dep in cell.deps) for name, cell in self.cells.items()}
+        ready = deque(name for name, degree in indegree.items() if degree == 0)
+        updates = []
+        while ready:
+            name = ready.popleft()
+            updates.append(self._evaluate(self.cells[name]))
+            for dependent in self.dependents.get(name, ()):
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+        return updates
+
+    def _unlink(self, dep: str, name: str):
+        users = self.dependents.get(dep)
+        if users is not None:
+            users.discard(name)
+            if not users:
+                del self.dependents[dep]
+
+    def _downstream_contains(self, name: str, targets: Tuple[str, ...]) -> bool:
+        """name에 (전이적으로) 의존하는 셀 중에 targets가 있는지 (순환 검사)
+
+        아래쪽(의존하는 셀) 방향으로 탐색하므로 비용은 어차피 재계산할 셀 수에 비례한다.
+        """
+        if not targets or name not in self.dependents:
+            return False
+        wanted = set(targets)
+        stack = [name]
+        seen: Set[str] = set()
+        while stack:
+            for dependent in self.dependents.get(stack.pop(), ()):
+                if dependent in wanted:
+                    return True
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        return False
+
+    # ------------------------------------------------------------------ 재계산
+    def _affected_order(self, name: str) -> List[str]:
+        """name과 그 (전이적) 의존 셀들을 위상 정렬 순서로 (Kahn 알고리즘, 영향받는 부분 그래프만)"""
+        affected: Set[str] = {name}
+        queue = deque([name])
+        while queue:
+            for dependent in self.dependents.get(queue.popleft(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    queue.append(dependent)
+
+        indegree = {node: 0 for node in affected}
+        for node in affected:
+            for dependent in self.dependents.get(node, ()):
+                indegree[dependent] += 1
+
+        order = []
+        ready = deque(node for node, degree in indegree.items() if degree == 0)
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for dependent in self.dependents.get(node, ()):
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+        return order
+
+    def _recompute(self, name: str, first: Optional[Tuple[str, Any, Optional[str]]] = None
+                   ) -> List[Tuple[str, Any, Optional[str]]]:
+        """name부터 영향받는 셀 재계산 (first: 이미 계산해 둔 name의 결과)"""
+        order = self._affected_order(name)
+        if first is not None:
+            return [first] + [self._evaluate(self.cells[node]) for node in order[1:] if node in self.cells]
+        return [self._evaluate(self.cells[node]) for node in order if node in self.cells]
+
+    def _evaluate(self, cell: Cell, strict: bool = False) -> Tuple[str, Any, Optional[str]]:
+        """
+        셀 계산 (실패하면 오류 상태로)
+
+        평가 전에 묶인 정수 값의 실제 크기로 비용을 검사한다 (CompiledExpression.evaluate).
+        strict=True면 비용 초과를 오류 상태로 두지 않고 CostLimitError를 그대로 던진다.
+        """
+        self.recomputed += 1
+        try:
+            cell.state = (cell.compiled.evaluate(self.bindings(cell.deps)), None)
+        except CostLimitError as e:
+            if strict:
+                raise
+            cell.state = (None, f"계산 오류: {str(e)}")
+        except CellError as e:
+            cell.state = (None, str(e))
+        except ZeroDivisionError:
+            cell.state = (None, "0으로 나눌 수 없습니다")
+        except Exception as e:
+            cell.state = (None, f"계산 오류: {str(e)}")
+        return cell.name, cell.value, cell.error
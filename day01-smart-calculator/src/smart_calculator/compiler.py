@@ -0,0 +1,363 @@
+"""
+수식 컴파일러 및 컴파일 캐시
+"""
+import math
+import threading
+from collections import OrderedDict
+from types import CodeType, FunctionType
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, Optional, Tuple, Union
+
+from .limits import DEFAULT_MAX_DIGITS, check_cost, has_exact_values
+from .optimizer import common_subexpressions, fold_constants, node_key
+from .matrix import guarded, make_array
+from .parser import Array, BinOp, Call, Name, Node, Num, ParseError, UnaryOp, parse, walk
+from .precision import FLOAT, Precision
+from .registry import DEFAULT_REGISTRY, Registry
+
+class CompiledExpression:
+    """
+    한 번 컴파일해 두고 반복 평가하는 수식
+
+    수식은 `lambda <변수들>: <수식>` 형태의 함수로 컴파일된다. 같은 코드 객체를
+    전역 네임스페이스만 바꿔서 스칼라(math) / 배열(numpy) 양쪽에서 재사용한다.
+    네임스페이스에는 컴파일 시점에 레지스트리에서 찾은 구현만 들어간다.
+    벡터/행렬 리터럴이나 행렬 함수가 있는 수식(array_mode)은 처음부터 NumPy 구현으로 묶는다.
+    정밀도 모드(fraction / decimal)에서는 스칼라 함수만 그 모드의 리터럴 / 상수 / 함수로 묶고,
+    배열 함수와 float_function()은 리터럴을 float로 바꿔 쓴다.
+    컴파일할 때의 비용 검사는 변수를 float로 보므로, 정수 값이 묶이면 평가 전에 그 값으로
+    다시 검사한다 (max_digits).
+    """
+    __slots__ = ('expression', 'tree', 'source', 'code', 'variables', 'functions', 'registry',
+                 'arrays', 'array_mode', 'literals', 'precision', 'max_digits', 'int_functions', 'function',
+                 '_array_function', '_matrix_function', '_float_function')
+
+    def __init__(self, expression: str, tree: Node, source: str, code: CodeType,
+                 variables: Tuple[str, ...] = (), functions: FrozenSet[str] = frozenset(),
+                 registry: Registry = DEFAULT_REGISTRY, arrays: Optional[Dict[str, Any]] = None,
+                 array_mode: bool = False, literals: Optional[Dict[str, Any]] = None,
+                 precision: Precision = FLOAT, max_digits: Optional[int] = None):
+        self.expression = expression
+        self.tree = tree
+        self.source = source
+        self.code = code
+        self.variables = variables
+        self.functions = functions
+        self.registry = registry
+        # 컴파일 시점에 만든 상수 배열 (_k0, _k1, ...)과 배열 생성 함수 (_mat)
+        self.arrays = arrays or {}
+        self.array_mode = array_mode
+        # 정밀도 모드에서 컴파일 시점에 변환한 숫자 리터럴 (_n0, _n1, ...)
+        self.literals = literals or {}
+        self.precision = precision
+        self.max_digits = max_digits
+        # 수식에 쓰인 함수 중 정수를 돌려주는 것 (비용 검사용)
+        self.int_functions = functions & registry.int_functions()
+        self._array_function = None
+        self._matrix_function = None
+        self._float_function = None
+        if array_mode:
+            self.function = self.matrix_function()
+        elif precision.exact:
+            namespace = {**precision.namespace(registry, functions), **self.arrays, **self.literals}
+            self.function = precision.bind(FunctionType(code, namespace))
+        elif functions or self.arrays:
+            namespace = registry.scalar_namespace(functions)
+            namespace.update(self.arrays)
+            self.function = FunctionType(code, namespace)
+        else:
+            # 함수를 쓰지 않는 수식은 상수만 든 네임스페이스 하나를 공유
+            self.function = FunctionType(code, registry.constant_namespace())
+
+    def evaluate(self, bindings: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        컴파일된 함수 실행 (자유 변수는 bindings로 전달)
+
+        Raises:
+            CostLimitError: 묶인 정수 값으로 계산하면 결과가 max_digits 자리를 넘을 수 있음
+        """
+        if bindings:
+            self.check_bindings(bindings)
+            try:
+                return self.function(**bindings)
+            except (TypeError, ValueError):
+                # 변수에 벡터/행렬이 들어 있으면 (math 함수가 배열을 못 받음) NumPy 구현으로 다시 계산
+                if self.array_mode or not any(hasattr(value, 'shape') for value in bindings.values()):
+                    raise
+                return self.matrix_function()(**bindings)
+        return self.function()
+
+    def check_bindings(self, bindings: Dict[str, Any]):
+        """정수 / Fraction 값이 묶여 있으면 그 실제 크기로 비용 검사 (예산을 넘으면 CostLimitError)"""
+        if self.max_digits is not None and has_exact_values(bindings):
+            check_cost(self.tree, self.max_digits, self.int_functions,
+                       exact=self.precision.mode == 'fraction', values=bindings)
+
+    def array_function(self) -> FunctionType:
+        """같은 코드 객체를 NumPy 구현 네임스페이스에 묶은 함수 (최초 1회 생성)"""
+        if self._array_function is None:
+            namespace = {**self.registry.array_namespace(self.functions), **self.arrays, **self._float_literals()}
+            self._array_function = FunctionType(self.code, namespace)
+        return self._array_function
+
+    def float_function(self) -> FunctionType:
+        """정밀도 모드와 관계없이 float로 계산하는 스칼라 함수 (수치 해석용, float 모드면 function 그대로)"""
+        if not self.precision.exact or self.array_mode:
+            return self.function
+        if self._float_function is None:
+            namespace = {**self.registry.scalar_namespace(self.functions), **self.arrays, **self._float_literals()}
+            self._float_function = FunctionType(self.code, namespace)
+        return self._float_function
+
+    def _float_literals(self) -> Dict[str, float]:
+        return {name: float(value) for name, value in self.literals.items()}
+
+    def matrix_function(self):
+        """array_function에 NumPy 오류 처리를 씌운 함수 (벡터/행렬 값 계산용)"""
+        if self._matrix_function is None:
+            self._matrix_function = guarded(self.array_function())
+        return self._matrix_function
+
+    def evaluate_array(self, bindings: Optional[Dict[str, Any]] = None, fallback: bool = False) -> Any:
+        """NumPy 배열 바인딩으로 한 번에 평가 (vectorized 모듈 참고)"""
+        from .vectorized import evaluate_array
+        return evaluate_array(self, bindings or {}, fallback=fallback)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.expression!r})"
+
+class SourceEmitter:
+    """구문 트리를 파이썬 수식 소스로 변환 (이름 검증 포함)
+
+    shared에 들어 있는 부분식은 처음 나올 때 `(_t0 := ...)`로 저장하고
+    이후에는 `_t0`을 재사용해서 한 번만 계산한다.
+    """
+
+    def __init__(self, variables: FrozenSet[str] = frozenset(), shared: FrozenSet[Hashable] = frozenset(),
+                 registry: Registry = DEFAULT_REGISTRY):
+        self.variables = variables
+        self.shared = shared
+        self.registry = registry
+        self.temps: Dict[Hashable, str] = {}
+        # 배열 리터럴 -> 전역 이름 (상수 배열은 미리 만들어 둠)
+        self.arrays: Dict[str, Any] = {}
+        # 정밀도 모드의 Fraction / Decimal 리터럴 -> 전역 이름
+        self.literals: Dict[str, Any] = {}
+
+    def emit(self, node: Node) -> str:
+        if not self.shared or isinstance(node, (Num, Name)):
+            return self._emit(node)
+        key = node_key(node)
+        if key not in self.shared:
+            return self._emit(node)
+        if key in self.temps:
+            return self.temps[key]
+        source = self._emit(node)
+        temp = self.temps[key] = f"_t{len(self.temps)}"
+        return f"({temp} := {source})"
+
+    def _emit(self, node: Node) -> str:
+        if isinstance(node, Num):
+            if not isinstance(node.value, (int, float)):
+                name = f"_n{len(self.literals)}"
+                self.literals[name] = node.value
+                return name
+            if isinstance(node.value, float) and not math.isfinite(node.value):
+                return '1e999' if node.value > 0 else '(-1e999)'  # repr(inf)는 파이썬 리터럴이 아님
+            # 음수 리터럴은 괄호로 감싸서 우선순위 보존 ((-2) ** 2)
+            if node.value < 0 or (isinstance(node.value, float) and math.copysign(1, node.value) < 0):
+                return f"({node.value!r})"
+            return repr(node.value)
+        if isinstance(node, Name):
+            if node.id not in self.registry.constants and node.id not in self.variables:
+                raise ParseError(f"알 수 없는 이름: {node.id}")
+            return node.id
+        if isinstance(node, UnaryOp):
+            return f"({node.op}{self.emit(node.operand)})"
+        if isinstance(node, BinOp):
+            return f"({self.emit(node.left)} {node.op} {self.emit(node.right)})"
+        if isinstance(node, Call):
+            spec = self.registry.functions.get(node.func)
+            if spec is None:
+                raise ParseError(f"알 수 없는 함수: {node.func}")
+            if not spec.accepts(len(node.args)):
+                raise ParseError(f"{node.func}의 인자는 {spec.arity()}여야 합니다 ({len(node.args)}개 전달)")
+            args = ', '.join(self.emit(arg) for arg in node.args)
+            return f"{node.func}({args})"
+        if isinstance(node, Array):
+            return self._emit_array(node)
+        raise ParseError(f"지원하지 않는 구문: {node!r}")
+
+    def _emit_array(self, node: Array) -> str:
+        constant = _constant_items(node)
+        try:
+            if constant is not None:
+                name = f"_k{sum(key.startswith('_k') for key in self.arrays)}"
+                self.arrays[name] = make_array(constant)
+                return name
+            self.arrays['_mat'] = make_array
+        except (ValueError, OverflowError, RuntimeError) as e:
+            raise ParseError(str(e))
+        items = ', '.join(self.emit(item) for item in node.items)
+        return f"_mat(({items},))"
+
+def _constant_items(node: Node) -> Optional[Any]:
+    """숫자만으로 된 배열 리터럴이면 중첩 리스트, 아니면 None"""
+    if isinstance(node, Num):
+        return node.value
+    if isinstance(node, Array):
+        items = [_constant_items(item) for item in node.items]
+        return None if any(item is None for item in items) else items
+    return None
+
+def to_source(node: Node, variables: FrozenSet[str] = frozenset(), registry: Registry = DEFAULT_REGISTRY) -> str:
+    """구문 트리를 파이썬 수식 소스로 변환 (최적화 없음)"""
+    return SourceEmitter(variables, registry=registry).emit(node)
+
+def check_variables(variables: Iterable[str], registry: Registry = DEFAULT_REGISTRY) -> Tuple[str, ...]:
+    """변수 이름 검증 후 정렬된 튜플로 반환"""
+    names = tuple(sorted(set(variables)))
+    for name in names:
+        if not name.isidentifier() or name.startswith('_') or name != name.lower():
+            raise ParseError(f"사용할 수 없는 변수 이름: {name!r}")
+        if name in registry:
+            raise ParseError(f"상수/함수 이름은 변수로 쓸 수 없습니다: {name}")
+    return names
+
+def free_names(tree: Node, registry: Registry = DEFAULT_REGISTRY) -> FrozenSet[str]:
+    """상수가 아닌 이름들 (변수로 쓰인 이름)"""
+    return frozenset(node.id for node in walk(tree) if isinstance(node, Name) and node.id not in registry.constants)
+
+def compile_expression(expression: str, variables: Iterable[str] = (), optimize: bool = True,
+                       max_digits: Optional[int] = DEFAULT_MAX_DIGITS,
+                       infer_variables: bool = False, registry: Registry = DEFAULT_REGISTRY,
+                       precision: Precision = FLOAT) -> CompiledExpression:
+    """
+    정규화된 수식 문자열을 파싱하고 함수로 컴파일
+
+    optimize=True면 상수 부분 트리를 미리 계산하고 반복되는 부분식을 한 번만 계산한다.
+    정수 결과가 max_digits 자릿수를 넘을 수 있는 수식은 실행 전에 거부한다 (None이면 제한 없음).
+    infer_variables=True면 수식에 나오는 상수가 아닌 이름을 모두 변수로 취급한다.
+    함수 / 상수는 registry에서 찾는다. precision이 fraction / decimal이면 숫자 리터럴을
+    여기서 한 번만 변환하고, 상수 접기도 그 모드의 값으로 한다.
+    """
+    tree = parse(expression)
+    if infer_variables:
+        variables = set(variables) | free_names(tree, registry)
+    names = check_variables(variables, registry)
+    variable_set = frozenset(names)
+    if precision.exact:
+        tree = precision.convert(tree)
+    check_cost(tree, max_digits, registry.int_functions(), exact=precision.mode == 'fraction')
+    functions = frozenset(node.func for node in walk(tree) if isinstance(node, Call))
+
+    shared: FrozenSet[Hashable] = frozenset()
+    if optimize:
+        # 알 수 없는 이름이 접히기 전에 검증
+        to_source(tree, variable_set, registry)
+        if precision.exact:
+            with precision.local():
+                tree = fold_constants(tree, precision.functions(registry.pure_functions()),
+                                      precision.constants(registry.constants), variable_set)
+        else:
+            tree = fold_constants(tree, registry.pure_functions(), registry.constants, variable_set)
+        shared = common_subexpressions(tree)
+    emitter = SourceEmitter(variable_set, shared, registry)
+    body = emitter.emit(tree)
+
+    source = f"lambda {', '.join(names)}: {body}"
+    module_code = compile(source, '<calc>', 'eval')
+    code = next(const for const in module_code.co_consts if isinstance(const, CodeType))
+    array_mode = bool(emitter.arrays) or (bool(functions) and registry.array_only(functions))
+    return CompiledExpression(expression, tree, source, code, names, functions, registry,
+                              emitter.arrays, array_mode, emitter.literals, precision, max_digits)
+
+# 수식 / (수식, 변수 목록) / (수식, '*': 변수 자동 추론)
+CacheKey = Union[str, Tuple[str, Union[str, Tuple[str, ...]]]]
+
+class ExpressionCache:
+    """
+    정규화된 수식(+ 변수 목록)을 키로 하는 LRU 컴파일 캐시
+
+    registry가 바뀌면 (함수 등록/해제) 다음 조회 때 저장된 항목을 모두 버린다.
+
+    여러 스레드가 공유해도 된다. 적중 경로는 잠금 없이 조회하고, 미스일 때도 컴파일은
+    잠금 밖에서 하고 저장 / 밀어내기만 잠금 안에서 한다. (같은 수식을 두 스레드가 동시에
+    처음 보면 두 번 컴파일될 수 있음. hits / misses는 잠금 없이 세므로 동시 호출 중에는 근사치)
+    """
+
+    def __init__(self, maxsize: int = 1024, max_digits: Optional[int] = DEFAULT_MAX_DIGITS,
+                 registry: Optional[Registry] = None, precision: Precision = FLOAT):
+        self.maxsize = maxsize
+        self.max_digits = max_digits
+        self.registry = registry if registry is not None else DEFAULT_REGISTRY.copy()
+        # 이 캐시로 컴파일하는 수식의 정밀도 모드 (바꾸려면 set_precision)
+        self.precision = precision
+        self._version = self.registry.version
+        self._entries: 'OrderedDict[CacheKey, CompiledExpression]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, expression: str, variables: Iterable[str] = (), infer: bool = False) -> CompiledExpression:
+        """캐시에서 찾고, 없으면 컴파일 후 저장 (infer=True면 변수 목록을 수식에서 추론)"""
+        names = () if infer or variables == () else tuple(sorted(set(variables)))
+        if infer:
+            key: CacheKey = (expression, '*')
+        else:
+            key = (expression, names) if names else expression
+        version = self.registry.version
+        if self._version != version:
+            with self._lock:
+                self._entries.clear()
+                self._version = version
+        compiled = self._entries.get(key)
+        if compiled is not None:
+            self.hits += 1
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                pass  # 그 사이 다른 스레드가 밀어냄
+            return compiled
+
+        self.misses += 1
+        precision = self.precision
+        compiled = compile_expression(expression, names, max_digits=self.max_digits, infer_variables=infer,
+                                      registry=self.registry, precision=precision)
+        if self.maxsize > 0:
+            with self._lock:
+                # 컴파일하는 동안 레지스트리나 정밀도가 바뀌었으면 저장하지 않음
+                if self._version == version and self.precision is precision:
+                    self._entries[key] = compiled
+                    if len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+        return compiled
+
+    def set_precision(self, precision: Precision):
+        """정밀도 모드 변경 (저장된 컴파일 결과는 모두 버림)"""
+        with self._lock:
+            self.precision = precision
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        """캐시 및 통계 초기화"""
+        with self._lock:
+            self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._entries
@@ -0,0 +1,136 @@
+"""
+계산 히스토리 저장소 (고정 크기 링 버퍼)
+"""
+import numbers
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from decimal import Decimal
+from heapq import merge
+from itertools import count, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+class HistoryEntry:
+    """히스토리 한 건 (타임스탬프는 float epoch로 보관하고 조회할 때만 포맷)"""
+    __slots__ = ('expression', 'result', 'timestamp')
+
+    def __init__(self, expression: str, result: Any, timestamp: float):
+        self.expression = expression
+        self.result = result
+        self.timestamp = timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'expression': self.expression,
+            'result': self.result,
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat()
+        }
+
+    def __repr__(self) -> str:
+        return f"HistoryEntry({self.expression!r}, {self.result!r})"
+
+def _search(entries: Iterable[HistoryEntry], text: Optional[str], min_result: Optional[float],
+            max_result: Optional[float], limit: int) -> List[Dict[str, Any]]:
+    """최근 순 기록들에서 조건에 맞는 것 limit개"""
+    found = []
+    for entry in entries:
+        if len(found) >= limit:
+            break
+        if text and text not in entry.expression:
+            continue
+        if min_result is not None or max_result is not None:
+            # 정밀도 모드의 Fraction / Decimal 결과도 범위 비교 대상
+            if not isinstance(entry.result, (numbers.Real, Decimal)) or entry.result != entry.result:
+                continue
+            if min_result is not None and entry.result < min_result:
+                continue
+            if max_result is not None and entry.result > max_result:
+                continue
+        found.append(entry.to_dict())
+    return found
+
+class HistoryBuffer:
+    """
+    최근 계산 기록을 capacity개까지만 보관하는 링 버퍼
+
+    capacity=None이면 제한 없음, 0이면 기록하지 않음
+
+    여러 스레드가 한 계산기를 공유해도 잠금 없이 기록할 수 있도록 스레드마다 따로
+    링 버퍼를 두고, 기록마다 붙인 전역 순번으로 조회할 때 합친다.
+    (잠금은 스레드가 처음 기록할 때 버퍼를 만들 때만 잡음)
+    """
+
+    def __init__(self, capacity: Optional[int] = 1000):
+        if capacity is not None and capacity < 0:
+            raise ValueError("capacity는 0 이상이어야 합니다")
+        self.capacity = capacity
+        self.enabled = capacity != 0
+        self._local = threading.local()
+        # (스레드, 그 스레드의 (순번, 기록) 링 버퍼) - 끝난 스레드의 기록은 _retired로 옮김
+        self._shards: List[Tuple[threading.Thread, deque]] = []
+        self._retired: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._sequence = count()
+
+    def append(self, expression: str, result: Any):
+        """기록 추가 (가득 차면 가장 오래된 기록이 밀려남)"""
+        if self.enabled:
+            try:
+                entries = self._local.entries
+            except AttributeError:
+                entries = self._new_shard()
+            entries.append((next(self._sequence), HistoryEntry(expression, result, time.time())))
+
+    def _new_shard(self) -> deque:
+        entries: deque = deque(maxlen=self.capacity)
+        with self._lock:
+            alive = []
+            finished = []
+            for thread, shard in self._shards:
+                (alive if thread.is_alive() else finished).append((thread, shard))
+            if finished:
+                self._retired = deque(merge(self._retired, *(shard for _, shard in finished)),
+                                      maxlen=self.capacity)
+            alive.append((threading.current_thread(), entries))
+            self._shards = alive
+        self._local.entries = entries
+        return entries
+
+    def _recent(self, limit: Optional[int] = None) -> Iterator[HistoryEntry]:
+        """최근 순으로 (전체 합쳐서 capacity개, limit이 있으면 limit개까지)"""
+        if limit is None or (self.capacity is not None and limit > self.capacity):
+            limit = self.capacity
+        # deque.copy()는 한 번에 복사되므로 다른 스레드가 기록하는 중에도 안전
+        shards = [shard.copy() for _, shard in self._shards] + [self._retired.copy()]
+        tails = [list(islice(reversed(shard), limit)) for shard in shards]
+        for _, entry in islice(merge(*tails, reverse=True), limit):
+            yield entry
+
+    def latest(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """최근 limit개를 오래된 순으로 반환 (O(limit x 스레드 수))"""
+        if limit <= 0:
+            return []
+        entries = list(self._recent(limit))
+        entries.reverse()
+        return [entry.to_dict() for entry in entries]
+
+    def search(self, text: Optional[str] = None, min_result: Optional[float] = None,
+               max_result: Optional[float] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """수식 부분 문자열 / 결과 범위로 검색 (최근 순, 메모리 선형 탐색)"""
+        return _search(self._recent(), text, min_result, max_result, limit)
+
+    def clear(self):
+        with self._lock:
+            for _, shard in self._shards:
+                shard.clear()
+            self._retired.clear()
+
+    def __len__(self) -> int:
+        total = sum(len(shard) for _, shard in self._shards) + len(self._retired)
+        return total if self.capacity is None else min(total, self.capacity)
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        entries = list(self._recent())
+        entries.reverse()
+        return iter(entries)
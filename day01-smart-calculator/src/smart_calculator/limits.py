@@ -0,0 +1,181 @@
+"""
+계산 비용 제한
+
+- 정적 비용 추정: 파싱된 트리에서 정수 결과의 자릿수를 미리 추정해 예산을 넘으면 실행 전에 거부
+  (float 연산은 크기와 관계없이 상수 시간이므로 정수만 대상). 컴파일할 때는 변수를 float로 보고,
+  평가할 때 변수에 정수가 묶여 있으면 그 실제 크기로 다시 추정한다 (CompiledExpression.evaluate)
+- 실행 시간 제한: SIGALRM으로 평가에 벽시계 시간 제한 (메인 스레드, 유닉스 계열에서만 동작)
+"""
+import math
+import signal
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from fractions import Fraction
+from typing import Any, FrozenSet, Iterator, Mapping, Optional, Tuple
+
+from .parser import Array, BinOp, Call, Name, Node, Num, UnaryOp
+
+# 정수 결과 자릿수 기본 예산 (파이썬의 정수 -> 문자열 변환 기본 제한과 같은 값)
+DEFAULT_MAX_DIGITS = 4300
+
+# 대화형 모드 / 서버의 기본 평가 시간 제한 (초)
+DEFAULT_TIMEOUT = 10.0
+
+# 정수 인자에 정수를 돌려주는 기본 함수 (나머지 함수는 float 결과, 레지스트리의 int_result 항목)
+INT_FUNCTIONS = frozenset({'abs', 'round', 'floor', 'ceil'})
+
+# 실수 인자에도 정수를 돌려주는 함수 (결과 크기는 인자 크기와 같음, round는 인자 1개일 때만)
+ROUNDING_FUNCTIONS = frozenset({'round', 'floor', 'ceil'})
+
+class CostLimitError(Exception):
+    """계산 비용 예산 초과"""
+    pass
+
+class EvaluationTimeout(Exception):
+    """계산 시간 초과"""
+    pass
+
+# (정수 결과일 수 있는지, 절댓값 상한의 log10 - 실수 결과면 값을 알 때만 실제 크기)
+Estimate = Tuple[bool, float]
+
+_FLOAT_DIGITS = 309.0  # float 최댓값 자릿수
+
+def estimate_digits(node: Node, max_digits: Optional[float] = None,
+                    int_functions: FrozenSet[str] = INT_FUNCTIONS, exact: bool = False,
+                    values: Optional[Mapping[str, Any]] = None) -> Estimate:
+    """
+    결과 절댓값 상한을 자릿수(log10)로 추정
+
+    values에 값이 있는 변수는 그 값으로 (정수 / Fraction이면 실제 자릿수), 나머지 변수와
+    상수는 float로 가정한다. 따라서 values 없이 통과한 수식도 정수 변수를 묶어 평가하기 전에
+    values를 주고 다시 검사해야 한다 (CompiledExpression.evaluate가 자동으로 함).
+    max_digits를 주면 중간 결과라도 예산을 넘는 순간 CostLimitError.
+    exact=True(fraction 모드)면 Fraction 리터럴도 정수처럼 (분자/분모 자릿수) 보고,
+    나눗셈과 음수 지수 거듭제곱도 자릿수가 커지는 연산으로 본다.
+    """
+    is_int, digits = _estimate(node, max_digits, int_functions, exact, values)
+    if max_digits is not None and is_int and digits > max_digits:
+        size = "무한대" if math.isinf(digits) else f"약 {digits:.3g}자리"
+        raise CostLimitError(f"계산 비용 초과: 결과가 {size} 정수가 될 수 있습니다 (제한 {max_digits}자리)")
+    return is_int, digits
+
+def _value_estimate(value: Any) -> Estimate:
+    """숫자 값 하나의 추정 (정수 / Fraction은 실제 자릿수, 유한한 float / Decimal은 실제 크기)"""
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return False, _FLOAT_DIGITS
+        return False, math.log10(abs(value)) if abs(value) > 1 else 0.0
+    if isinstance(value, bool):
+        return False, _FLOAT_DIGITS
+    if not isinstance(value, int):
+        if isinstance(value, Decimal):
+            return False, max(value.adjusted() + 1, 0) if value.is_finite() else _FLOAT_DIGITS
+        if not isinstance(value, Fraction):  # ABC 검사라 느리므로 float / int 다음에
+            return False, _FLOAT_DIGITS
+        value = max(abs(value.numerator), value.denominator)
+    return True, math.log10(abs(value)) if abs(value) > 1 else 0.0
+
+def _exact_value(node: Node, values: Optional[Mapping[str, Any]]) -> Optional[Any]:
+    """리터럴이거나 값이 묶인 변수면 그 값"""
+    if isinstance(node, Num):
+        return node.value
+    if isinstance(node, Name) and values is not None:
+        return values.get(node.id)
+    return None
+
+def _estimate(node: Node, max_digits: Optional[float], int_functions: FrozenSet[str], exact: bool,
+              values: Optional[Mapping[str, Any]]) -> Estimate:
+    if isinstance(node, Num):
+        value = node.value
+        if type(value) is int:
+            return True, math.log10(abs(value)) if abs(value) > 1 else 0.0
+        return _value_estimate(value)
+
+    if isinstance(node, Name):
+        if values is not None and node.id in values:
+            return _value_estimate(values[node.id])
+        return False, _FLOAT_DIGITS
+
+    if isinstance(node, UnaryOp):
+        return estimate_digits(node.operand, max_digits, int_functions, exact, values)
+
+    if isinstance(node, BinOp):
+        left_int, left = estimate_digits(node.left, max_digits, int_functions, exact, values)
+        right_int, right = estimate_digits(node.right, max_digits, int_functions, exact, values)
+        is_int = left_int and right_int
+        if node.op == '/' and exact:
+            return is_int, left + right
+        if node.op in ('/', '@'):
+            return False, _FLOAT_DIGITS
+        if node.op in ('+', '-'):
+            return is_int, max(left, right) + math.log10(2)
+        if node.op == '*':
+            return is_int, left + right
+        if node.op == '//':
+            # 실수 나눗셈은 제수가 1보다 작으면 몫이 커지므로 크기를 모름
+            return (True, left) if is_int else (False, _FLOAT_DIGITS)
+        if node.op == '**':
+            if not is_int:
+                return False, _FLOAT_DIGITS
+            # 결과 자릿수 = 밑의 자릿수 * 지수 (지수 값을 모르면 상한 10**right 사용)
+            value = _exact_value(node.right, values)
+            if isinstance(value, (int, Fraction)):
+                exponent = abs(value) if exact else value
+            else:
+                exponent = 10 ** right if right < 300 else math.inf
+            return True, left * exponent if left > 0 and exponent > 0 else 0.0
+
+    if isinstance(node, Call):
+        results = [estimate_digits(arg, max_digits, int_functions, exact, values) for arg in node.args]
+        if node.func not in int_functions or not results:
+            return False, _FLOAT_DIGITS
+        digits = max(digits for _, digits in results)
+        if all(is_int for is_int, _ in results):
+            return True, digits
+        # 실수 인자를 정수로 바꾸는 함수는 인자 크기의 정수 (크기를 모르면 float 최댓값)
+        if node.func in ROUNDING_FUNCTIONS and len(results) == 1:
+            return True, min(digits, _FLOAT_DIGITS)
+        return False, _FLOAT_DIGITS
+
+    if isinstance(node, Array):
+        # 배열 원소는 float64로 저장 (원소 안의 정수 연산만 검사)
+        for item in node.items:
+            estimate_digits(item, max_digits, int_functions, exact, values)
+        return False, _FLOAT_DIGITS
+
+    return False, _FLOAT_DIGITS
+
+def check_cost(node: Node, max_digits: Optional[int] = DEFAULT_MAX_DIGITS,
+               int_functions: FrozenSet[str] = INT_FUNCTIONS, exact: bool = False,
+               values: Optional[Mapping[str, Any]] = None):
+    """예산을 넘는 정수 연산(중간 결과 포함)이 있으면 CostLimitError (values: 변수에 묶일 값)"""
+    if max_digits is not None:
+        estimate_digits(node, max_digits, int_functions, exact, values)
+
+def has_exact_values(values: Mapping[str, Any]) -> bool:
+    """정수 / Fraction 값이 있는지 (있을 때만 값으로 다시 추정할 필요가 있음)"""
+    return any(isinstance(value, (int, Fraction)) and not isinstance(value, bool) for value in values.values())
+
+@contextmanager
+def time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """
+    블록 실행에 벽시계 시간 제한
+
+    SIGALRM을 쓸 수 없는 환경(윈도우, 메인 스레드가 아닌 곳)에서는 제한 없이 실행한다.
+    """
+    if (not seconds or not hasattr(signal, 'setitimer')
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise EvaluationTimeout(f"계산 시간 초과 ({seconds}초)")
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
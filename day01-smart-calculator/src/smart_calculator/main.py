@@ -1,6 +1,9 @@
 """
 Smart Calculator Main Entry Point
 """
+import argparse
+import asyncio
+import re
 import sys
 import os
 
@@ -8,6 +11,112 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from src.smart_calculator.calculator import SmartCalculator, CalculatorError
+from src.smart_calculator.batch import FORMATS, BatchWriter, run_batch
+from src.smart_calculator.limits import DEFAULT_TIMEOUT
+from src.smart_calculator.server import CalculatorServer
+from src.smart_calculator.sweep import run_sweep
+
+# 변수 정의: name = expression
+ASSIGNMENT_RE = re.compile(r'^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.+)$')
+
+def print_updates(updates):
+    """다시 계산된 변수들 출력"""
+    for name, value, error in updates:
+        print(f"  updated {name} = {value}" if error is None else f"  updated {name}: Error: {error}")
+
+def numeric_report(result):
+    """수치 해석 비용 (평가 횟수, 시간) 한 줄 요약"""
+    status = "" if result.converged else ", not converged"
+    return (f"({result.evaluations} evaluations, {result.seconds * 1000:.3f} ms, "
+            f"error ~{result.error:.2g}{status})")
+
+def print_stats(stats):
+    """REPL stats 명령 출력"""
+    cache = stats['cache']
+    print(f"  cache: {cache['size']}/{cache['maxsize']} entries, "
+          f"{cache['hits']} hits / {cache['misses']} misses ({cache['hit_rate']:.1%})")
+    print(f"  history: {stats['history']} entries, variables: {stats['variables']}, precision: {stats['precision']}")
+    if not stats['profiling']:
+        print("  profiling is off ('profile on' to collect per-phase timings)")
+        return
+    print(f"  calls: {stats['calls']}, errors: {stats['errors']}, total: {stats['total_ms']:.3f} ms")
+    print(f"  {'phase':<10} {'count':>8} {'total ms':>10} {'mean us':>9} {'share':>7}")
+    for phase, row in stats['phases'].items():
+        print(f"  {phase:<10} {row['count']:>8} {row['total_ms']:>10.3f} {row['mean_us']:>9.2f} {row['share']:>7.1%}")
+
+def parse_precision(text):
+    """'fraction', 'decimal', 'decimal:50', 'decimal 50' -> (모드, 자릿수)"""
+    mode, _, digits = text.strip().lower().replace(':', ' ').partition(' ')
+    if digits.strip() and not digits.strip().isdigit():
+        raise CalculatorError(f"자릿수는 정수여야 합니다: {digits.strip()}")
+    return mode, int(digits) if digits.strip() else None
+
+def batch(args):
+    """파일 또는 stdin의 수식을 스트리밍으로 계산"""
+    parser = argparse.ArgumentParser(prog="main.py batch", description="Evaluate one expression per line")
+    parser.add_argument("input", nargs="?", default="-", help="input file ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file ('-' for stdout)")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="text", help="output format")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="lines per chunk")
+    parser.add_argument("--timeout", type=float, default=None, help="wall-clock limit per expression (seconds)")
+    options = parser.parse_args(args)
+
+    source = sys.stdin if options.input == "-" else open(options.input, encoding="utf-8")
+    target = sys.stdout if options.output == "-" else open(options.output, "w", encoding="utf-8", newline="")
+    try:
+        writer = BatchWriter(target, options.format)
+        for item in run_batch(source, workers=options.workers, chunk_size=max(1, options.chunk_size),
+                              timeout=options.timeout):
+            writer.write(item)
+        print(f"Processed {writer.count} expressions ({writer.errors} errors)", file=sys.stderr)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+def sweep(args):
+    """수식을 범위 전체에 대해 벡터화 계산해서 CSV / .npy로 저장"""
+    parser = argparse.ArgumentParser(prog="main.py sweep", description="Tabulate an expression over a range")
+    parser.add_argument("expression", help="expression with one free variable, e.g. 'x**3 - 2*x'")
+    parser.add_argument("--var", default="x", help="variable name")
+    parser.add_argument("--start", type=float, default=0.0)
+    parser.add_argument("--stop", type=float, required=True, help="end of range (exclusive)")
+    parser.add_argument("--step", type=float, default=1.0)
+    parser.add_argument("-o", "--output", default=None, help="output .csv or .npy (default: CSV to stdout)")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="points per NumPy chunk")
+    options = parser.parse_args(args)
+
+    calc = SmartCalculator(history_size=0)
+    try:
+        compiled = calc.compile(options.expression, vars=(options.var,))
+        stats = run_sweep(compiled, options.var, options.start, options.stop, options.step,
+                          output=options.output, chunk_size=max(1, options.chunk_size))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return
+    print(f"{stats['points']:,} points in {stats['seconds']:.3f}s "
+          f"({stats['points_per_sec']:,.0f} points/sec)", file=sys.stderr)
+
+def serve(args):
+    """JSON Lines 계산 서버 실행"""
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Run the calculator JSON-lines server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--cache-size", type=int, default=4096, help="compiled expression cache size")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="response limit per request line in seconds (0: no limit)")
+    parser.add_argument("--workers", type=int, default=None, help="evaluation threads")
+    options = parser.parse_args(args)
+
+    calc = SmartCalculator(cache_size=options.cache_size, history_size=0)
+    server = CalculatorServer(calc, timeout=options.timeout or None, max_workers=options.workers)
+    try:
+        asyncio.run(server.serve_forever(options.host, options.port, options.unix))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
 
 def main():
     """Main function"""
@@ -15,17 +124,61 @@ def main():
         print("Smart Calculator")
         print("Usage:")
         print("  python main.py calculate '2 + 3'")
-        print("  python main.py interactive")
+        print("  python main.py interactive [--history FILE] [--profile] [--precision fraction|decimal:50] [--timeout 10]")
+        print("  python main.py batch [FILE] [--format text|jsonl|csv] [--workers N]")
+        print("  python main.py serve [--port 8765 | --unix PATH]")
+        print("  python main.py sweep 'x**3 - 2*x' --start 0 --stop 10 --step 0.01 [-o out.csv|out.npy]")
         return
     
     command = sys.argv[1]
-    calc = SmartCalculator()
+    if command == "batch":
+        batch(sys.argv[2:])
+        return
+    if command == "serve":
+        serve(sys.argv[2:])
+        return
+    if command == "sweep":
+        sweep(sys.argv[2:])
+        return
+    
+    # --history FILE: 세션 간 유지되는 SQLite 히스토리
+    history_path = None
+    if "--history" in sys.argv[2:]:
+        index = sys.argv.index("--history")
+        if index + 1 < len(sys.argv):
+            history_path = sys.argv[index + 1]
+    # --precision MODE[:DIGITS]: 정확한 유리수(fraction) / 10진 고정 자릿수(decimal) 모드
+    precision = ('float', None)
+    if "--precision" in sys.argv[2:]:
+        index = sys.argv.index("--precision")
+        if index + 1 < len(sys.argv):
+            precision = parse_precision(sys.argv[index + 1])
+    # --timeout SECONDS: 수식 하나의 벽시계 제한 (0이면 제한 없음)
+    timeout = DEFAULT_TIMEOUT
+    if "--timeout" in sys.argv[2:]:
+        index = sys.argv.index("--timeout")
+        try:
+            timeout = float(sys.argv[index + 1]) if index + 1 < len(sys.argv) else timeout
+        except ValueError:
+            print(f"Error: --timeout은 숫자여야 합니다: {sys.argv[index + 1]}")
+            return
+    # --profile: 단계별 시간 측정을 켠 채로 시작 (REPL에서 profile on/off로도 전환)
+    try:
+        calc = SmartCalculator(history_path=history_path, profile="--profile" in sys.argv[2:],
+                               precision=precision[0], digits=precision[1], timeout=timeout or None)
+    except CalculatorError as e:
+        print(f"Error: {e}")
+        return
     
     if command == "calculate" and len(sys.argv) >= 3:
         expression = sys.argv[2]
         try:
-            result = calc.evaluate(expression)
-            print(f"Result: {expression} = {result}")
+            if calc.is_numeric_command(expression):
+                numeric = calc.evaluate_numeric(expression)
+                print(f"Result: {expression} = {numeric.value} {numeric_report(numeric)}")
+            else:
+                result = calc.evaluate(expression)
+                print(f"Result: {expression} = {result}")
         except CalculatorError as e:
             print(f"Error: {e}")
     
@@ -53,6 +206,60 @@ def main():
                         print("No calculation history.")
                     continue
                 
+                if user_input.lower().startswith('search '):
+                    results = calc.search_history(user_input[7:].strip().lower(), limit=20)
+                    if results:
+                        for entry in results:
+                            print(f"  {entry['expression']} = {entry['result']}")
+                    else:
+                        print("No matching history.")
+                    continue
+                
+                if user_input.lower() == 'vars':
+                    variables = calc.cells.cells
+                    if variables:
+                        for name, cell in variables.items():
+                            value = cell.value if cell.error is None else f"Error: {cell.error}"
+                            print(f"  {name} = {cell.expression}  -> {value}")
+                    else:
+                        print("No variables defined.")
+                    continue
+                
+                if user_input.lower().startswith('del '):
+                    updates = calc.delete_variable(user_input[4:])
+                    print(f"Deleted {user_input[4:].strip().lower()}")
+                    print_updates(updates)
+                    continue
+                
+                assignment = ASSIGNMENT_RE.match(user_input)
+                if assignment:
+                    updates = calc.assign(assignment.group(1), assignment.group(2))
+                    name, value, error = updates[0]
+                    print(f"{name} = {value}" if error is None else f"{name}: Error: {error}")
+                    print_updates(updates[1:])
+                    continue
+                
+                if user_input.lower() == 'stats':
+                    print_stats(calc.stats())
+                    continue
+                
+                if user_input.lower() in ('profile on', 'profile off', 'profile reset'):
+                    action = user_input.lower().split()[1]
+                    if action == 'on':
+                        calc.enable_profiling()
+                    elif action == 'off':
+                        calc.disable_profiling()
+                    else:
+                        calc.reset_stats()
+                    print(f"Profiling {'reset' if action == 'reset' else action}.")
+                    continue
+                
+                if user_input.lower() == 'precision' or user_input.lower().startswith('precision '):
+                    if user_input.lower() != 'precision':
+                        print_updates(calc.set_precision(*parse_precision(user_input[10:])))
+                    print(f"Precision: {calc.precision}")
+                    continue
+                
                 if user_input.lower() == 'clear':
                     calc.clear_history()
                     print("History cleared.")
@@ -63,16 +270,31 @@ def main():
 Smart Calculator Help
 ────────────────────────
 Basic operations: +, -, *, /, **
-Functions: sqrt(x)
+Functions: sqrt, exp, log, sin, cos, tan, ... (see README)
 Constants: pi, e
 Commands:
   history - Show calculation history
+  search <text> - Search history by expression
+  a = 3   - Define a variable (b = a * 2 updates when a changes)
+  integrate(sin(x), 0, pi)  - Definite integral
+  solve(x**3 - 2*x - 5, 2)  - Root (Newton from 2, or Brent with solve(f, a, b))
+  derive(sin(x), 0)         - Derivative at a point
+  vars    - Show variables
+  del a   - Delete a variable
+  stats   - Cache / history statistics and per-phase timings
+  profile on|off|reset - Per-phase timing collection
+  precision float|fraction|decimal [digits] - Exact / fixed-digit arithmetic
   clear   - Clear history  
   help    - Show help
   quit    - Exit
 """)
                     continue
                 
+                if calc.is_numeric_command(user_input):
+                    numeric = calc.evaluate_numeric(user_input)
+                    print(f"= {numeric.value} {numeric_report(numeric)}")
+                    continue
+                
                 result = calc.evaluate(user_input)
                 print(f"= {result}")
                 
@@ -87,7 +309,7 @@ Commands:
     
     else:
         print("Unknown command.")
-        print("Available commands: calculate, interactive")
+        print("Available commands: calculate, interactive, batch, serve, sweep")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+벡터 / 행렬 수식 (NumPy)
+
+`[1, 2, 3] . [4, 5, 6]`, `inv([[1, 2], [3, 4]]) @ [5, 6]`처럼 배열 리터럴이나 행렬 함수가
+들어간 수식은 NumPy 구현으로 컴파일된다. 상수 배열은 컴파일할 때 한 번만 만들고,
+각 연산은 NumPy 호출 한 번으로 계산한다. (numpy는 선택 의존성: `uv sync --extra array`)
+
+    *, /, +, -, **   원소별 연산 (브로드캐스팅)
+    @ 또는 .          행렬 곱 / 내적
+"""
+from typing import Any, Callable, Sequence
+
+# 히스토리에 원소를 그대로 남길 최대 크기 (넘으면 shape + 요약 통계)
+SUMMARY_MAX_ITEMS = 6
+
+def _np():
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("벡터/행렬 계산에는 numpy가 필요합니다 (uv sync --extra array)")
+    return numpy
+
+def make_array(items: Sequence[Any]) -> Any:
+    """리터럴 원소들로 float64 배열 생성 (행 길이가 다르면 ValueError)"""
+    np = _np()
+    try:
+        return np.array(items, dtype=np.float64)
+    except ValueError:
+        raise ValueError("행렬의 각 행은 길이가 같아야 합니다")
+
+def guarded(function: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    NumPy 경고 대신 스칼라 경로와 같은 예외를 내도록 감싼 함수
+
+    0 나누기는 ZeroDivisionError, 정의역 밖(sqrt(-1) 등)은 ValueError, 오버플로는 inf.
+    0차원 결과는 파이썬 숫자로 바꿔서 돌려준다.
+    """
+    np = _np()
+
+    def run(*args, **kwargs):
+        try:
+            with np.errstate(divide='raise', invalid='raise', over='ignore'):
+                result = function(*args, **kwargs)
+        except FloatingPointError as e:
+            if 'divide' in str(e):
+                raise ZeroDivisionError(str(e))
+            raise ValueError(str(e))
+        # 0차원 결과(내적 등)는 파이썬 숫자로
+        return result.item() if getattr(result, 'shape', None) == () else result
+    return run
+
+def summarize(value: Any) -> Any:
+    """
+    히스토리에 남길 간단한 표현
+
+    숫자는 그대로, 작은 배열은 'array(3) [1, 2, 3]', 큰 배열은 shape과 min/max/mean만.
+    """
+    shape = getattr(value, 'shape', None)
+    if shape is None:
+        return value
+    if shape == ():
+        return value.item()
+    dims = 'x'.join(str(size) for size in shape)
+    if value.size <= SUMMARY_MAX_ITEMS:
+        return f"array({dims}) {_np().array2string(value, separator=', ', precision=6)}"
+    if value.dtype.kind in 'biuf':
+        return (f"array({dims}) min={value.min():.6g} max={value.max():.6g} "
+                f"mean={value.mean():.6g}")
+    return f"array({dims}) dtype={value.dtype}"
+
+# ---------------------------------------------------------------------- 행렬 함수
+def dot(a: Any, b: Any) -> Any:
+    return _np().dot(a, b)
+
+def cross(a: Any, b: Any) -> Any:
+    return _np().cross(a, b)
+
+def transpose(a: Any) -> Any:
+    return _np().transpose(a)
+
+def inv(a: Any) -> Any:
+    return _np().linalg.inv(a)
+
+def det(a: Any) -> float:
+    return float(_np().linalg.det(a))
+
+def solve(a: Any, b: Any) -> Any:
+    """연립방정식 a @ x = b의 해"""
+    return _np().linalg.solve(a, b)
+
+def norm(a: Any) -> float:
+    return float(_np().linalg.norm(a))
+
+# (이름, 구현, 최소 인자, 최대 인자) - 배열 전용 함수로 레지스트리에 등록됨
+MATRIX_FUNCTIONS = (
+    ('dot', dot, 2, 2),
+    ('cross', cross, 2, 2),
+    ('transpose', transpose, 1, 1),
+    ('inv', inv, 1, 1),
+    ('det', det, 1, 1),
+    ('solve', solve, 2, 2),
+    ('norm', norm, 1, 1),
+)
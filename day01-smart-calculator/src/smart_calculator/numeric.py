@@ -0,0 +1,370 @@
+"""
+수치 해석: 방정식 풀이 / 정적분 / 미분
+
+컴파일된 수식을 그대로 함수로 써서 점마다 파싱하지 않는다. 한 번에 여러 점이 필요한
+단계(적분 노드, 미분 스텐실, 근 구간 탐색)는 NumPy가 있으면 배열 한 번으로 평가한다.
+결과에는 함수 평가 횟수와 걸린 시간이 함께 담긴다.
+
+    integrate(sin(x), 0, pi)   적응형 가우스-크론로드 (7-15점)
+    solve(x**3 - 2*x - 5, 2)   초깃값 하나: 뉴턴법 (중앙 차분 도함수)
+    solve(x**3 - 2*x - 5, 0, 5) 구간: 브렌트법 (부호가 같으면 먼저 구간 탐색)
+    derive(sin(x), 0)          중앙 차분 + 리처드슨 외삽 (Ridders)
+"""
+import math
+import time
+from decimal import Decimal
+from fractions import Fraction
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .compiler import CompiledExpression
+from .parser import ParseError, tokenize
+
+# 수식 함수처럼 호출하는 수치 해석 명령
+NUMERIC_COMMANDS = ('solve', 'integrate', 'derive')
+
+# 이보다 적은 점은 배열을 만드는 비용이 더 크므로 스칼라로 평가
+VECTOR_MIN_POINTS = 16
+
+_EPS = 2.220446049250313e-16
+
+def _numpy():
+    """numpy 모듈 (없으면 None - 스칼라 평가로 대체)"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+class NumericError(Exception):
+    """수치 해석 실패 (수렴 실패, 정의되지 않는 값 등)"""
+    pass
+
+class NumericResult:
+    """수치 해석 결과 + 비용"""
+    __slots__ = ('value', 'error', 'evaluations', 'seconds', 'converged')
+
+    def __init__(self, value: float, error: float, evaluations: int, seconds: float, converged: bool = True):
+        self.value = value
+        self.error = error
+        self.evaluations = evaluations
+        self.seconds = seconds
+        self.converged = converged
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'value': self.value,
+            'error': self.error,
+            'evaluations': self.evaluations,
+            'seconds': self.seconds,
+            'converged': self.converged,
+        }
+
+    def __repr__(self) -> str:
+        return (f"NumericResult({self.value!r}, error={self.error:.3g}, "
+                f"evaluations={self.evaluations}, seconds={self.seconds:.6f})")
+
+class Sampler:
+    """
+    변수 하나에 대한 함수 f(x) (평가 횟수를 셈)
+
+    정의되지 않는 점(0 나누기, 정의역 밖, 복소수 결과)은 nan으로 돌려준다.
+    정밀도 모드로 컴파일된 수식이나 Fraction / Decimal 값 변수도 float로 계산한다.
+    """
+
+    def __init__(self, compiled: CompiledExpression, variable: str, fixed: Optional[Dict[str, Any]] = None):
+        if variable not in compiled.variables:
+            raise NumericError(f"수식에 변수 {variable}이(가) 없습니다")
+        self.compiled = compiled
+        # 정밀도 모드로 컴파일된 수식도 샘플링은 float로
+        self.function = compiled.float_function()
+        self.variable = variable
+        self.fixed = {name: float(value) if isinstance(value, (Decimal, Fraction)) else value
+                      for name, value in (fixed or {}).items()}
+        self.evaluations = 0
+        self.vectorizable = compiled.registry.vectorizable(compiled.functions)
+
+    def __call__(self, x: float) -> float:
+        self.evaluations += 1
+        self.fixed[self.variable] = x
+        try:
+            return float(self.function(**self.fixed))
+        except (ArithmeticError, ValueError, TypeError):
+            return math.nan
+
+    def many(self, xs: Sequence[float]) -> List[float]:
+        """여러 점을 한 번에 평가 (가능하면 NumPy 배열 한 번으로)"""
+        np = _numpy() if self.vectorizable and len(xs) >= VECTOR_MIN_POINTS else None
+        if np is None:
+            return [self(x) for x in xs]
+        self.evaluations += len(xs)
+        bindings = {**self.fixed, self.variable: np.asarray(xs, dtype=np.float64)}
+        values = self.compiled.evaluate_array(bindings)
+        if values.dtype.kind == 'c':
+            values = np.where(values.imag == 0, values.real, np.nan)
+        return np.broadcast_to(values, (len(xs),)).astype(np.float64).tolist()
+
+# ---------------------------------------------------------------------- 적분
+# 가우스-크론로드 15점 노드 (양수 쪽, 마지막이 0)와 가중치, 짝수 번째 노드의 가우스 7점 가중치
+_XGK = (0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+        0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+        0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+        0.207784955007898467600689403773245, 0.0)
+_WGK = (0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+        0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+        0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+        0.204432940075298892414161999234649, 0.209482141084727828012999174891714)
+_WG = (0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+       0.381830050505118944950369775488975, 0.417959183673469387755102040816327)
+
+def _kronrod_nodes(a: float, b: float) -> List[float]:
+    center, half = 0.5 * (a + b), 0.5 * (b - a)
+    nodes = [center - half * x for x in _XGK[:7]]
+    nodes.append(center)
+    nodes.extend(center + half * x for x in reversed(_XGK[:7]))
+    return nodes
+
+def _kronrod_rule(a: float, b: float, values: Sequence[float]) -> Tuple[float, float]:
+    """(크론로드 15점 적분값, |크론로드 - 가우스 7점| 오차 추정)"""
+    half = 0.5 * (b - a)
+    kronrod = _WGK[7] * values[7]
+    gauss = _WG[3] * values[7]
+    for i in range(7):
+        pair = values[i] + values[14 - i]
+        kronrod += _WGK[i] * pair
+        if i % 2 == 1:
+            gauss += _WG[i // 2] * pair
+    return kronrod * half, abs(kronrod - gauss) * half
+
+def integrate(compiled: CompiledExpression, variable: str, a: float, b: float,
+              fixed: Optional[Dict[str, Any]] = None, abs_tol: float = 1e-10, rel_tol: float = 1e-10,
+              max_evaluations: int = 100_000) -> NumericResult:
+    """
+    [a, b] 정적분 (적응형 가우스-크론로드)
+
+    한 라운드마다 아직 허용 오차를 넘는 구간을 모두 반으로 나누고, 새 구간들의 노드를
+    한 번에 평가한다. max_evaluations를 넘기 전에 수렴하지 못하면 converged=False.
+    """
+    started = time.perf_counter()
+    if not (math.isfinite(a) and math.isfinite(b)):
+        raise NumericError("적분 구간은 유한해야 합니다")
+    sign = 1.0
+    if b < a:
+        a, b, sign = b, a, -1.0
+    f = Sampler(compiled, variable, fixed)
+    if a == b:
+        return NumericResult(0.0, 0.0, 0, time.perf_counter() - started)
+
+    width = b - a
+    pending = [(a, b)]
+    accepted: List[float] = []
+    total_error = 0.0
+    converged = True
+    if max_evaluations < 15:
+        raise NumericError("적분에는 함수 평가가 최소 15회 필요합니다")
+    while pending:
+        nodes = [x for lo, hi in pending for x in _kronrod_nodes(lo, hi)]
+        values = f.many(nodes)
+        if not all(map(math.isfinite, values)):
+            bad = next(x for x, y in zip(nodes, values) if not math.isfinite(y))
+            raise NumericError(f"적분 구간 안에서 함수 값이 유한하지 않습니다 ({variable}={bad:.6g})")
+
+        pieces = [(lo, hi) + _kronrod_rule(lo, hi, values[15 * i:15 * i + 15])
+                  for i, (lo, hi) in enumerate(pending)]
+        estimate = math.fsum(accepted) + math.fsum(piece[2] for piece in pieces)
+        tolerance = max(abs_tol, rel_tol * abs(estimate))
+        budget_left = max_evaluations - f.evaluations
+
+        # 나눌 때마다 다음 라운드에 30점이 더 필요 (예산을 넘으면 현재 값으로 확정)
+        pending = []
+        for lo, hi, value, error in pieces:
+            refine = error > tolerance * (hi - lo) / width
+            if refine and (hi - lo) > 4 * _EPS * max(abs(lo), abs(hi), 1.0) \
+                    and 30 * (len(pending) // 2 + 1) <= budget_left:
+                mid = 0.5 * (lo + hi)
+                pending.append((lo, mid))
+                pending.append((mid, hi))
+            else:
+                if refine:
+                    converged = False
+                accepted.append(value)
+                total_error += error
+
+    return NumericResult(sign * math.fsum(accepted), total_error, f.evaluations,
+                         time.perf_counter() - started, converged)
+
+# ---------------------------------------------------------------------- 미분
+def derive(compiled: CompiledExpression, variable: str, x: float, fixed: Optional[Dict[str, Any]] = None,
+           steps: int = 10, initial_step: Optional[float] = None) -> NumericResult:
+    """
+    x에서의 1계 도함수 (중앙 차분 + 리처드슨 외삽, Ridders 방법)
+
+    스텐실 점 2 * steps개(h, h/2, h/4, ...)를 한 번에 평가한 뒤 외삽 표에서
+    오차 추정이 가장 작은 값을 고른다. 정의역 경계 근처라 큰 h에서 값이 없으면
+    그 단계는 건너뛴다.
+    """
+    started = time.perf_counter()
+    if not math.isfinite(x):
+        raise NumericError("미분할 점은 유한해야 합니다")
+    f = Sampler(compiled, variable, fixed)
+    h0 = initial_step if initial_step is not None else 0.1 * max(1.0, abs(x))
+    hs = [h0 / 2 ** k for k in range(max(2, steps))]
+    values = f.many([x + h for h in hs] + [x - h for h in hs])
+    n = len(hs)
+    differences = [(values[k] - values[n + k]) / (2 * hs[k]) for k in range(n)]
+    first = next((k for k in range(n) if all(map(math.isfinite, differences[k:]))), n)
+    differences, hs = differences[first:], hs[first:]
+    if len(differences) < 2:
+        raise NumericError(f"{variable}={x:.6g} 근처에서 함수 값이 유한하지 않습니다")
+
+    best, best_error = differences[0], math.inf
+    previous = [differences[0]]
+    for i in range(1, len(differences)):
+        row = [differences[i]]
+        factor = 1.0
+        for j in range(1, i + 1):
+            factor *= 4.0
+            row.append(row[j - 1] + (row[j - 1] - previous[j - 1]) / (factor - 1.0))
+            error = max(abs(row[j] - row[j - 1]), abs(row[j] - previous[j - 1]))
+            if error <= best_error:
+                best, best_error = row[j], error
+        # 고차 항이 반올림 오차로 나빠지기 시작하면 중단
+        if abs(row[i] - previous[i - 1]) >= 2.0 * best_error:
+            break
+        previous = row
+
+    return NumericResult(best, best_error, f.evaluations, time.perf_counter() - started)
+
+# ---------------------------------------------------------------------- 근 찾기
+def _brent(f: Callable[[float], float], a: float, b: float, fa: float, fb: float,
+           xtol: float, maxiter: int) -> Tuple[float, float]:
+    """부호가 바뀌는 구간 [a, b]에서 브렌트법 (역2차 보간 + 할선 + 이분법), (근, 구간 폭/2) 반환"""
+    c, fc = b, fb
+    d = e = b - a
+    for _ in range(maxiter):
+        if (fb > 0 and fc > 0) or (fb < 0 and fc < 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2 * _EPS * abs(b) + 0.5 * xtol
+        xm = 0.5 * (c - b)
+        if abs(xm) <= tol or fb == 0:
+            return b, abs(xm)
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p, q = 2 * xm * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * xm * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * xm * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = xm
+        else:
+            d = e = xm
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, xm)
+        fb = f(b)
+        if math.isnan(fb):
+            raise NumericError(f"함수 값이 정의되지 않는 점에 도달했습니다 ({b:.6g})")
+    raise NumericError(f"{maxiter}회 반복 안에 수렴하지 않았습니다")
+
+def _bracket(f: Sampler, a: float, b: float, samples: int) -> Tuple[float, float, float, float]:
+    """[a, b]를 samples개 점으로 나눠 (한 번에 평가) 처음으로 부호가 바뀌는 구간 찾기"""
+    xs = [a + (b - a) * i / (samples - 1) for i in range(samples)]
+    ys = f.many(xs)
+    for i in range(samples - 1):
+        y0, y1 = ys[i], ys[i + 1]
+        if y0 == 0:
+            return xs[i], xs[i], y0, y0
+        if (y0 < 0 < y1) or (y1 < 0 < y0):
+            return xs[i], xs[i + 1], y0, y1
+    if ys[-1] == 0:
+        return xs[-1], xs[-1], 0.0, 0.0
+    raise NumericError(f"[{a:.6g}, {b:.6g}] 구간에서 부호가 바뀌는 점을 찾지 못했습니다")
+
+def solve(compiled: CompiledExpression, variable: str, a: float, b: Optional[float] = None,
+          fixed: Optional[Dict[str, Any]] = None, xtol: float = 1e-12, maxiter: int = 100,
+          samples: int = 1024) -> NumericResult:
+    """
+    f(x) = 0의 근
+
+    b가 없으면 a에서 시작하는 뉴턴법, 있으면 [a, b]에서 브렌트법.
+    양 끝의 부호가 같으면 samples개 점을 한 번에 평가해 부호가 바뀌는 첫 구간을 찾는다.
+    """
+    started = time.perf_counter()
+    f = Sampler(compiled, variable, fixed)
+    if b is None:
+        root, error = _newton(f, a, xtol, maxiter)
+    else:
+        if not (math.isfinite(a) and math.isfinite(b)):
+            raise NumericError("근을 찾을 구간은 유한해야 합니다")
+        if b < a:
+            a, b = b, a
+        fa, fb = f.many([a, b])
+        if not ((fa <= 0 <= fb) or (fb <= 0 <= fa)):
+            a, b, fa, fb = _bracket(f, a, b, max(3, samples))
+        if fa == 0:
+            root, error = a, 0.0
+        elif fb == 0:
+            root, error = b, 0.0
+        else:
+            root, error = _brent(f, a, b, fa, fb, xtol, maxiter)
+    return NumericResult(root, error, f.evaluations, time.perf_counter() - started)
+
+def _newton(f: Sampler, x: float, xtol: float, maxiter: int) -> Tuple[float, float]:
+    """중앙 차분 도함수를 쓰는 뉴턴법, (근, 마지막 이동 거리) 반환"""
+    if not math.isfinite(x):
+        raise NumericError("초깃값은 유한해야 합니다")
+    for _ in range(maxiter):
+        h = 6e-6 * max(1.0, abs(x))
+        fx, forward, backward = f.many([x, x + h, x - h])
+        if fx == 0:
+            return x, 0.0
+        slope = (forward - backward) / (2 * h)
+        if not math.isfinite(fx) or not math.isfinite(slope):
+            raise NumericError(f"함수 값이 정의되지 않는 점에 도달했습니다 ({x:.6g})")
+        if slope == 0:
+            raise NumericError(f"도함수가 0이 되어 뉴턴법을 계속할 수 없습니다 ({x:.6g})")
+        step = fx / slope
+        x -= step
+        if abs(step) <= xtol + 4 * _EPS * abs(x):
+            return x, abs(step)
+    raise NumericError(f"{maxiter}회 반복 안에 수렴하지 않았습니다 (구간을 지정해 보세요)")
+
+# ---------------------------------------------------------------------- 명령 구문
+def split_command(text: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    'integrate(sin(x), 0, pi)' -> ('integrate', ['sin(x)', '0', 'pi'])
+
+    수치 해석 명령 형태가 아니면 None.
+    """
+    try:
+        tokens = tokenize(text)
+    except ParseError:
+        return None
+    if (len(tokens) < 4 or tokens[0].kind != 'name' or tokens[0].text not in NUMERIC_COMMANDS
+            or tokens[1].text != '(' or tokens[-2].text != ')'):
+        return None
+
+    args: List[str] = []
+    depth = 0
+    start = tokens[1].pos + 1
+    for token in tokens[1:-1]:
+        if token.text in '([':
+            depth += 1
+        elif token.text in ')]':
+            depth -= 1
+            if depth == 0 and token is not tokens[-2]:
+                return None
+        elif token.text == ',' and depth == 1:
+            args.append(text[start:token.pos].strip())
+            start = token.pos + 1
+    args.append(text[start:tokens[-2].pos].strip())
+    return tokens[0].text, args
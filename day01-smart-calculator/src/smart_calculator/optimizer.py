@@ -0,0 +1,146 @@
+"""
+구문 트리 최적화 (상수 접기, 공통 부분식 찾기)
+"""
+import math
+import operator
+from decimal import Decimal
+from fractions import Fraction
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Optional
+
+from .parser import Array, BinOp, Call, Name, Node, Num, UnaryOp
+
+BINARY_OPS: Dict[str, Callable[[Any, Any], Any]] = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '//': operator.floordiv,
+    '**': operator.pow,
+    '@': operator.matmul,
+}
+
+UNARY_OPS: Dict[str, Callable[[Any], Any]] = {
+    '+': operator.pos,
+    '-': operator.neg,
+}
+
+# 컴파일 시점에 미리 계산할 정수 결과의 최대 크기 (비트)
+MAX_FOLD_BITS = 4096
+
+def _foldable(value: Any) -> bool:
+    """트리에 다시 넣을 수 있는 값인지 (복소수, nan 제외, 정밀도 모드의 Fraction / Decimal 포함)"""
+    if isinstance(value, float):
+        return not math.isnan(value)
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return value.bit_length() <= MAX_FOLD_BITS
+    if isinstance(value, Decimal):
+        return value.is_finite()
+    # Fraction은 ABC 검사라 느리므로 마지막에
+    return isinstance(value, Fraction) and \
+        max(value.numerator.bit_length(), value.denominator.bit_length()) <= MAX_FOLD_BITS
+
+def _safe_pow(base: Any, exponent: Any) -> bool:
+    """접기에 시간이 오래 걸릴 정수 거듭제곱인지 확인"""
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+        return abs(base) <= 1 or exponent * abs(base).bit_length() <= MAX_FOLD_BITS
+    return True
+
+def fold_constants(node: Node, functions: Dict[str, Callable[..., Any]],
+                   constants: Dict[str, Any], variables: FrozenSet[str] = frozenset()) -> Node:
+    """
+    상수 부분 트리를 컴파일 시점에 미리 계산
+
+    계산 중 예외(0 나누기 등)가 나는 부분은 그대로 남겨서 실행 시점에 같은 오류가 나게 한다.
+    """
+    if isinstance(node, Name):
+        if node.id not in variables and node.id in constants:
+            return Num(constants[node.id])
+        return node
+
+    if isinstance(node, UnaryOp):
+        operand = fold_constants(node.operand, functions, constants, variables)
+        if isinstance(operand, Num):
+            return _try_fold(lambda: UNARY_OPS[node.op](operand.value)) or UnaryOp(node.op, operand)
+        return UnaryOp(node.op, operand)
+
+    if isinstance(node, BinOp):
+        left = fold_constants(node.left, functions, constants, variables)
+        right = fold_constants(node.right, functions, constants, variables)
+        if isinstance(left, Num) and isinstance(right, Num):
+            if node.op != '**' or _safe_pow(left.value, right.value):
+                folded = _try_fold(lambda: BINARY_OPS[node.op](left.value, right.value))
+                if folded is not None:
+                    return folded
+        return BinOp(node.op, left, right)
+
+    if isinstance(node, Call):
+        args = tuple(fold_constants(arg, functions, constants, variables) for arg in node.args)
+        function = functions.get(node.func)
+        if function is not None and all(isinstance(arg, Num) for arg in args):
+            folded = _try_fold(lambda: function(*(arg.value for arg in args)))
+            if folded is not None:
+                return folded
+        return Call(node.func, args)
+
+    if isinstance(node, Array):
+        # 배열 리터럴은 원소만 접고 배열 생성은 컴파일러가 처리
+        return Array(tuple(fold_constants(item, functions, constants, variables) for item in node.items))
+
+    return node
+
+def _try_fold(compute: Callable[[], Any]) -> Optional[Num]:
+    try:
+        value = compute()
+    except Exception:
+        return None
+    return Num(value) if _foldable(value) else None
+
+def node_key(node: Node) -> Hashable:
+    """구조 비교용 키 (1과 1.0을 구분하도록 타입 포함)"""
+    if isinstance(node, Num):
+        # repr로 비교해서 0.0과 -0.0도 구분
+        return ('num', type(node.value).__name__, repr(node.value))
+    if isinstance(node, Name):
+        return ('name', node.id)
+    if isinstance(node, UnaryOp):
+        return ('unary', node.op, node_key(node.operand))
+    if isinstance(node, BinOp):
+        return ('bin', node.op, node_key(node.left), node_key(node.right))
+    if isinstance(node, Call):
+        return ('call', node.func, tuple(node_key(arg) for arg in node.args))
+    if isinstance(node, Array):
+        return ('array', tuple(node_key(item) for item in node.items))
+    return ('other', node)
+
+def common_subexpressions(node: Node) -> FrozenSet[Hashable]:
+    """
+    두 번 이상 나오는 복합 부분식의 키 집합
+
+    이미 반복으로 판정된 부분식의 내부는 세지 않는다 (두 번째부터는 임시 변수로 대체되므로).
+    """
+    counts: Dict[Hashable, int] = {}
+
+    def visit(current: Node):
+        if isinstance(current, (Num, Name)):
+            return
+        key = node_key(current)
+        seen = counts.get(key, 0)
+        counts[key] = seen + 1
+        if seen:
+            return
+        if isinstance(current, UnaryOp):
+            visit(current.operand)
+        elif isinstance(current, BinOp):
+            visit(current.left)
+            visit(current.right)
+        elif isinstance(current, Call):
+            for arg in current.args:
+                visit(arg)
+        elif isinstance(current, Array):
+            for item in current.items:
+                visit(item)
+
+    visit(node)
+    return frozenset(key for key, count in counts.items() if count > 1)
@@ -0,0 +1,189 @@
+"""
+수식 토크나이저 / 파서
+"""
+import re
+from typing import Iterator, List, NamedTuple, Optional, Tuple, Union
+
+class ParseError(Exception):
+    """수식 구문 오류"""
+    pass
+
+class Num(NamedTuple):
+    """숫자 리터럴 (text: float 리터럴의 소스 표기, 정밀도 모드에서 10진 값 그대로 변환할 때 사용)"""
+    value: Union[int, float]
+    text: Optional[str] = None
+
+class Name(NamedTuple):
+    """상수 또는 변수 이름"""
+    id: str
+
+class UnaryOp(NamedTuple):
+    """단항 연산 (+x, -x)"""
+    op: str
+    operand: 'Node'
+
+class BinOp(NamedTuple):
+    """이항 연산"""
+    op: str
+    left: 'Node'
+    right: 'Node'
+
+class Call(NamedTuple):
+    """함수 호출"""
+    func: str
+    args: Tuple['Node', ...]
+
+class Array(NamedTuple):
+    """벡터 / 행렬 리터럴 ([1, 2, 3], [[1, 2], [3, 4]])"""
+    items: Tuple['Node', ...]
+
+Node = Union[Num, Name, UnaryOp, BinOp, Call, Array]
+
+class Token(NamedTuple):
+    kind: str
+    text: str
+    pos: int
+
+_TOKEN_RE = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<num>(?:\d+\.\d*|\.\d+|\d+)(?:e[+-]?\d+)?)
+  | (?P<name>[a-z_][a-z0-9_]*)
+  | (?P<op>\*\*|//|[-+*/(),@.\[\]])
+''', re.VERBOSE)
+
+def tokenize(text: str) -> List[Token]:
+    """수식 문자열을 토큰 리스트로 분리"""
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise ParseError(f"허용되지 않은 문자가 포함되어 있습니다: {text[pos]!r}")
+        kind = match.lastgroup
+        if kind != 'ws':
+            tokens.append(Token(kind, match.group(), pos))
+        pos = match.end()
+    tokens.append(Token('end', '', pos))
+    return tokens
+
+class Parser:
+    """재귀 하강 파서 (파이썬 연산자 우선순위를 따름)
+
+    expr  := term (('+' | '-') term)*
+    term  := unary (('*' | '/' | '//' | '@' | '.') unary)*
+    unary := ('+' | '-') unary | power
+    power := atom ('**' unary)?
+    atom  := NUMBER | NAME | NAME '(' args ')' | '(' expr ')' | '[' args ']'
+
+    '.'은 '@'(행렬 곱 / 내적)와 같다.
+    """
+
+    def __init__(self, text: str):
+        self.tokens = tokenize(text)
+        self.index = 0
+
+    def parse(self) -> Node:
+        """전체 수식 파싱"""
+        if self._peek().kind == 'end':
+            raise ParseError("빈 수식입니다")
+        node = self._expr()
+        token = self._peek()
+        if token.kind != 'end':
+            raise ParseError(f"예상하지 못한 토큰: {token.text!r} (위치 {token.pos})")
+        return node
+
+    def _peek(self) -> Token:
+        return self.tokens[self.index]
+
+    def _advance(self) -> Token:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def _accept(self, *ops: str) -> Union[Token, None]:
+        token = self._peek()
+        if token.kind == 'op' and token.text in ops:
+            self.index += 1
+            return token
+        return None
+
+    def _expect(self, op: str) -> Token:
+        token = self._accept(op)
+        if token is None:
+            found = self._peek()
+            raise ParseError(f"'{op}'가 필요합니다 (위치 {found.pos})")
+        return token
+
+    def _expr(self) -> Node:
+        node = self._term()
+        while (token := self._accept('+', '-')) is not None:
+            node = BinOp(token.text, node, self._term())
+        return node
+
+    def _term(self) -> Node:
+        node = self._unary()
+        while (token := self._accept('*', '/', '//', '@', '.')) is not None:
+            node = BinOp('@' if token.text == '.' else token.text, node, self._unary())
+        return node
+
+    def _unary(self) -> Node:
+        token = self._accept('+', '-')
+        if token is not None:
+            return UnaryOp(token.text, self._unary())
+        return self._power()
+
+    def _power(self) -> Node:
+        node = self._atom()
+        if self._accept('**') is not None:
+            node = BinOp('**', node, self._unary())
+        return node
+
+    def _atom(self) -> Node:
+        token = self._advance()
+        if token.kind == 'num':
+            text = token.text
+            if '.' in text or 'e' in text:
+                return Num(float(text), text)
+            return Num(int(text))
+        if token.kind == 'name':
+            if self._accept('(') is None:
+                return Name(token.text)
+            args = []
+            if self._accept(')') is None:
+                args.append(self._expr())
+                while self._accept(',') is not None:
+                    args.append(self._expr())
+                self._expect(')')
+            return Call(token.text, tuple(args))
+        if token.kind == 'op' and token.text == '(':
+            node = self._expr()
+            self._expect(')')
+            return node
+        if token.kind == 'op' and token.text == '[':
+            items = [self._expr()]
+            while self._accept(',') is not None:
+                items.append(self._expr())
+            self._expect(']')
+            return Array(tuple(items))
+        if token.kind == 'end':
+            raise ParseError("수식이 완전하지 않습니다")
+        raise ParseError(f"예상하지 못한 토큰: {token.text!r} (위치 {token.pos})")
+
+def parse(text: str) -> Node:
+    """수식 문자열을 구문 트리로 변환"""
+    return Parser(text).parse()
+
+def walk(node: Node) -> Iterator[Node]:
+    """구문 트리의 모든 노드를 전위 순회"""
+    yield node
+    if isinstance(node, UnaryOp):
+        yield from walk(node.operand)
+    elif isinstance(node, BinOp):
+        yield from walk(node.left)
+        yield from walk(node.right)
+    elif isinstance(node, Call):
+        for arg in node.args:
+            yield from walk(arg)
+    elif isinstance(node, Array):
+        for item in node.items:
+            yield from walk(item)
@@ -0,0 +1,194 @@
+"""
+정확한 유리수 / 임의 정밀도 계산 모드
+
+기본(float) 모드에서는 이 모듈이 컴파일 / 평가 경로에 끼어들지 않는다. fraction / decimal
+모드도 같은 파싱 -> 상수 접기 -> 코드 생성을 거치되, 숫자 리터럴을 컴파일할 때 한 번만
+Fraction / Decimal로 바꿔 함수의 전역 이름(_n0, _n1, ...)으로 넣어 둔다.
+
+    fraction   +, -, *, /, 정수 거듭제곱은 정확. sqrt, sin 같은 무리 함수와 pi, e는 float로 계산
+    decimal    digits 자리 Decimal로 계산 (sqrt / exp / log는 Decimal 구현, 나머지 함수는
+               float로 계산한 뒤 Decimal로 변환, pi / e는 digits 자리까지)
+
+수치 해석(solve / integrate / derive), 배열 계산, 구간 스윕은 어느 모드에서나 float로 계산한다.
+"""
+import math
+from contextlib import nullcontext
+from decimal import Context, Decimal, DecimalException, DivisionByZero, InvalidOperation, Overflow, localcontext
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Callable, ContextManager, Dict, Iterable, Optional
+
+from .parser import BinOp, Call, Node, Num, UnaryOp
+
+PRECISION_MODES = ('float', 'fraction', 'decimal')
+
+# decimal 모드 기본 자릿수 (decimal 모듈 기본값과 같음)
+DEFAULT_DECIMAL_DIGITS = 28
+
+def _decimal(value: Any) -> Decimal:
+    """함수 결과 / 인자를 Decimal로 (float는 repr - 의미 있는 자릿수만)"""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    return Decimal(value)
+
+def _positive(value: Any) -> Decimal:
+    """로그 인자 (Decimal.ln(0)은 신호 없이 -Infinity이므로 math처럼 직접 거부)"""
+    value = _decimal(value)
+    if not value > 0:
+        raise ValueError("math domain error")
+    return value
+
+# math 구현 -> 현재 decimal 문맥의 자릿수로 계산하는 구현
+_DECIMAL_FUNCTIONS: Dict[Callable[..., Any], Callable[..., Any]] = {
+    math.sqrt: lambda x: _decimal(x).sqrt(),
+    math.exp: lambda x: _decimal(x).exp(),
+    math.log: lambda x, base=None: _positive(x).ln() if base is None else _positive(x).ln() / _positive(base).ln(),
+    math.log10: lambda x: _positive(x).log10(),
+    math.log2: lambda x: _positive(x).ln() / Decimal(2).ln(),
+}
+
+# 0 나누기 / 정의되지 않는 연산 / 자릿수 넘침은 float 모드처럼 예외로 (무한대나 NaN을 돌려주지 않음)
+_DECIMAL_TRAPS = [DivisionByZero, InvalidOperation, Overflow]
+
+# Decimal / Fraction을 그대로 받고 돌려주는 내장 함수
+_NATIVE_FUNCTIONS = frozenset({abs, math.floor, math.ceil, min, max})
+
+def _round(x: Any, ndigits: Any = None) -> Any:
+    """round(x, n) - n도 리터럴이라 Fraction / Decimal로 들어오므로 정수로 바꿔서"""
+    return round(x) if ndigits is None else round(x, int(ndigits))
+
+@lru_cache(maxsize=8)
+def _decimal_pi(digits: int) -> Decimal:
+    """digits 자리 pi (decimal 모듈 문서의 급수)"""
+    with localcontext(Context(prec=digits + 2)):
+        lasts, t, s, n, na, d, da = 0, Decimal(3), 3, 1, 0, 0, 24
+        while s != lasts:
+            lasts = s
+            n, na = n + na, na + 8
+            d, da = d + da, da + 32
+            t = (t * n) / d
+            s += t
+    return Context(prec=digits).plus(s)
+
+class Precision:
+    """
+    계산 정밀도 모드
+
+    Args:
+        mode: 'float' (기본, 가장 빠름) / 'fraction' (정확한 유리수) / 'decimal' (10진 고정 자릿수)
+        digits: decimal 모드의 유효 자릿수 (기본 28)
+    """
+    __slots__ = ('mode', 'digits', 'context')
+
+    def __init__(self, mode: str = 'float', digits: Optional[int] = None):
+        if mode not in PRECISION_MODES:
+            raise ValueError(f"지원하지 않는 정밀도 모드: {mode} ({', '.join(PRECISION_MODES)})")
+        if mode != 'decimal' and digits is not None:
+            raise ValueError("자릿수는 decimal 모드에서만 지정할 수 있습니다")
+        if mode == 'decimal':
+            digits = DEFAULT_DECIMAL_DIGITS if digits is None else digits
+            if isinstance(digits, bool) or not isinstance(digits, int) or digits < 1:
+                raise ValueError(f"자릿수는 1 이상의 정수여야 합니다: {digits!r}")
+        self.mode = mode
+        self.digits = digits
+        self.context = Context(prec=digits, traps=_DECIMAL_TRAPS) if mode == 'decimal' else None
+
+    @property
+    def exact(self) -> bool:
+        """float가 아닌 모드인지"""
+        return self.mode != 'float'
+
+    def __str__(self) -> str:
+        return f"decimal({self.digits})" if self.mode == 'decimal' else self.mode
+
+    def __repr__(self) -> str:
+        return f"Precision({self.mode!r}, {self.digits!r})"
+
+    # ------------------------------------------------------------------ 컴파일 시점
+    def number(self, value: Any, text: Optional[str] = None) -> Any:
+        """숫자 리터럴 하나를 이 모드의 값으로 (text: 소스 표기, 없으면 repr)"""
+        if self.mode == 'fraction':
+            if isinstance(value, float) and not math.isfinite(value):
+                return value
+            return Fraction(value) if isinstance(value, int) else Fraction(text or repr(value))
+        if self.mode == 'decimal':
+            return self.context.create_decimal(value if isinstance(value, int) else text or repr(value))
+        return value
+
+    def convert(self, node: Node) -> Node:
+        """트리의 숫자 리터럴 변환 (배열 리터럴은 float64 배열이 되므로 그대로)"""
+        if isinstance(node, Num):
+            return Num(self.number(node.value, node.text))
+        if isinstance(node, UnaryOp):
+            return UnaryOp(node.op, self.convert(node.operand))
+        if isinstance(node, BinOp):
+            return BinOp(node.op, self.convert(node.left), self.convert(node.right))
+        if isinstance(node, Call):
+            return Call(node.func, tuple(self.convert(arg) for arg in node.args))
+        return node
+
+    def constant(self, value: Any) -> Any:
+        """등록된 상수 변환 (fraction 모드에서 pi, e는 무리수이므로 float 그대로)"""
+        if self.mode == 'decimal':
+            if value == math.pi:
+                return _decimal_pi(self.digits)
+            if value == math.e:
+                return self.context.exp(Decimal(1))
+            return self.number(value)
+        if self.mode == 'fraction' and value not in (math.pi, math.e):
+            return self.number(value)
+        return value
+
+    def constants(self, constants: Dict[str, Any]) -> Dict[str, Any]:
+        return {name: self.constant(value) for name, value in constants.items()}
+
+    def function(self, scalar: Callable[..., Any]) -> Callable[..., Any]:
+        """함수 구현 변환 (decimal 모드에서 결과가 float가 되지 않도록)"""
+        if scalar is round and self.exact:
+            return _round
+        if self.mode != 'decimal' or scalar in _NATIVE_FUNCTIONS:
+            return scalar
+        native = _DECIMAL_FUNCTIONS.get(scalar)
+        if native is not None:
+            return native
+        return lambda *args: _decimal(scalar(*args))
+
+    def functions(self, functions: Dict[str, Callable[..., Any]]) -> Dict[str, Callable[..., Any]]:
+        return {name: self.function(scalar) for name, scalar in functions.items()}
+
+    def namespace(self, registry: Any, names: Iterable[str]) -> Dict[str, Any]:
+        """registry.scalar_namespace와 같은 구성에 이 모드의 상수 / 함수를 채운 네임스페이스"""
+        namespace = registry.scalar_namespace(names)
+        namespace.update(self.constants(registry.constants))
+        for name in names:
+            namespace[name] = self.function(registry.functions[name].scalar)
+        return namespace
+
+    def local(self) -> ContextManager[Any]:
+        """상수 접기 / 평가 중에 쓸 decimal 문맥"""
+        return localcontext(self.context) if self.context is not None else nullcontext()
+
+    # ------------------------------------------------------------------ 평가 시점
+    def bind(self, function: Callable[..., Any]) -> Callable[..., Any]:
+        """컴파일된 함수를 이 모드의 문맥에서 실행하도록 감쌈 (decimal만, 나머지는 그대로)"""
+        if self.context is None:
+            return function
+        context = self.context
+
+        def run(*args, **kwargs):
+            with localcontext(context):
+                try:
+                    result = function(*args, **kwargs)
+                except ZeroDivisionError:
+                    raise
+                except DecimalException as e:
+                    raise ValueError(f"정의되지 않는 decimal 연산입니다 ({type(e).__name__})")
+            # 0 ** -1은 트랩 없이 Infinity가 되므로 (decimal 명세) 다른 모드처럼 0 나누기로
+            if isinstance(result, Decimal) and result.is_infinite():
+                raise ZeroDivisionError("0으로 나눌 수 없습니다")
+            return result
+        return run
+
+FLOAT = Precision()
@@ -0,0 +1,53 @@
+"""
+단계별 실행 시간 프로파일러
+
+계산 한 번을 단계(정규화 / 캐시 조회 / 파싱·컴파일 / 변수 바인딩 / 평가 / 히스토리 기록,
+수치 해석 명령은 통째로 numeric)로
+나눠 단계마다 호출 횟수와 누적 시간을 모은다. 계산기는 프로파일링이 꺼져 있으면
+단계마다 None 검사만 하고 이 모듈을 거치지 않는다.
+"""
+from time import perf_counter_ns
+from typing import Any, Dict
+
+# 보고 순서
+PHASES = ('normalize', 'cache', 'compile', 'bind', 'evaluate', 'numeric', 'history')
+
+class PhaseProfiler:
+    """단계별 호출 횟수 + 누적 시간 (ns)"""
+    __slots__ = ('counts', 'totals', 'calls', 'errors')
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.totals: Dict[str, int] = {}
+        self.calls = 0
+        self.errors = 0
+
+    def add(self, phase: str, elapsed_ns: int):
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+        self.totals[phase] = self.totals.get(phase, 0) + elapsed_ns
+
+    def lap(self, phase: str, start_ns: int) -> int:
+        """start_ns부터 지금까지를 phase에 더하고 지금 시각 반환 (다음 단계의 시작)"""
+        now = perf_counter_ns()
+        self.add(phase, now - start_ns)
+        return now
+
+    def reset(self):
+        self.counts.clear()
+        self.totals.clear()
+        self.calls = 0
+        self.errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """{'calls', 'errors', 'total_ms', 'phases': {단계: {'count', 'total_ms', 'mean_us', 'share'}}}"""
+        total = sum(self.totals.values())
+        phases = {}
+        for phase in sorted(self.counts, key=lambda name: PHASES.index(name) if name in PHASES else len(PHASES)):
+            count, elapsed = self.counts[phase], self.totals[phase]
+            phases[phase] = {
+                'count': count,
+                'total_ms': elapsed / 1e6,
+                'mean_us': elapsed / count / 1e3,
+                'share': elapsed / total if total else 0.0,
+            }
+        return {'calls': self.calls, 'errors': self.errors, 'total_ms': total / 1e6, 'phases': phases}
@@ -0,0 +1,229 @@
+"""
+함수 / 상수 레지스트리
+
+함수마다 스칼라 구현(math)과 선택적인 NumPy 구현을 함께 등록해 두고, 컴파일러가
+수식에 쓰인 이름만 골라 스칼라 / 배열 네임스페이스를 만든다. 이름 검증, 인자 개수 검사,
+상수 접기, 벡터화 가능 여부 판단이 모두 이 레지스트리 하나를 기준으로 한다.
+"""
+import math
+import re
+from functools import reduce
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from . import matrix
+
+# 수식에서 쓸 수 있는 이름 (파서의 name 토큰과 같은 규칙, '_'로 시작하는 이름은 내부용)
+_NAME_RE = re.compile(r'[a-z][a-z0-9_]*$')
+
+# numpy 속성 이름 또는 배열을 받는 함수
+ArrayImpl = Union[str, Callable[..., Any]]
+
+class RegistryError(Exception):
+    """함수/상수 등록 오류"""
+    pass
+
+class FunctionSpec:
+    """
+    등록된 함수 하나
+
+    Args:
+        scalar: 스칼라 구현 (None이면 배열 전용 함수 - 이 함수를 쓰는 수식은 NumPy로 컴파일)
+        ufunc: NumPy 구현 (numpy 속성 이름 또는 함수, None이면 배열 경로에서 원소별 대체)
+        min_args / max_args: 인자 개수 범위 (max_args=None이면 개수 제한 없음)
+        pure: 같은 인자에 항상 같은 결과 (True면 상수 인자 호출을 컴파일 시점에 미리 계산)
+        int_result: 정수 인자에 정수를 돌려줌 (계산 비용 추정에 사용)
+    """
+    __slots__ = ('name', 'scalar', 'ufunc', 'min_args', 'max_args', 'pure', 'int_result')
+
+    def __init__(self, name: str, scalar: Optional[Callable[..., Any]], ufunc: Optional[ArrayImpl] = None,
+                 min_args: int = 1, max_args: Optional[int] = 1, pure: bool = True, int_result: bool = False):
+        self.name = name
+        self.scalar = scalar
+        self.ufunc = ufunc
+        self.min_args = min_args
+        self.max_args = max_args
+        self.pure = pure
+        self.int_result = int_result
+
+    def accepts(self, count: int) -> bool:
+        return count >= self.min_args and (self.max_args is None or count <= self.max_args)
+
+    def arity(self) -> str:
+        if self.max_args is None:
+            return f"{self.min_args}개 이상"
+        if self.min_args == self.max_args:
+            return f"{self.min_args}개"
+        return f"{self.min_args}~{self.max_args}개"
+
+    def array_impl(self, np: Any) -> Callable[..., Any]:
+        """NumPy 구현 (이항 ufunc를 가변 인자 함수에 쓰면 왼쪽부터 차례로 적용, 없으면 원소별 스칼라)"""
+        if self.ufunc is None:
+            return np.vectorize(self.scalar, otypes=[np.float64])
+        impl = getattr(np, self.ufunc) if isinstance(self.ufunc, str) else self.ufunc
+        if getattr(impl, 'nin', 1) == 2 and self.max_args != 2:
+            binary = impl
+            return lambda *args: reduce(binary, args)
+        return impl
+
+    def __repr__(self) -> str:
+        return f"FunctionSpec({self.name!r})"
+
+def _array_log(x: Any, base: Any = None) -> Any:
+    import numpy as np
+    return np.log(x) if base is None else np.log(x) / np.log(base)
+
+def _array_round(x: Any, ndigits: int = 0) -> Any:
+    import numpy as np
+    return np.round(x, int(ndigits))
+
+class Registry:
+    """함수 / 상수 이름 -> 구현 (변경할 때마다 version 증가, 캐시 무효화에 사용)"""
+
+    def __init__(self, functions: Iterable[FunctionSpec] = (), constants: Optional[Dict[str, Any]] = None):
+        self.functions: Dict[str, FunctionSpec] = {spec.name: spec for spec in functions}
+        self.constants: Dict[str, Any] = dict(constants or {})
+        self.version = 0
+        # 컴파일할 때마다 쓰는 파생 테이블 {이름: (만들 때의 version, 값)}
+        self._derived: Dict[str, Tuple[int, Any]] = {}
+
+    def copy(self) -> 'Registry':
+        return Registry(self.functions.values(), self.constants)
+
+    def restore(self, saved: 'Registry'):
+        """
+        copy()로 저장해 둔 상태로 되돌리기 (같은 객체를 공유하는 캐시도 함께 무효화)
+
+        딕셔너리를 통째로 바꿔 끼우므로 다른 스레드의 컴파일이 빈 상태를 보지 않는다.
+        """
+        self.functions = dict(saved.functions)
+        self.constants = dict(saved.constants)
+        self.version += 1
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.functions or name in self.constants
+
+    # ------------------------------------------------------------------ 등록
+    def _check_name(self, name: str):
+        if not isinstance(name, str) or not _NAME_RE.match(name):
+            raise RegistryError(f"사용할 수 없는 이름: {name!r} (소문자로 시작하는 영문/숫자/_)")
+
+    def register_function(self, name: str, scalar: Optional[Callable[..., Any]], ufunc: Optional[ArrayImpl] = None,
+                          min_args: int = 1, max_args: Optional[int] = 1, pure: bool = True,
+                          int_result: bool = False) -> FunctionSpec:
+        """함수 등록 (같은 이름이 있으면 교체)"""
+        self._check_name(name)
+        if name in self.constants:
+            raise RegistryError(f"이미 상수로 등록된 이름입니다: {name}")
+        if scalar is None and ufunc is None:
+            raise RegistryError(f"스칼라 구현과 NumPy 구현 중 하나는 있어야 합니다: {name}")
+        if (scalar is not None and not callable(scalar)) or \
+                (ufunc is not None and not isinstance(ufunc, str) and not callable(ufunc)):
+            raise RegistryError(f"함수 구현이 올바르지 않습니다: {name}")
+        if min_args < 0 or (max_args is not None and max_args < min_args):
+            raise RegistryError(f"인자 개수 범위가 올바르지 않습니다: {name}")
+        spec = FunctionSpec(name, scalar, ufunc, min_args, max_args, pure, int_result)
+        self.functions[name] = spec
+        self.version += 1
+        return spec
+
+    def register_constant(self, name: str, value: Union[int, float]):
+        """상수 등록 (같은 이름이 있으면 교체)"""
+        self._check_name(name)
+        if name in self.functions:
+            raise RegistryError(f"이미 함수로 등록된 이름입니다: {name}")
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise RegistryError(f"상수 값은 숫자여야 합니다: {name}")
+        self.constants[name] = value
+        self.version += 1
+
+    def unregister(self, name: str):
+        """함수 또는 상수 등록 해제"""
+        if self.functions.pop(name, None) is None and self.constants.pop(name, None) is None:
+            raise RegistryError(f"등록되지 않은 이름: {name}")
+        self.version += 1
+
+    # ------------------------------------------------------------------ 컴파일러용
+    def _cached(self, key: str, build: Callable[[], Any]) -> Any:
+        """version이 바뀔 때까지 재사용하는 파생 테이블 (만드는 중에 바뀌면 다음 호출에서 다시 만듦)"""
+        version = self.version
+        cached = self._derived.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        value = build()
+        self._derived[key] = (version, value)
+        return value
+
+    def pure_functions(self) -> Dict[str, Callable[..., Any]]:
+        """상수 접기에 쓸 수 있는 함수들 (공유하는 딕셔너리이므로 수정하지 말 것)"""
+        return self._cached('pure', lambda: {name: spec.scalar for name, spec in self.functions.items()
+                                             if spec.pure and spec.scalar is not None})
+
+    def int_functions(self) -> FrozenSet[str]:
+        return self._cached('int', lambda: frozenset(name for name, spec in self.functions.items()
+                                                     if spec.int_result))
+
+    def missing_ufuncs(self, names: Iterable[str]) -> List[str]:
+        """NumPy 구현이 없는 함수 이름들"""
+        return sorted(name for name in names if self.functions[name].ufunc is None)
+
+    def vectorizable(self, names: Iterable[str]) -> bool:
+        return not self.missing_ufuncs(names)
+
+    def array_only(self, names: Iterable[str]) -> bool:
+        """스칼라 구현이 없는 (행렬) 함수가 있는지"""
+        return any(self.functions[name].scalar is None for name in names)
+
+    def scalar_namespace(self, names: Iterable[str]) -> Dict[str, Any]:
+        """컴파일된 함수의 전역 네임스페이스 (쓰인 함수 + 상수, 내장 함수 차단)"""
+        namespace: Dict[str, Any] = {'__builtins__': {}, **self.constants}
+        for name in names:
+            namespace[name] = self.functions[name].scalar
+        return namespace
+
+    def constant_namespace(self) -> Dict[str, Any]:
+        """함수 없이 상수만 든 스칼라 네임스페이스 (공유하므로 수정하지 말 것)"""
+        return self._cached('constants', lambda: self.scalar_namespace(()))
+
+    def array_namespace(self, names: Iterable[str]) -> Dict[str, Any]:
+        """배열 평가용 네임스페이스 (NumPy 구현으로 채움)"""
+        from .vectorized import require_numpy
+        np = require_numpy()
+        namespace: Dict[str, Any] = {'__builtins__': {}, **self.constants}
+        for name in names:
+            namespace[name] = self.functions[name].array_impl(np)
+        return namespace
+
+def _builtin_functions() -> List[FunctionSpec]:
+    unary = [
+        ('sqrt', math.sqrt, 'sqrt'),
+        ('exp', math.exp, 'exp'),
+        ('log10', math.log10, 'log10'),
+        ('log2', math.log2, 'log2'),
+        ('sin', math.sin, 'sin'),
+        ('cos', math.cos, 'cos'),
+        ('tan', math.tan, 'tan'),
+        ('asin', math.asin, 'arcsin'),
+        ('acos', math.acos, 'arccos'),
+        ('atan', math.atan, 'arctan'),
+        ('sinh', math.sinh, 'sinh'),
+        ('cosh', math.cosh, 'cosh'),
+        ('tanh', math.tanh, 'tanh'),
+    ]
+    specs = [FunctionSpec(name, scalar, ufunc) for name, scalar, ufunc in unary]
+    specs += [
+        FunctionSpec('abs', abs, 'abs', int_result=True),
+        FunctionSpec('round', round, _array_round, max_args=2, int_result=True),
+        FunctionSpec('floor', math.floor, 'floor', int_result=True),
+        FunctionSpec('ceil', math.ceil, 'ceil', int_result=True),
+        FunctionSpec('log', math.log, _array_log, max_args=2),
+        FunctionSpec('atan2', math.atan2, 'arctan2', min_args=2, max_args=2),
+        FunctionSpec('hypot', math.hypot, 'hypot', min_args=2, max_args=2),
+        FunctionSpec('min', min, 'minimum', min_args=2, max_args=None, int_result=True),
+        FunctionSpec('max', max, 'maximum', min_args=2, max_args=None, int_result=True),
+    ]
+    specs += [FunctionSpec(name, None, impl, min_args, max_args)
+              for name, impl, min_args, max_args in matrix.MATRIX_FUNCTIONS]
+    return specs
+
+# 기본 레지스트리 (계산기는 복사본을 받아서 사용자 등록이 서로 섞이지 않음)
+DEFAULT_REGISTRY = Registry(_builtin_functions(), {'pi': math.pi, 'e': math.e})
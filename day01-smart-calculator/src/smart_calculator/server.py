@@ -0,0 +1,217 @@
+"""
+계산기 서버 (asyncio, JSON Lines over TCP / Unix 소켓)
+
+한 줄에 요청 하나, 응답도 한 줄에 하나씩 요청 순서대로 돌려준다 (파이프라이닝 가능).
+모든 연결이 계산기 하나와 컴파일 캐시를 공유한다. 계산은 스레드 풀에서 하므로 오래 걸리는
+요청이 있어도 이벤트 루프(다른 연결)는 멈추지 않고, timeout초가 지나면 오류로 응답한다.
+
+요청 예:
+    {"id": 1, "expression": "2 + 3"}
+    {"id": 2, "expression": "x ** 2", "vars": {"x": 3}}
+    {"id": 3, "expressions": ["1 + 1", "sqrt(16)"]}
+    {"id": 4, "op": "stats"}
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .batch import json_value
+from .calculator import SmartCalculator, CalculatorError
+from .limits import DEFAULT_TIMEOUT, time_limit
+
+# 한 줄 최대 크기 (배치 요청 고려)
+LINE_LIMIT = 16 * 1024 * 1024
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class CalculatorServer:
+    """
+    JSON Lines 계산 서버
+
+    Args:
+        timeout: 요청 한 줄의 응답 제한 (초, None이면 제한 없음). 시간이 지나면 오류로 응답하지만
+                 스레드에서 돌던 계산은 끝날 때까지 작업자 하나를 차지한다 (정수 크기 폭주는 계산
+                 비용 검사가 미리 막음)
+        max_workers: 계산 스레드 수 (None이면 ThreadPoolExecutor 기본값)
+
+    통계 카운터는 잠금 없이 세므로 동시 요청 중에는 근사치다.
+    """
+
+    def __init__(self, calc: Optional[SmartCalculator] = None, latency_window: int = 10000,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT, max_workers: Optional[int] = None):
+        self.calc = calc or SmartCalculator(history_size=0)
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix='calc')
+        self.started_at = time.time()
+        self.connections = 0
+        self.active_connections = 0
+        self.requests = 0
+        self.expressions = 0
+        self.errors = 0
+        # 최근 요청 지연 시간 (초) - 백분위 계산용
+        self.latencies: deque = deque(maxlen=latency_window)
+
+    # ------------------------------------------------------------------ 요청 처리
+    def _evaluate(self, expression: Any, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self.expressions += 1
+        try:
+            if not isinstance(expression, str):
+                raise CalculatorError("expression은 문자열이어야 합니다")
+            if variables:
+                if not isinstance(variables, dict) or not all(
+                        isinstance(value, (int, float)) and not isinstance(value, bool)
+                        for value in variables.values()):
+                    raise CalculatorError("vars는 {이름: 숫자} 형태의 JSON 객체여야 합니다")
+                compiled = self.calc.compile(expression, variables.keys())
+                with time_limit(self.calc.timeout):
+                    result = compiled.evaluate(variables)
+            else:
+                result = self.calc.evaluate(expression, record=False)
+            return {'result': json_value(result)}
+        except CalculatorError as e:
+            self.errors += 1
+            return {'error': str(e)}
+        except ZeroDivisionError:
+            self.errors += 1
+            return {'error': "0으로 나눌 수 없습니다"}
+        except Exception as e:
+            self.errors += 1
+            return {'error': f"계산 오류: {str(e)}"}
+
+    def handle_request(self, request: Any) -> Dict[str, Any]:
+        """요청 하나 처리 (JSON 디코딩된 값)"""
+        if not isinstance(request, dict):
+            self.errors += 1
+            return {'error': "요청은 JSON 객체여야 합니다"}
+
+        response: Dict[str, Any] = {}
+        if 'id' in request:
+            response['id'] = request['id']
+
+        op = request.get('op', 'evaluate')
+        if op == 'stats':
+            response['stats'] = self.stats()
+        elif op == 'ping':
+            response['pong'] = True
+        elif op == 'evaluate' and 'expressions' in request:
+            expressions = request['expressions']
+            if not isinstance(expressions, list):
+                self.errors += 1
+                response['error'] = "expressions는 리스트여야 합니다"
+            else:
+                variables = request.get('vars')
+                response['results'] = [self._evaluate(expression, variables) for expression in expressions]
+        elif op == 'evaluate' and 'expression' in request:
+            response.update(self._evaluate(request['expression'], request.get('vars')))
+        else:
+            self.errors += 1
+            response['error'] = f"알 수 없는 요청: {op}"
+        return response
+
+    def handle_line(self, line: bytes) -> bytes:
+        """요청 한 줄을 (이 스레드에서) 처리해서 응답 한 줄 반환"""
+        start = time.perf_counter()
+        self.requests += 1
+        try:
+            response = self.handle_request(json.loads(line))
+        except ValueError as e:
+            self.errors += 1
+            response = {'error': f"잘못된 JSON: {str(e)}"}
+        return self._finish(response, start)
+
+    async def respond(self, line: bytes) -> bytes:
+        """요청 한 줄을 계산 스레드에서 처리 (이벤트 루프는 막지 않음, timeout초가 지나면 오류 응답)"""
+        start = time.perf_counter()
+        self.requests += 1
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            self.errors += 1
+            return self._finish({'error': f"잘못된 JSON: {str(e)}"}, start)
+        loop = asyncio.get_running_loop()
+        try:
+            response = await asyncio.wait_for(loop.run_in_executor(self.executor, self.handle_request, request),
+                                              self.timeout)
+        except asyncio.TimeoutError:
+            self.errors += 1
+            response = {'error': f"계산 시간 초과 ({self.timeout}초)"}
+            if isinstance(request, dict) and 'id' in request:
+                response = {'id': request['id'], **response}
+        return self._finish(response, start)
+
+    def _finish(self, response: Dict[str, Any], start: float) -> bytes:
+        self.latencies.append(time.perf_counter() - start)
+        return json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n'
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """연결 하나 처리 (요청 순서대로 응답)"""
+        self.connections += 1
+        self.active_connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(b'{"error": "request line too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                writer.write(await self.respond(line))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.active_connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    # ------------------------------------------------------------------ 통계
+    def stats(self) -> Dict[str, Any]:
+        """요청 수, 캐시 적중률, 지연 시간 백분위 (ms)"""
+        latencies = sorted(self.latencies)
+        return {
+            'uptime': time.time() - self.started_at,
+            'connections': self.connections,
+            'active_connections': self.active_connections,
+            'requests': self.requests,
+            'expressions': self.expressions,
+            'errors': self.errors,
+            'cache': self.calc.cache_stats(),
+            'latency_ms': {
+                'count': len(latencies),
+                'p50': _percentile(latencies, 0.50) * 1000,
+                'p90': _percentile(latencies, 0.90) * 1000,
+                'p99': _percentile(latencies, 0.99) * 1000,
+                'max': (latencies[-1] if latencies else 0.0) * 1000,
+            },
+        }
+
+    # ------------------------------------------------------------------ 실행
+    async def start(self, host: str = '127.0.0.1', port: int = 8765,
+                    unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        """서버 시작 (unix_path가 있으면 Unix 소켓)"""
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle_connection, path=unix_path, limit=LINE_LIMIT)
+        return await asyncio.start_server(self.handle_connection, host, port, limit=LINE_LIMIT)
+
+    async def serve_forever(self, host: str = '127.0.0.1', port: int = 8765, unix_path: Optional[str] = None):
+        server = await self.start(host, port, unix_path)
+        addresses = ', '.join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"Calculator server listening on {addresses}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
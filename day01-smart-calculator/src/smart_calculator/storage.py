@@ -0,0 +1,264 @@
+"""
+SQLite 기반 영구 히스토리
+
+- 시작 시 아무것도 읽지 않음 (조회할 때 필요한 만큼만 쿼리)
+- 쓰기는 백그라운드 스레드가 모아서 한 트랜잭션으로 처리 → evaluate()는 fsync를 기다리지 않음
+  (다른 연결이 잠가 두어 실패하면 retries번 다시 시도, 그래도 실패한 묶음은 버리고 last_error에 남김)
+- 수식 부분 문자열 검색은 FTS5 trigram 인덱스, 결과 범위 검색은 value 인덱스 사용
+  (value는 결과의 float 사본 - 문자열로 저장한 큰 정수 / Fraction / Decimal도 범위 검색 가능)
+"""
+import atexit
+import math
+import numbers
+import queue
+import sqlite3
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional
+
+from .history import HistoryEntry
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    expression TEXT NOT NULL,
+    result,
+    timestamp REAL NOT NULL,
+    value REAL
+);
+"""
+
+# value 열이 없던 데이터베이스는 열을 추가하고 숫자로 저장된 결과를 채움
+_VALUE_MIGRATION = """
+ALTER TABLE history ADD COLUMN value REAL;
+UPDATE history SET value = result WHERE typeof(result) IN ('integer', 'real');
+"""
+
+_VALUE_INDEX = "CREATE INDEX IF NOT EXISTS idx_history_value ON history(value);"
+
+# trigram 토크나이저가 없는 오래된 SQLite에서는 LIKE 검색으로 대체
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts
+    USING fts5(expression, content='history', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts(rowid, expression) VALUES (new.id, new.expression);
+END;
+"""
+
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+def _to_sql(result: Any) -> Any:
+    """SQLite에 그대로 넣을 수 없는 값(큰 정수, 복소수 등)은 문자열로"""
+    if isinstance(result, bool):
+        return int(result)
+    if isinstance(result, int):
+        return result if _INT64_MIN <= result <= _INT64_MAX else str(result)
+    if isinstance(result, float):
+        return result
+    return str(result)
+
+def _to_value(result: Any) -> Optional[float]:
+    """범위 검색용 float 사본 (실수가 아니면 None, float 범위를 넘는 정수는 ±inf)"""
+    if not isinstance(result, (numbers.Real, Decimal)):
+        return None
+    try:
+        value = float(result)
+    except OverflowError:
+        value = math.copysign(math.inf, result)
+    return None if math.isnan(value) else value
+
+class PersistentHistory:
+    """HistoryBuffer와 같은 인터페이스를 가진 SQLite 히스토리"""
+
+    def __init__(self, path: str, batch_size: int = 512, busy_timeout: float = 5.0, retries: int = 3):
+        self.path = path
+        self.batch_size = batch_size
+        self.busy_timeout = busy_timeout
+        self.retries = retries
+        self.enabled = True
+        self.has_fts = False
+        self.last_error: Optional[Exception] = None  # 마지막으로 저장하지 못한 묶음의 오류
+        self.dropped = 0  # 저장하지 못하고 버린 기록 수
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------ 연결
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """조회용 연결 (처음 사용할 때 열고 스키마 생성)"""
+        if self._conn is None:
+            conn = self._connect()
+            self._create_schema(conn)
+            try:
+                conn.executescript(_FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                self.has_fts = False
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        conn.executescript(_SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(history)")}
+        if 'value' not in columns:
+            with conn:
+                for statement in filter(str.strip, _VALUE_MIGRATION.split(';')):
+                    conn.execute(statement)
+        conn.execute(_VALUE_INDEX)
+
+    # ------------------------------------------------------------------ 쓰기
+    def append(self, expression: str, result: Any):
+        """기록 추가 (큐에 넣고 바로 반환, 쓰기 스레드가 없거나 죽었으면 새로 시작)"""
+        if self._writer is None or not self._writer.is_alive():
+            with self._lock:
+                self._reader()
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+                    self._writer.start()
+        self._queue.put((expression, _to_sql(result), time.time(), _to_value(result)))
+
+    def _write_loop(self):
+        conn = self._connect()
+        running = True
+        try:
+            while running:
+                batch = []
+                waiters = []
+                item = self._queue.get()
+                while True:
+                    if item is None:
+                        running = False
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        batch.append(item)
+                    if not running or len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                try:
+                    if batch:
+                        self._write_batch(conn, batch)
+                finally:
+                    # 저장에 실패해도 flush()가 영원히 기다리지 않도록
+                    for waiter in waiters:
+                        waiter.set()
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[tuple]):
+        """한 트랜잭션으로 저장 (잠겨 있으면 다시 시도, 끝내 실패하면 묶음을 버리고 last_error에 남김)"""
+        for attempt in range(self.retries + 1):
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO history (expression, result, timestamp, value) VALUES (?, ?, ?, ?)", batch
+                    )
+                return
+            except sqlite3.OperationalError as e:  # database is locked 등 (busy_timeout만큼 기다린 뒤)
+                error = e
+            except sqlite3.Error as e:
+                error = e
+                break
+        self.last_error = error
+        self.dropped += len(batch)
+
+    def flush(self):
+        """대기 중인 기록을 모두 처리할 때까지 대기 (저장하지 못한 기록은 last_error / dropped에 남음)"""
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            # 스레드가 예상 못 한 오류로 끝났으면 더 기다리지 않음 (다음 append()가 다시 시작)
+            while not done.wait(0.1):
+                if not writer.is_alive():
+                    break
+
+    def close(self):
+        """쓰기 스레드 종료 후 연결 닫기"""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._writer = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ------------------------------------------------------------------ 조회
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        self.flush()
+        with self._lock:
+            return self._reader().execute(sql, params).fetchall()
+
+    @staticmethod
+    def _entries(rows: List[tuple]) -> List[HistoryEntry]:
+        return [HistoryEntry(expression, result, timestamp) for expression, result, timestamp in rows]
+
+    def latest(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """최근 limit개를 오래된 순으로 반환"""
+        if limit <= 0:
+            return []
+        rows = self._query(
+            "SELECT expression, result, timestamp FROM history ORDER BY id DESC LIMIT ?", (limit,)
+        )
+        rows.reverse()
+        return [entry.to_dict() for entry in self._entries(rows)]
+
+    def search(self, text: Optional[str] = None, min_result: Optional[float] = None,
+               max_result: Optional[float] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """수식 부분 문자열 / 결과 범위로 검색 (최근 순)"""
+        conditions = []
+        params: List[Any] = []
+        if text:
+            if self.has_fts and len(text) >= 3:
+                conditions.append("id IN (SELECT rowid FROM history_fts WHERE history_fts MATCH ?)")
+                params.append('"' + text.replace('"', '""') + '"')
+            else:
+                escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                conditions.append("expression LIKE ? ESCAPE '\\'")
+                params.append(f"%{escaped}%")
+        # 실수 결과만 범위 비교 대상 (value가 NULL인 복소수 / 배열 요약 등은 제외)
+        if min_result is not None:
+            conditions.append("value >= ?")
+            params.append(float(min_result))
+        if max_result is not None:
+            conditions.append("value <= ?")
+            params.append(float(max_result))
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._query(
+            f"SELECT expression, result, timestamp FROM history {where} ORDER BY id DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [entry.to_dict() for entry in self._entries(rows)]
+
+    def clear(self):
+        """전체 삭제 (테이블을 다시 만들어 FTS 인덱스도 함께 비움)"""
+        self.flush()
+        with self._lock:
+            conn = self._reader()
+            conn.executescript(
+                "DROP TRIGGER IF EXISTS history_ai; DROP TABLE IF EXISTS history_fts; DROP TABLE IF EXISTS history;"
+            )
+            self._create_schema(conn)
+            if self.has_fts:
+                conn.executescript(_FTS_SCHEMA)
+
+    def __len__(self) -> int:
+        return self._query("SELECT count(*) FROM history")[0][0]
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        rows = self._query("SELECT expression, result, timestamp FROM history ORDER BY id")
+        return iter(self._entries(rows))
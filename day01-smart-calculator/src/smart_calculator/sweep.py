@@ -0,0 +1,103 @@
+"""
+범위 스윕 (수식을 구간 전체에 대해 NumPy 청크 단위로 평가)
+
+전체 구간을 메모리에 올리지 않고 chunk_size개씩 계산해서 바로 CSV / .npy로 내보낸다.
+"""
+import math
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
+
+from .compiler import CompiledExpression
+from .vectorized import require_numpy
+
+def count_points(start: float, stop: float, step: float) -> int:
+    """[start, stop) 구간의 점 개수 (range와 같은 규칙)"""
+    if step == 0:
+        raise ValueError("step은 0이 될 수 없습니다")
+    return max(0, math.ceil((stop - start) / step))
+
+def iter_sweep(compiled: CompiledExpression, variable: str, start: float, stop: float, step: float,
+               chunk_size: int = 1_000_000) -> Iterator[Tuple[Any, Any]]:
+    """
+    (x 청크, 결과 청크) 생성
+
+    x는 누적 덧셈 대신 start + i * step으로 계산해서 오차가 쌓이지 않는다.
+    """
+    np = require_numpy()
+    total = count_points(start, stop, step)
+    for offset in range(0, total, chunk_size):
+        index = np.arange(offset, min(offset + chunk_size, total), dtype=np.float64)
+        xs = start + index * step
+        ys = np.broadcast_to(compiled.evaluate_array({variable: xs}), xs.shape)
+        yield xs, ys
+
+def write_csv(output: TextIO, chunks: Iterator[Tuple[Any, Any]], variable: str = 'x') -> int:
+    """청크를 CSV로 이어서 기록, 기록한 점 개수 반환"""
+    np = require_numpy()
+    output.write(f"{variable},value\n")
+    count = 0
+    for xs, ys in chunks:
+        np.savetxt(output, np.column_stack((xs, ys)), delimiter=',', fmt='%.17g')
+        count += len(xs)
+    return count
+
+def write_npy(path: str, total: int, chunks: Iterator[Tuple[Any, Any]]) -> int:
+    """
+    청크를 (total, 2) float64 .npy 파일로 이어서 기록
+
+    헤더에 전체 크기를 먼저 쓰고 청크 데이터를 순서대로 덧붙인다. 헤더가 데이터보다 먼저
+    나가므로 임시 파일에 쓰고 끝까지 성공했을 때만 path로 바꾼다 (중간에 실패하면 잘린
+    파일이 멀쩡한 배열처럼 남지 않도록 임시 파일을 지우고 예외를 그대로 전달).
+    """
+    np = require_numpy()
+    count = 0
+    partial = f"{path}.partial"
+    try:
+        with open(partial, 'wb') as f:
+            header = {'descr': np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+                      'fortran_order': False, 'shape': (total, 2)}
+            np.lib.format.write_array_header_1_0(f, header)
+            for xs, ys in chunks:
+                f.write(np.ascontiguousarray(np.column_stack((xs, ys)), dtype=np.float64).tobytes())
+                count += len(xs)
+        if count != total:
+            raise ValueError(f"헤더의 행 수({total})와 기록한 행 수({count})가 다릅니다")
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return count
+
+def run_sweep(compiled: CompiledExpression, variable: str, start: float, stop: float, step: float,
+              output: Optional[str] = None, chunk_size: int = 1_000_000,
+              stdout: TextIO = sys.stdout) -> Dict[str, Any]:
+    """
+    스윕 실행 후 통계 반환
+
+    Args:
+        output: '.npy'로 끝나면 npy, 그 외 경로는 CSV, None이면 stdout에 CSV
+
+    Returns:
+        {'points': 점 개수, 'seconds': 걸린 시간, 'points_per_sec': 처리량}
+    """
+    total = count_points(start, stop, step)
+    chunks = iter_sweep(compiled, variable, start, stop, step, chunk_size)
+
+    started = time.perf_counter()
+    if output is None:
+        points = write_csv(stdout, chunks, variable)
+    elif output.endswith('.npy'):
+        points = write_npy(output, total, chunks)
+    else:
+        with open(output, 'w', encoding='utf-8', newline='') as f:
+            points = write_csv(f, chunks, variable)
+    seconds = time.perf_counter() - started
+
+    return {
+        'points': points,
+        'seconds': seconds,
+        'points_per_sec': points / seconds if seconds > 0 else float('inf'),
+    }
@@ -0,0 +1,78 @@
+"""
+NumPy 벡터화 평가
+
+컴파일된 코드 객체는 그대로 두고, 전역 네임스페이스만 레지스트리에 등록된 NumPy 구현으로
+바꿔서 배열 전체를 한 번에 계산한다. (numpy는 선택 의존성: `uv sync --extra array`)
+"""
+from typing import Any, Dict
+
+from .compiler import CompiledExpression
+
+class VectorizationError(Exception):
+    """벡터화할 수 없는 수식"""
+    pass
+
+def require_numpy():
+    """numpy 모듈 반환 (없으면 안내 메시지와 함께 예외)"""
+    try:
+        import numpy
+    except ImportError:
+        raise VectorizationError("numpy가 설치되어 있지 않습니다 (uv sync --extra array)")
+    return numpy
+
+def _as_array(value: Any):
+    np = require_numpy()
+    array = np.asarray(value)
+    # 정수 배열은 음수 지수 등에서 실패하므로 float로 승격
+    if array.dtype.kind in 'biu':
+        array = array.astype(np.float64)
+    return array
+
+def evaluate_array(compiled: CompiledExpression, bindings: Dict[str, Any], fallback: bool = False) -> Any:
+    """
+    컴파일된 수식을 배열 바인딩으로 평가
+
+    Args:
+        compiled: variables를 지정해 컴파일한 수식
+        bindings: {'변수명': 배열 또는 스칼라} (브로드캐스팅 규칙 적용)
+        fallback: True면 벡터화할 수 없는 함수가 있을 때 원소별 스칼라 평가로 대체
+
+    Returns:
+        결과 numpy 배열
+    """
+    np = require_numpy()
+
+    missing = [name for name in compiled.variables if name not in bindings]
+    if missing:
+        raise VectorizationError(f"값이 지정되지 않은 변수: {', '.join(missing)}")
+    arrays = {name: _as_array(bindings[name]) for name in compiled.variables}
+
+    unsupported = compiled.registry.missing_ufuncs(compiled.functions)
+    if unsupported:
+        if not fallback:
+            raise VectorizationError(
+                f"벡터화할 수 없는 함수: {', '.join(unsupported)} "
+                f"(스칼라 경로 evaluate()를 사용하거나 fallback=True를 지정하세요)"
+            )
+        return _evaluate_elementwise(compiled, arrays)
+
+    # 0 나누기 등은 예외 대신 inf/nan으로 (numpy 규칙)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        return np.asarray(compiled.array_function()(**arrays))
+
+def _evaluate_elementwise(compiled: CompiledExpression, arrays: Dict[str, Any]) -> Any:
+    """원소마다 스칼라 경로로 평가 (느린 대체 경로)"""
+    np = require_numpy()
+    names = list(arrays)
+    broadcast = np.broadcast_arrays(*arrays.values()) if names else []
+    shape = broadcast[0].shape if broadcast else ()
+    flat = [array.ravel() for array in broadcast]
+    size = int(np.prod(shape))
+    out = np.empty(size, dtype=np.float64)
+    function = compiled.float_function()
+    for i in range(size):
+        try:
+            out[i] = function(**{name: column[i].item() for name, column in zip(names, flat)})
+        except ZeroDivisionError:
+            out[i] = np.nan
+    return out.reshape(shape)
@@ -0,0 +1,53 @@
+"""
+배치 계산 테스트
+"""
+import csv
+import io
+import json
+
+from src.smart_calculator.batch import BatchWriter, run_batch
+
+INPUT = "1 + 1\n\n# comment\n1 / 0\nsqrt(16)\n"
+
+def test_run_batch_keeps_line_numbers():
+    """빈 줄/주석을 건너뛰고 원래 줄 번호 유지"""
+    results = list(run_batch(io.StringIO(INPUT), chunk_size=1))
+    
+    assert [r[0] for r in results] == [1, 4, 5]
+    assert results[0][2] == 2
+    assert results[1][2] is None and "0으로" in results[1][3]
+    assert results[2][2] == 4.0
+
+def test_run_batch_workers_preserve_order():
+    """프로세스 풀 사용 시에도 입력 순서 유지"""
+    lines = "".join(f"{i} * 2\n" for i in range(200))
+    results = list(run_batch(io.StringIO(lines), workers=2, chunk_size=7))
+    
+    assert [r[2] for r in results] == [i * 2 for i in range(200)]
+
+def test_batch_writer_formats():
+    """jsonl / csv 출력 형식"""
+    results = list(run_batch(io.StringIO(INPUT)))
+    
+    out = io.StringIO()
+    writer = BatchWriter(out, "jsonl")
+    for item in results:
+        writer.write(item)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records[0] == {"line": 1, "expression": "1 + 1", "result": 2, "error": None}
+    assert writer.errors == 1
+    
+    out = io.StringIO()
+    writer = BatchWriter(out, "csv")
+    for item in results:
+        writer.write(item)
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows[0] == ["line", "expression", "result", "error"]
+    assert rows[3] == ["5", "sqrt(16)", "4.0", ""]
+
+def test_run_batch_timeout():
+    """비용 예산이나 시간 제한을 넘는 줄만 오류로 기록"""
+    results = list(run_batch(io.StringIO("1 + 1\n2 ** 100000\n3 + 3\n"), timeout=0.5))
+    
+    assert [r[2] for r in results] == [2, None, 6]
+    assert "비용 초과" in results[1][3]
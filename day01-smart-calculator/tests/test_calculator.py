@@ -1,6 +1,7 @@
 """
 계산기 테스트
 """
+import math
 import pytest
 from src.smart_calculator.calculator import SmartCalculator, CalculatorError
 
@@ -44,4 +45,287 @@ def test_error_handling():
     calc = SmartCalculator()
     
     with pytest.raises(CalculatorError):
-        calc.evaluate("1 / 0")
\ No newline at end of file
+        calc.evaluate("1 / 0")
+
+def test_compiled_cache():
+    """컴파일 캐시 테스트"""
+    calc = SmartCalculator(cache_size=2)
+    
+    calc.evaluate("sqrt(16) + 1")
+    calc.evaluate("  SQRT(16) + 1 ")
+    stats = calc.cache_stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+    
+    # LRU 제거
+    calc.evaluate("1 + 1")
+    calc.evaluate("2 + 2")
+    assert "sqrt(16) + 1" not in calc.cache
+    assert len(calc.cache) == 2
+
+def test_parser():
+    """파서 테스트 (우선순위, 지수 표기, 잘못된 입력)"""
+    calc = SmartCalculator()
+    
+    assert calc.evaluate("-2 ** 2") == -4
+    assert calc.evaluate("2 ** 3 ** 2") == 512
+    assert calc.evaluate("7 // 2") == 3
+    assert calc.evaluate("1e3 + .5") == 1000.5
+    assert abs(calc.evaluate("e") - 2.71828) < 0.001
+    
+    for bad in ["", "2 +", "(1 + 2", "1 $ 2", "__import__('os')", "unknown(1)"]:
+        with pytest.raises(CalculatorError):
+            calc.evaluate(bad)
+
+def test_evaluate_array():
+    """NumPy 배열 벡터화 계산 테스트"""
+    np = pytest.importorskip("numpy")
+    calc = SmartCalculator()
+    
+    x = np.arange(5)
+    y = np.array([0.0, 1.0, 4.0, 9.0, 16.0])
+    result = calc.evaluate_array("x**2 + sqrt(y) * pi", x=x, y=y)
+    assert np.allclose(result, x**2 + np.sqrt(y) * np.pi)
+    assert len(calc.get_history()) == 0
+    
+    # 같은 컴파일 결과를 스칼라 경로에서도 재사용
+    compiled = calc.compile("x**2 + sqrt(y) * pi", vars=("x", "y"))
+    assert compiled.evaluate({"x": 2, "y": 4}) == 4 + 2 * np.pi
+    
+    with pytest.raises(CalculatorError):
+        calc.evaluate_array("x + y", x=x)
+    with pytest.raises(CalculatorError):
+        calc.compile("x + 1", vars=("pi",))
+
+def test_function_registry():
+    """함수 / 상수 레지스트리 (스칼라 + 배열 경로, 원소별 대체)"""
+    np = pytest.importorskip("numpy")
+    calc = SmartCalculator()
+    
+    assert calc.evaluate("max(1, 5, 3) + min(2, 0.5)") == 5.5
+    assert calc.evaluate("log(8, 2)") == pytest.approx(3.0)
+    assert np.allclose(calc.evaluate_array("max(x, 0, y)", x=[-1.0, 2.0], y=[0.5, 0.0]), [0.5, 2.0])
+    with pytest.raises(CalculatorError, match="인자"):
+        calc.evaluate("sin(1, 2)")
+    # 'e'가 들어간 변수 이름은 상수 e와 무관
+    calc.assign("rate", "0.5")
+    assert calc.evaluate("rate * e") == 0.5 * math.e
+    
+    calc.register_constant("g", 9.81)
+    calc.register_function("sigmoid", lambda v: 1 / (1 + math.exp(-v)),
+                           ufunc=lambda v: 1 / (1 + np.exp(-v)))
+    calc.register_function("clamp01", lambda v: min(max(v, 0.0), 1.0))
+    assert calc.evaluate("sigmoid(0) * g") == pytest.approx(9.81 / 2)
+    
+    xs = np.array([-2.0, 0.0, 0.5, 3.0])
+    assert np.allclose(calc.evaluate_array("sigmoid(x)", x=xs), 1 / (1 + np.exp(-xs)))
+    # NumPy 구현이 없는 함수는 fallback=True일 때만 원소별 스칼라 계산
+    with pytest.raises(CalculatorError, match="벡터화"):
+        calc.evaluate_array("clamp01(x)", x=xs)
+    assert np.allclose(calc.evaluate_array("clamp01(x) + sigmoid(x)", x=xs, fallback=True),
+                       np.clip(xs, 0, 1) + 1 / (1 + np.exp(-xs)))
+    
+    # 다시 등록하면 캐시와 변수도 새 구현으로
+    calc.assign("s", "sigmoid(rate)")
+    calc.register_function("sigmoid", lambda v: 2 * v, ufunc="negative")
+    assert calc.evaluate("sigmoid(3)") == 6
+    assert calc.get_variable("s") == 1.0
+    with pytest.raises(CalculatorError, match="sigmoid"):
+        calc.unregister("sigmoid")  # 변수 s가 사용 중 -> 되돌림
+    assert calc.evaluate("sigmoid(1)") == 2
+    with pytest.raises(CalculatorError):
+        calc.register_constant("rate", 1)
+    # 컴파일러가 재사용하는 정수 결과 함수 목록도 등록하면 바로 반영
+    calc.register_function("big", lambda v: 10 ** int(v), int_result=True)
+    with pytest.raises(CalculatorError, match="비용"):
+        calc.evaluate("big(3) ** 10 ** 9")
+    
+    # 등록은 계산기마다 따로
+    with pytest.raises(CalculatorError):
+        SmartCalculator().evaluate("g")
+
+def test_matrix_expressions():
+    """벡터 / 행렬 리터럴, 행렬 곱, 선형 대수 함수, 히스토리 요약"""
+    np = pytest.importorskip("numpy")
+    calc = SmartCalculator()
+    
+    assert calc.evaluate("[1, 2, 3] . [4, 5, 6]") == 32
+    assert np.allclose(calc.evaluate("inv([[1, 2], [3, 4]]) @ [5, 6]"), [-4, 4.5])
+    assert np.allclose(calc.evaluate("solve([[1, 2], [3, 4]], [5, 6])"), [-4, 4.5])
+    assert np.allclose(calc.evaluate("[1, 2] * [3, 4] + 1"), [4, 9])  # *는 원소별
+    assert calc.evaluate("det(transpose([[1, 2], [3, 4]]))") == pytest.approx(-2)
+    assert calc.evaluate("solve(x**2 - 2, 1)") == pytest.approx(math.sqrt(2))  # 수치 해석은 그대로
+    
+    calc.assign("m", "[[2, 0], [0, 4]]")
+    assert np.allclose(calc.evaluate("m @ [1, 1] + sqrt(m) @ [1, 0]"), [2 + math.sqrt(2), 4])
+    history = calc.get_history()
+    assert history[-1]["result"].startswith("array(2) ")
+    calc.evaluate("[[1, 2, 3], [4, 5, 6], [7, 8, 9]] * 2")
+    assert calc.get_history(1)[0]["result"] == "array(3x3) min=2 max=18 mean=10"
+    
+    with pytest.raises(CalculatorError, match="0으로"):
+        calc.evaluate("[1, 2] / 0")
+    with pytest.raises(CalculatorError, match="길이"):
+        calc.evaluate("[[1, 2], [3]]")
+    with pytest.raises(CalculatorError):
+        calc.evaluate("inv([[1, 2], [2, 4]])")
+
+def test_precision_modes():
+    """fraction / decimal 정밀도 모드 (리터럴은 컴파일 시점에 한 번만 변환)"""
+    from decimal import Decimal
+    from fractions import Fraction
+    
+    assert SmartCalculator().evaluate("0.1 + 0.2") != 0.3  # 기본 float 모드는 그대로
+    
+    calc = SmartCalculator(precision="fraction")
+    assert calc.evaluate("0.1 + 0.2") == Fraction(3, 10)
+    assert calc.evaluate("1/3 * 3") == 1
+    assert calc.evaluate("round(2.675, 2)") == Fraction(268, 100)
+    assert isinstance(calc.evaluate("sqrt(2)"), float)  # 무리수는 float로
+    compiled = calc.compile("0.1 * x + 0.2", vars=("x",))
+    assert compiled.literals == {"_n0": Fraction(1, 10), "_n1": Fraction(1, 5)}
+    assert compiled.evaluate({"x": Fraction(2)}) == Fraction(2, 5)
+    assert calc.evaluate("solve(x**2 - 2, 1)") == pytest.approx(math.sqrt(2))  # 수치 해석은 float
+    with pytest.raises(CalculatorError, match="비용"):
+        calc.evaluate("1.5 ** 100000")
+    
+    calc = SmartCalculator(precision="decimal", digits=40)
+    assert calc.evaluate("0.1 + 0.2") == Decimal("0.3")
+    assert calc.evaluate("1/3") == Decimal("0." + "3" * 40)
+    assert str(calc.evaluate("sqrt(2)")) == "1.414213562373095048801688724209698078570"
+    assert str(calc.evaluate("pi")) == "3.141592653589793238462643383279502884197"
+    assert isinstance(calc.evaluate("sin(1) + 0.5"), Decimal)
+    with pytest.raises(CalculatorError, match="0으로"):
+        calc.evaluate("1/0")
+    with pytest.raises(CalculatorError):
+        calc.evaluate("sqrt(-1)")
+    # Decimal 명세상 신호 없이 무한대가 되는 연산도 다른 모드처럼 오류
+    with pytest.raises(CalculatorError, match="0으로"):
+        calc.evaluate("0 ** -1")
+    with pytest.raises(CalculatorError, match="domain"):
+        calc.evaluate("log(0)")
+    
+    # 모드를 바꾸면 변수도 새 모드로 다시 계산
+    calc.assign("a", "0.1")
+    calc.assign("b", "a * 3")
+    calc.set_precision("fraction")
+    assert calc.get_variable("b") == Fraction(3, 10)
+    calc.set_precision("float")
+    assert calc.get_variable("b") == 0.1 * 3
+    with pytest.raises(CalculatorError):
+        calc.set_precision("binary")
+    with pytest.raises(CalculatorError):
+        SmartCalculator(precision="fraction", digits=10)
+
+def test_history_ring_buffer():
+    """히스토리 용량 제한 / 끄기 테스트"""
+    calc = SmartCalculator(history_size=3)
+    for i in range(5):
+        calc.evaluate(f"{i} + 0")
+    
+    history = calc.get_history(10)
+    assert [entry['result'] for entry in history] == [2, 3, 4]
+    assert [entry['result'] for entry in calc.get_history(2)] == [3, 4]
+    assert 'T' in history[0]['timestamp']
+    
+    calc = SmartCalculator(history_size=0)
+    calc.evaluate("1 + 1")
+    assert len(calc.history) == 0
+    assert calc.get_history() == []
+
+def test_constant_folding_and_cse():
+    """상수 접기 / 공통 부분식 제거 테스트"""
+    calc = SmartCalculator()
+    
+    compiled = calc.compile("2 * pi + e ** 2")
+    assert compiled.source == f"lambda : {2 * math.pi + math.e ** 2!r}"
+    
+    compiled = calc.compile("sqrt(pi*r) + sqrt(pi*r) * 2", vars=("r",))
+    assert compiled.source.count("sqrt(") == 1
+    assert compiled.evaluate({"r": 2.0}) == pytest.approx(3 * math.sqrt(math.pi * 2.0))
+    
+    # 접을 수 없는 상수식은 실행 시점에 같은 오류
+    with pytest.raises(CalculatorError, match="0으로"):
+        calc.evaluate("2 * pi + 1 / 0")
+    assert calc.evaluate("(-2) ** 2") == 4
+    assert calc.evaluate("-2 ** 2") == -4
+
+def test_cost_guard_and_timeout():
+    """계산 비용 제한 / 시간 제한 테스트"""
+    calc = SmartCalculator()
+    
+    for expensive in ["9**9**9", "(9**9**9) / 2", "2 ** 100000"]:
+        with pytest.raises(CalculatorError, match="비용 초과"):
+            calc.evaluate(expensive)
+    assert calc.evaluate("2 ** 1000") == 2 ** 1000
+    assert calc.evaluate("2.0 ** 0.5") == 2.0 ** 0.5
+    
+    calc = SmartCalculator(max_digits=None, timeout=0.1)
+    with pytest.raises(CalculatorError, match="시간 초과"):
+        calc.evaluate("9**9**9")
+
+def test_cost_guard_uses_bound_int_values():
+    """변수에 묶인 정수는 float가 아니라 실제 자릿수로 비용 추정"""
+    from src.smart_calculator.limits import CostLimitError, estimate_digits
+    from src.smart_calculator.parser import parse
+    
+    tree = parse("x ** x ** x")
+    assert estimate_digits(tree, 4300) == (False, 309.0)  # 값을 모르면 float로 가정
+    with pytest.raises(CostLimitError):
+        estimate_digits(tree, 4300, values={"x": 9})
+    assert estimate_digits(tree, 4300, values={"x": 2})[0] is True
+    assert estimate_digits(tree, 4300, values={"x": 9.0}) == (False, 309.0)
+    
+    calc = SmartCalculator()
+    compiled = calc.compile("x ** x ** x", vars=("x",))
+    assert compiled.evaluate({"x": 2}) == 16
+    with pytest.raises(CostLimitError):
+        compiled.evaluate({"x": 9})
+    calc.assign("a", "99")
+    with pytest.raises(CalculatorError, match="비용 초과"):
+        calc.evaluate("a ** a ** a")
+
+def test_cost_guard_int_functions_with_float_args():
+    """abs / min / max는 실수 인자면 실수 결과, round / floor / ceil은 인자 크기의 정수"""
+    calc = SmartCalculator()
+    
+    assert calc.evaluate("abs(-2.5)**abs(-1.5)") == 2.5 ** 1.5
+    assert calc.evaluate("max(2.5, 1)**max(1.5, 1)") == 2.5 ** 1.5
+    assert calc.evaluate("round(2.5)**round(3.5)") == 16
+    assert calc.evaluate("floor(2.7)**ceil(3.2)") == 16
+    np = pytest.importorskip("numpy")
+    assert list(calc.evaluate_array("abs(x)**abs(x)", x=np.array([2.0, 3.0]))) == [4.0, 27.0]
+    
+    # 정수 인자나 큰 실수를 정수로 바꾼 결과는 여전히 검사
+    for expensive in ["abs(-9)**abs(99999)", "max(9, 2)**99999", "floor(1e300)**floor(1e300)"]:
+        with pytest.raises(CalculatorError, match="비용 초과"):
+            calc.evaluate(expensive)
+
+def test_profiling_stats():
+    """단계별 시간 측정 테스트"""
+    calc = SmartCalculator()
+    calc.evaluate("1 + 2")
+    assert calc.stats()["profiling"] is False
+    assert "phases" not in calc.stats()
+    
+    calc.enable_profiling()
+    calc.evaluate("1 + 2")       # 캐시 적중
+    calc.evaluate("sqrt(2) * 3")  # 미스 -> 컴파일
+    calc.assign("a", "2")
+    assert calc.evaluate("a * 3", record=False) == 6
+    with pytest.raises(CalculatorError):
+        calc.evaluate("1 / 0")
+    
+    stats = calc.stats()
+    phases = stats["phases"]
+    assert stats["calls"] == 4 and stats["errors"] == 1
+    assert phases["normalize"]["count"] == 4
+    assert phases["cache"]["count"] == 1 and phases["compile"]["count"] == 3
+    assert phases["bind"]["count"] == 1
+    assert phases["evaluate"]["count"] == 3 and phases["history"]["count"] == 2
+    assert sum(row["share"] for row in phases.values()) == pytest.approx(1.0)
+    
+    calc.reset_stats()
+    assert calc.stats()["calls"] == 0 and calc.cache_stats()["hits"] == 0
+    calc.disable_profiling()
+    assert calc.evaluate("1 + 2") == 3 and calc.stats()["profiling"] is False
@@ -0,0 +1,85 @@
+"""
+변수 / 의존성 그래프 테스트
+"""
+import math
+
+import pytest
+
+from src.smart_calculator.calculator import SmartCalculator, CalculatorError
+
+def test_assign_recomputes_dependents_in_order():
+    """변수 변경 시 의존 셀만 위상 순서로 재계산"""
+    calc = SmartCalculator()
+    calc.assign("a", "3")
+    calc.assign("b", "a * 2 + sqrt(a)")
+    calc.assign("c", "b + a")
+    calc.assign("other", "10")
+    
+    updates = calc.assign("a", "4")
+    
+    assert [name for name, _, _ in updates] == ["a", "b", "c"]
+    assert calc.get_variable("b") == 10.0
+    assert calc.get_variable("c") == 14.0
+    assert calc.evaluate("c - other") == 4.0
+
+def test_assign_errors():
+    """순환 참조, 정의되지 않은 변수, 오류 전파"""
+    calc = SmartCalculator()
+    calc.assign("a", "1")
+    calc.assign("b", "a + 1")
+    
+    with pytest.raises(CalculatorError, match="순환"):
+        calc.assign("a", "b * 2")
+    assert calc.get_variable("a") == 1
+    
+    calc.assign("c", "1 / (b - 2)")
+    with pytest.raises(CalculatorError):
+        calc.get_variable("c")
+    calc.assign("a", "2")
+    assert calc.get_variable("c") == 1.0
+    
+    # 아직 없는 변수를 참조해도 정의할 수 있고, 나중에 정의되면 계산됨
+    calc.assign("later", "missing * 2")
+    with pytest.raises(CalculatorError, match="later"):
+        calc.evaluate("later + 1")
+    calc.assign("missing", "21")
+    assert calc.get_variable("later") == 42
+    
+    with pytest.raises(CalculatorError):
+        calc.assign("pi", "3")
+
+def test_large_graph_only_touches_affected_cells():
+    """셀이 많아도 영향받는 셀만 재계산하고 재파싱하지 않음"""
+    calc = SmartCalculator()
+    calc.assign("x0", "1")
+    for i in range(1, 3000):
+        calc.assign(f"x{i}", f"x{i - 1} + 1")
+    for i in range(3000):
+        calc.assign(f"y{i}", f"{i} * 2")
+    
+    before_recomputed = calc.cells.recomputed
+    before_misses = calc.cache.misses
+    calc.assign("x2990", "0")
+    
+    assert calc.cells.recomputed - before_recomputed == 10
+    assert calc.cache.misses - before_misses == 1
+    assert calc.get_variable("x2999") == 9
+    assert math.isclose(calc.get_variable("y100"), 200)
+
+def test_int_cells_are_cost_checked():
+    """정수 셀 값으로 비용 추정 - 폭주하는 정의는 멈추지 않고 CalculatorError"""
+    calc = SmartCalculator()
+    calc.assign("a", "99")
+    calc.assign("b", "a ** a")
+    assert calc.get_variable("b") == 99 ** 99
+    
+    with pytest.raises(CalculatorError, match="비용 초과"):
+        calc.assign("cc", "b ** b")
+    assert "cc" not in calc.cells
+    
+    # 이미 정의된 의존 셀은 값이 커지면 오류 상태가 됨
+    calc.assign("c2", "b * 2")
+    calc.assign("d", "c2 ** 10")
+    updates = calc.assign("a", "999")
+    assert [name for name, _, _ in updates] == ["a", "b", "c2", "d"]
+    assert "비용 초과" in updates[-1][2]
@@ -0,0 +1,95 @@
+"""
+여러 스레드가 계산기 하나를 공유할 때의 스트레스 테스트
+"""
+import sys
+import threading
+
+import pytest
+
+from src.smart_calculator.calculator import SmartCalculator
+from src.smart_calculator.compiler import ExpressionCache
+
+THREADS = 8
+ITERATIONS = 400
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    """스레드 전환을 잦게 해서 경쟁 상태가 드러나도록"""
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(previous)
+
+def run_threads(target, count=THREADS):
+    errors = []
+    def guarded(index):
+        try:
+            target(index)
+        except Exception as e:  # 스레드 안의 실패를 테스트로 전달
+            errors.append(e)
+    threads = [threading.Thread(target=guarded, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+def test_concurrent_evaluate_shared_calculator():
+    """작은 캐시(잦은 밀어내기) + 공유 히스토리에서 결과와 기록 순서가 모두 맞는지"""
+    calc = SmartCalculator(cache_size=32, history_size=None)
+
+    def worker(index):
+        for i in range(ITERATIONS):
+            expression = f"{index} * 1000 + {i % 64} + sqrt({i % 5} ** 2)"
+            assert calc.evaluate(expression) == index * 1000 + i % 64 + i % 5
+
+    run_threads(worker)
+
+    history = calc.get_history(THREADS * ITERATIONS)
+    assert len(calc.history) == len(history) == THREADS * ITERATIONS
+    # 스레드별 기록 순서는 그대로 유지
+    for index in range(THREADS):
+        mine = [entry['result'] for entry in history if entry['result'] // 1000 == index]
+        assert mine == [index * 1000 + i % 64 + i % 5 for i in range(ITERATIONS)]
+    assert len(calc.cache) <= 32
+
+def test_shared_cache_and_history_capacity():
+    """계산기 여러 개가 캐시 하나를 공유, 끝난 스레드의 기록도 capacity 안에서 유지"""
+    cache = ExpressionCache(maxsize=16)
+    calc = SmartCalculator(cache=cache, history_size=50)
+
+    def worker(index):
+        own = SmartCalculator(cache=cache, history_size=0)
+        for i in range(ITERATIONS):
+            assert own.evaluate(f"{i % 20} + 0.5") == i % 20 + 0.5
+            calc.evaluate(f"{index} + {i} * 0")
+
+    run_threads(worker)
+    run_threads(worker, count=2)  # 앞 스레드들의 기록은 retired로 합쳐짐
+
+    assert len(calc.history) == 50
+    # 최근 50개는 모두 두 번째 실행(스레드 0, 1)의 기록
+    assert len(calc.get_history(100)) == 50
+    assert {entry['result'] for entry in calc.get_history(50)} <= {0, 1}
+    calc.clear_history()
+    assert calc.get_history() == [] and len(calc.history) == 0
+
+def test_assign_while_evaluating():
+    """변수를 다시 정의하는 동안 읽는 스레드는 항상 완전한 값을 봄"""
+    calc = SmartCalculator()
+    calc.assign("a", "1")
+    calc.assign("b", "a * 2")
+    stop = threading.Event()
+
+    def writer(index):
+        for value in range(ITERATIONS):
+            calc.assign("a", str(value))
+        stop.set()
+
+    def reader(index):
+        while not stop.is_set():
+            assert calc.evaluate("b + 0", record=False) % 2 == 0
+            assert all(value is not None for value in calc.variables.values())
+
+    run_threads(lambda index: writer(index) if index == 0 else reader(index), count=4)
+    assert calc.get_variable("b") == 2 * (ITERATIONS - 1)
@@ -0,0 +1,110 @@
+"""
+영구 히스토리 테스트
+"""
+import sqlite3
+from decimal import Decimal
+from fractions import Fraction
+
+from src.smart_calculator.calculator import SmartCalculator
+from src.smart_calculator.storage import PersistentHistory
+
+def test_persistent_history_survives_restart(tmp_path):
+    """프로세스(계산기) 재시작 후에도 히스토리 유지"""
+    path = str(tmp_path / "history.db")
+    calc = SmartCalculator(history_path=path)
+    calc.evaluate("2 + 2")
+    calc.evaluate("sqrt(16) * 10")
+    calc.evaluate("2 ** 100")
+    calc.history.close()
+    
+    calc = SmartCalculator(history_path=path)
+    history = calc.get_history()
+    assert [entry['expression'] for entry in history] == ["2 + 2", "sqrt(16) * 10", "2 ** 100"]
+    assert history[0]['result'] == 4
+    assert history[2]['result'] == str(2 ** 100)
+    calc.history.close()
+
+def test_persistent_history_search(tmp_path):
+    """부분 문자열 / 결과 범위 검색"""
+    calc = SmartCalculator(history_path=str(tmp_path / "history.db"))
+    for i in range(50):
+        calc.evaluate(f"sqrt({i * i})" if i % 2 else f"{i} + 0")
+    
+    found = calc.search_history("sqrt(4")
+    assert {entry['expression'] for entry in found} == {"sqrt(49)", "sqrt(441)"}
+    assert [entry['result'] for entry in calc.search_history(min_result=45, max_result=47)] == [47.0, 46, 45.0]
+    assert len(calc.search_history("+", limit=5)) == 5
+    
+    calc.clear_history()
+    assert calc.get_history() == []
+    calc.evaluate("1 + 1")
+    assert calc.search_history("1 + 1")[0]['result'] == 2
+    calc.history.close()
+
+def test_memory_history_search():
+    """메모리 히스토리도 같은 검색 API 지원"""
+    calc = SmartCalculator()
+    calc.evaluate("1 + 1")
+    calc.evaluate("10 * 10")
+    
+    assert [entry['result'] for entry in calc.search_history("10")] == [100]
+    assert [entry['result'] for entry in calc.search_history(max_result=5)] == [2]
+
+def test_exact_results_are_range_searchable(tmp_path):
+    """Fraction / Decimal / 큰 정수 결과도 결과 범위 검색에 포함"""
+    path = str(tmp_path / "history.db")
+    for history_path in (None, path):
+        calc = SmartCalculator(precision="fraction", history_path=history_path)
+        calc.evaluate("0.1 + 0.2")
+        calc.evaluate("2 ** 100")
+        calc.set_precision("decimal")
+        calc.evaluate("0.5 + 0.25")
+        
+        found = calc.search_history(min_result=0, max_result=1)
+        assert [entry['result'] for entry in found][::-1] == (
+            [Fraction(3, 10), Decimal("0.75")] if history_path is None else ["3/10", "0.75"])
+        assert [entry['expression'] for entry in calc.search_history(min_result=1e30)] == ["2 ** 100"]
+        if history_path is not None:
+            calc.history.close()
+
+def test_persistent_history_adds_value_column(tmp_path):
+    """value 열이 없던 데이터베이스도 열어서 범위 검색 가능"""
+    path = str(tmp_path / "history.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE history (id INTEGER PRIMARY KEY, expression TEXT NOT NULL, result, "
+                 "timestamp REAL NOT NULL)")
+    conn.execute("INSERT INTO history (expression, result, timestamp) VALUES ('1 + 1', 2, 0)")
+    conn.commit()
+    conn.close()
+    
+    calc = SmartCalculator(history_path=path)
+    calc.evaluate("3 + 4")
+    assert [entry['result'] for entry in calc.search_history(max_result=10)] == [7, 2]
+    calc.history.close()
+
+def test_persistent_history_survives_locked_database(tmp_path):
+    """다른 연결이 데이터베이스를 잠가도 쓰기 스레드가 살아 있고 flush()가 멈추지 않음"""
+    path = str(tmp_path / "history.db")
+    history = PersistentHistory(path, busy_timeout=0.05, retries=1)
+    history.append("1 + 1", 2)
+    history.flush()
+    
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN EXCLUSIVE")
+    history.append("2 + 2", 4)
+    history.flush()
+    assert isinstance(history.last_error, sqlite3.OperationalError)
+    assert history.dropped == 1
+    other.execute("ROLLBACK")
+    other.close()
+    
+    history.append("3 + 3", 6)
+    assert [entry['expression'] for entry in history.latest()] == ["1 + 1", "3 + 3"]
+    assert history._writer.is_alive()
+    
+    # 쓰기 스레드가 끝나 있으면 다음 append()가 다시 시작
+    history._queue.put(None)
+    history._writer.join()
+    history.append("4 + 4", 8)
+    assert len(history) == 3
+    history.close()
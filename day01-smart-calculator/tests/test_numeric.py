@@ -0,0 +1,80 @@
+"""
+수치 해석 (solve / integrate / derive) 테스트
+"""
+import math
+
+import pytest
+
+from src.smart_calculator import numeric
+from src.smart_calculator.calculator import SmartCalculator, CalculatorError
+
+def test_integrate(monkeypatch):
+    """적분값, 평가 횟수, 벡터화 / 스칼라 경로 일치"""
+    calc = SmartCalculator()
+    
+    assert calc.evaluate("integrate(sin(x), 0, pi)") == pytest.approx(2.0, abs=1e-12)
+    result = calc.integrate("exp(-t**2)", -10, 10)
+    assert result.value == pytest.approx(math.sqrt(math.pi), rel=1e-12)
+    assert result.converged and result.evaluations % 15 == 0 and result.seconds >= 0
+    assert calc.integrate("x", 1, 0).value == pytest.approx(-0.5)
+    
+    compiled = calc.compile("sqrt(x) * cos(x)", vars=("x",))
+    vectorized = numeric.integrate(compiled, "x", 0, 2)
+    monkeypatch.setattr(numeric, "VECTOR_MIN_POINTS", 10**9)
+    scalar = numeric.integrate(compiled, "x", 0, 2)
+    assert vectorized.value == pytest.approx(scalar.value, rel=1e-12)
+    assert vectorized.evaluations == scalar.evaluations
+    
+    # 평가 예산을 넘으면 멈추고 수렴하지 않았다고 표시
+    limited = numeric.integrate(calc.compile("1 / sqrt(x)", vars=("x",)), "x", 0, 1, max_evaluations=200)
+    assert not limited.converged and limited.evaluations <= 200
+
+def test_solve_and_derive():
+    """뉴턴법 / 브렌트법 / 구간 탐색, 도함수"""
+    calc = SmartCalculator()
+    
+    newton = calc.evaluate_numeric("solve(x**3 - 2*x - 5, 2)")
+    brent = calc.solve("x**3 - 2*x - 5", 0, 5)
+    assert newton.value == pytest.approx(2.0945514815423265, abs=1e-12)
+    assert brent.value == pytest.approx(newton.value, abs=1e-12)
+    assert 0 < newton.evaluations < 50
+    # 양 끝의 부호가 같으면 먼저 부호가 바뀌는 구간을 찾음
+    assert calc.solve("(x - 1) * (x - 2)", 0, 1.5).value == pytest.approx(1.0)
+    
+    assert calc.evaluate("derive(sin(x), 0)") == pytest.approx(1.0, abs=1e-10)
+    assert calc.derive("exp(x)", 3).value == pytest.approx(math.exp(3), rel=1e-10)
+    # 정의역 경계 근처 (큰 h에서는 값이 없음)
+    assert calc.derive("sqrt(x)", 0.01).value == pytest.approx(5.0, rel=1e-8)
+    
+    # 정의된 변수는 상수로 바인딩
+    calc.assign("k", "3")
+    assert calc.evaluate("derive(x**k, 2)") == pytest.approx(12.0)
+    assert calc.get_history(1)[0]["expression"] == "derive(x**k, 2)"
+
+def test_numeric_errors():
+    """사용법 / 변수 / 수렴 오류"""
+    calc = SmartCalculator()
+    
+    assert numeric.split_command("integrate(sin(x), 0, pi)") == ("integrate", ["sin(x)", "0", "pi"])
+    assert numeric.split_command("solve(x, 0) + 1") is None
+    
+    with pytest.raises(CalculatorError, match="사용법"):
+        calc.evaluate("derive(x)")
+    with pytest.raises(CalculatorError, match="하나여야"):
+        calc.evaluate("integrate(x * y, 0, 1)")
+    with pytest.raises(CalculatorError, match="부호"):
+        calc.evaluate("solve(x**2 + 1, 0, 1)")
+    with pytest.raises(CalculatorError, match="유한하지"):
+        calc.evaluate("integrate(1 / x, -1, 1)")
+
+def test_numeric_points_must_be_scalars():
+    """구간 / 점에 벡터를 주면 CalculatorError (TypeError가 새어 나오지 않음)"""
+    pytest.importorskip("numpy")
+    calc = SmartCalculator()
+    
+    for command in ["integrate(x, [1, 2], 3)", "derive(sin(x), [0, 1])", "solve(x - 1, [[1, 2], [3, 4]])"]:
+        with pytest.raises(CalculatorError, match="실수 하나"):
+            calc.evaluate(command)
+        with pytest.raises(CalculatorError, match="실수 하나"):
+            calc.evaluate_numeric(command)
+    assert calc.evaluate("integrate(x, 0, 2)") == pytest.approx(2.0)
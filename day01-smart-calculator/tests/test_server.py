@@ -0,0 +1,102 @@
+"""
+계산 서버 테스트
+"""
+import asyncio
+import json
+
+from src.smart_calculator.server import CalculatorServer
+
+def test_handle_request():
+    """요청 종류별 응답"""
+    server = CalculatorServer()
+    
+    assert server.handle_request({"id": 1, "expression": "2 + 3"}) == {"id": 1, "result": 5}
+    assert server.handle_request({"expression": "x ** 2", "vars": {"x": 3}}) == {"result": 9}
+    assert server.handle_request({"expressions": ["1 + 1", "1 / 0"]})["results"] == [
+        {"result": 2}, {"error": "0으로 나눌 수 없습니다"}
+    ]
+    assert "error" in server.handle_request({"expression": "x", "vars": {"x": "a"}})
+    assert "error" in server.handle_request({"op": "nope"})
+    assert json.loads(server.handle_line(b"not json"))["error"].startswith("잘못된 JSON")
+
+def test_pipelined_connection_shares_cache():
+    """파이프라인 요청은 순서대로 응답하고, 연결 간 컴파일 캐시 공유"""
+    async def scenario():
+        server = CalculatorServer()
+        tcp = await server.start("127.0.0.1", 0)
+        port = tcp.sockets[0].getsockname()[1]
+        
+        responses = []
+        for _ in range(2):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"".join(
+                json.dumps({"id": i, "expression": f"sqrt(16) + {i % 3}"}).encode() + b"\n" for i in range(30)
+            ))
+            await writer.drain()
+            responses.append([json.loads(await reader.readline()) for _ in range(30)])
+            writer.write(b'{"op": "stats"}\n')
+            await writer.drain()
+            stats = json.loads(await reader.readline())["stats"]
+            writer.close()
+            await writer.wait_closed()
+        
+        tcp.close()
+        await tcp.wait_closed()
+        return responses, stats
+    
+    responses, stats = asyncio.run(scenario())
+    
+    for batch in responses:
+        assert [r["id"] for r in batch] == list(range(30))
+        assert [r["result"] for r in batch] == [4.0 + i % 3 for i in range(30)]
+    assert stats["requests"] == 62
+    assert stats["cache"]["misses"] == 3
+    assert stats["cache"]["hits"] == 57
+    assert stats["latency_ms"]["count"] == 61
+    assert stats["latency_ms"]["p50"] <= stats["latency_ms"]["p99"]
+
+def test_slow_request_does_not_block_other_connections():
+    """계산은 스레드 풀에서 - 느린 요청은 시간 초과로 응답하고 다른 연결은 바로 응답"""
+    import time
+    from src.smart_calculator.calculator import SmartCalculator
+    
+    calc = SmartCalculator(history_size=0)
+    calc.register_function("slow", lambda x: time.sleep(x) or x, pure=False)
+    
+    async def scenario():
+        server = CalculatorServer(calc, timeout=0.3)
+        tcp = await server.start("127.0.0.1", 0)
+        port = tcp.sockets[0].getsockname()[1]
+        
+        slow_reader, slow_writer = await asyncio.open_connection("127.0.0.1", port)
+        fast_reader, fast_writer = await asyncio.open_connection("127.0.0.1", port)
+        slow_writer.write(b'{"id": "slow", "expression": "slow(1)"}\n')
+        await slow_writer.drain()
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        fast_writer.write(b'{"id": "fast", "expression": "1 + 1"}\n')
+        await fast_writer.drain()
+        fast = json.loads(await fast_reader.readline())
+        fast_seconds = time.perf_counter() - started
+        slow = json.loads(await slow_reader.readline())
+        
+        for writer in (slow_writer, fast_writer):
+            writer.close()
+            await writer.wait_closed()
+        tcp.close()
+        await tcp.wait_closed()
+        server.executor.shutdown(wait=True)
+        return fast, fast_seconds, slow
+    
+    fast, fast_seconds, slow = asyncio.run(scenario())
+    
+    assert fast == {"id": "fast", "result": 2} and fast_seconds < 0.25
+    assert slow["id"] == "slow" and "시간 초과" in slow["error"]
+
+def test_int_vars_are_cost_checked():
+    """vars의 정수 값으로 계산 비용을 검사 (x**x**x, x=9는 실행 전에 거부)"""
+    server = CalculatorServer()
+    
+    response = server.handle_request({"expression": "x**x**x", "vars": {"x": 9}})
+    assert "비용 초과" in response["error"]
+    assert server.handle_request({"expression": "x**x**x", "vars": {"x": 2}}) == {"result": 16}
@@ -0,0 +1,65 @@
+"""
+범위 스윕 테스트
+"""
+import io
+
+import pytest
+
+from src.smart_calculator.calculator import SmartCalculator
+from src.smart_calculator.sweep import count_points, run_sweep, write_npy
+
+np = pytest.importorskip("numpy")
+
+def test_count_points():
+    """[start, stop) 점 개수"""
+    assert count_points(0, 1, 0.25) == 4
+    assert count_points(0, 10, 3) == 4
+    assert count_points(5, 0, 1) == 0
+    assert count_points(5, 0, -1) == 5
+    with pytest.raises(ValueError):
+        count_points(0, 1, 0)
+
+def test_sweep_csv_and_npy_match_scalar(tmp_path):
+    """작은 청크로 나눠도 CSV / npy 결과가 스칼라 평가와 일치"""
+    calc = SmartCalculator()
+    compiled = calc.compile("x**3 - 2*x + sin(x)", vars=("x",))
+    expected = [compiled.evaluate({"x": 0.5 * i - 3}) for i in range(17)]
+    
+    out = io.StringIO()
+    stats = run_sweep(compiled, "x", -3, 5.5, 0.5, chunk_size=4, stdout=out)
+    lines = out.getvalue().splitlines()
+    assert stats["points"] == 17
+    assert lines[0] == "x,value"
+    assert [float(line.split(",")[1]) for line in lines[1:]] == pytest.approx(expected)
+    
+    path = tmp_path / "sweep.npy"
+    stats = run_sweep(compiled, "x", -3, 5.5, 0.5, output=str(path), chunk_size=4)
+    table = np.load(path)
+    assert stats["points"] == 17
+    assert table.shape == (17, 2)
+    assert table[:, 0] == pytest.approx([0.5 * i - 3 for i in range(17)])
+    assert table[:, 1] == pytest.approx(expected)
+
+def test_sweep_constant_expression_broadcasts(tmp_path):
+    """변수를 쓰지 않는 수식도 점마다 한 줄씩"""
+    compiled = SmartCalculator().compile("2 + 3", vars=("x",))
+    path = tmp_path / "const.csv"
+    run_sweep(compiled, "x", 0, 3, 1, output=str(path))
+    assert path.read_text().splitlines()[1:] == ["0,5", "1,5", "2,5"]
+
+def test_sweep_npy_failure_leaves_no_file(tmp_path):
+    """청크 계산이 중간에 실패하면 잘린 .npy를 남기지 않고 기존 파일도 그대로"""
+    def chunks():
+        yield np.arange(3.0), np.arange(3.0)
+        raise RuntimeError("chunk failed")
+    
+    path = tmp_path / "sweep.npy"
+    with pytest.raises(RuntimeError):
+        write_npy(str(path), 6, chunks())
+    assert list(tmp_path.iterdir()) == []
+    
+    np.save(path, np.zeros((1, 2)))
+    with pytest.raises(RuntimeError):
+        write_npy(str(path), 6, chunks())
+    assert np.load(path).shape == (1, 2)
+    assert list(tmp_path.iterdir()) == [path]
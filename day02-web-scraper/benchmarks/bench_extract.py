@@ -0,0 +1,120 @@
+"""
+scrape_generic_content 필드 추출 벤치마크 (초당 행 수)
+
+요소가 수천 개인 목록 페이지에서 세 가지 추출 방식을 비교하고, 결과가 모두 같은지 확인한다.
+
+    select_one   이전 구현: 요소마다 필드별 select_one, 행마다 datetime.now()
+    plan         ExtractionPlan: 요소마다 하위 노드를 한 번만 훑음, 페이지당 타임스탬프 하나
+    xpath        lxml 트리 + 미리 컴파일한 XPath (BeautifulSoup 트리를 만들지 않음)
+
+추출만 잰 값(extract)과, 파싱까지 포함한 값(end-to-end)을 함께 출력한다.
+
+사용법:
+    uv run python benchmarks/bench_extract.py [--items 5000] [--rounds 3]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+
+from src.web_scraper.extract import ExtractionPlan, parse_document
+
+SELECTOR_SETS = {
+    # 모든 필드가 단순 선택자 (XPath 경로 사용 가능)
+    'simple': {'item': 'li.item', 'title': '.title', 'link': 'a[href]', 'image': 'img[src]',
+               'price': '.price', 'author': '.by'},
+    # 결합자가 들어간 필드 (해당 필드만 select_one, XPath 경로 없음)
+    'nested': {'item': 'li.item', 'title': 'h3 > a', 'link': 'a[href]', 'price': '.price', 'author': '.meta .by'},
+}
+
+def listing_page(items: int) -> bytes:
+    rows = []
+    for i in range(items):
+        rows.append(
+            f'<li class="item card" data-id="{i}"><div class="thumb"><img src="/img/{i}.jpg" alt=""></div>'
+            f'<h3 class="title"><a href="/p/{i}">Product {i} &amp; more</a></h3>'
+            f'<p class="desc">Description of product {i}. <b>Bold</b> text <!-- comment --> here.</p>'
+            f'<span class="price">{i * 3 % 1000}.99</span>'
+            f'<div class="meta"><span class="by">seller{i % 50}</span><time>{i % 60} min ago</time></div>'
+            f'{"<span class=\'badge\'>sale</span>" if i % 7 == 0 else ""}</li>')
+    return ('<!DOCTYPE html><html><head><meta charset="utf-8"><title>Listing</title>'
+            '<script>var x = "<li class=item>";</script></head><body><ul class="listing">'
+            + ''.join(rows) + '</ul></body></html>').encode('utf-8')
+
+def legacy_rows(soup: BeautifulSoup, selectors: Dict[str, str]) -> List[Dict[str, Any]]:
+    """이전 scrape_generic_content의 추출 부분"""
+    results = []
+    first_selector = list(selectors.keys())[0]
+    for element in soup.select(selectors[first_selector]):
+        data = {'scraped_at': datetime.now().isoformat()}
+        for field, selector in selectors.items():
+            if field == first_selector:
+                data[field] = element.get_text(strip=True)
+            else:
+                sub_element = element.select_one(selector)
+                if sub_element:
+                    if selector.endswith('[href]') or selector.endswith('[src]'):
+                        data[field] = sub_element.get('href') or sub_element.get('src')
+                    else:
+                        data[field] = sub_element.get_text(strip=True)
+                else:
+                    data[field] = None
+        results.append(data)
+    return results
+
+def best_time(operation: Callable[[], Any], rounds: int) -> float:
+    best = float('inf')
+    for _ in range(max(1, rounds)):
+        started = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def strip_time(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{key: value for key, value in row.items() if key != 'scraped_at'} for row in rows]
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare field extraction strategies for scrape_generic_content")
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--parser", default='lxml')
+    parser.add_argument("--rounds", type=int, default=3)
+    options = parser.parse_args()
+
+    content = listing_page(options.items)
+    print(f"{options.items} items, {len(content) / 1e6:.1f} MB, BeautifulSoup parser {options.parser}")
+    soup = BeautifulSoup(content, options.parser)
+    document = parse_document(content)
+    parse_soup = best_time(lambda: BeautifulSoup(content, options.parser), options.rounds)
+    parse_lxml = best_time(lambda: parse_document(content), options.rounds)
+
+    for name, selectors in SELECTOR_SETS.items():
+        plan = ExtractionPlan(selectors)
+        stamp = datetime.now().isoformat()
+        expected = strip_time(legacy_rows(soup, selectors))
+        assert strip_time(plan.rows(soup, stamp)) == expected, "plan differs from select_one"
+        if plan.xpath_ready:
+            assert strip_time(plan.xpath_rows(document, stamp)) == expected, "xpath differs from select_one"
+
+        timings = {
+            'select_one': (best_time(lambda: legacy_rows(soup, selectors), options.rounds), parse_soup),
+            'plan': (best_time(lambda: plan.rows(soup, stamp), options.rounds), parse_soup),
+        }
+        if plan.xpath_ready:
+            timings['xpath'] = (best_time(lambda: plan.xpath_rows(document, stamp), options.rounds), parse_lxml)
+
+        rows = len(expected)
+        print(f"\n[{name}] {rows} rows, fields: {', '.join(selectors.values())}")
+        print(f"{'method':<11} {'extract rows/s':>15} {'end-to-end rows/s':>18} {'speedup':>8}")
+        baseline = sum(timings['select_one'])
+        for method, (extract, parse) in timings.items():
+            print(f"{method:<11} {rows / extract:15,.0f} {rows / (extract + parse):18,.0f} "
+                  f"{baseline / (extract + parse):7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+BeautifulSoup 파서 백엔드 벤치마크 (초당 페이지 수 / 최대 메모리)
+
+저장된 뉴스 첫 페이지(없으면 합성 페이지)를 파서별로 파싱해서 처리량과, 페이지 하나를
+파싱하는 동안의 최대 메모리(tracemalloc - 파이썬 객체 할당만, lxml 내부 버퍼는 제외)를 잰다.
+파서마다 사이트 선택자로 찾은 헤드라인 수도 함께 출력해 결과가 같은지 확인한다.
+
+사용법:
+    uv run python benchmarks/bench_parsers.py                   # 파서별 결과 출력
+    uv run python benchmarks/bench_parsers.py --save            # 현재 첫 페이지를 benchmarks/pages/에 저장
+    uv run python benchmarks/bench_parsers.py --pages DIR --rounds 5
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+from frontpages import PAGES_DIR, load_pages, save_pages
+from src.web_scraper.scraper import PARSERS
+
+def measure(parser: str, pages: List[Tuple[Dict[str, str], bytes]], rounds: int) -> Dict[str, Any]:
+    """가장 빠른 라운드의 처리량, 페이지별 최대 메모리 중 가장 큰 값, 사이트별 헤드라인 수"""
+    BeautifulSoup(pages[0][1], parser)  # 워밍업
+    best = float('inf')
+    for _ in range(max(1, rounds)):
+        started = time.perf_counter()
+        for _, content in pages:
+            BeautifulSoup(content, parser)
+        best = min(best, time.perf_counter() - started)
+
+    peak = 0
+    counts = []
+    for site, content in pages:
+        tracemalloc.start()
+        soup = BeautifulSoup(content, parser)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        counts.append(len(soup.select(site['selector'])))
+        del soup
+    size = sum(len(content) for _, content in pages)
+    return {
+        'pages_per_sec': len(pages) / best,
+        'mb_per_sec': size / best / 1e6,
+        'peak_mb': peak / 1e6,
+        'headlines': counts,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare BeautifulSoup parser backends on saved front pages")
+    parser.add_argument("--pages", default=PAGES_DIR, help="directory of saved <site>.html front pages")
+    parser.add_argument("--save", action="store_true", help="download the current front pages into --pages first")
+    parser.add_argument("--rounds", type=int, default=3)
+    options = parser.parse_args()
+
+    if options.save:
+        print(f"Saving front pages to {options.pages}")
+        save_pages(options.pages)
+    pages, real = load_pages(options.pages)
+    size = sum(len(content) for _, content in pages)
+    print(f"{len(pages)} {'saved' if real else 'synthetic'} pages, {size / 1e6:.1f} MB total\n")
+
+    print(f"{'parser':<12} {'pages/s':>8} {'MB/s':>7} {'peak MB':>8}  headlines per site")
+    results = {}
+    for name in PARSERS:
+        if builder_registry.lookup(name) is None:
+            print(f"{name:<12} (not installed)")
+            continue
+        result = results[name] = measure(name, pages, options.rounds)
+        print(f"{name:<12} {result['pages_per_sec']:8.1f} {result['mb_per_sec']:7.1f} {result['peak_mb']:8.1f}  "
+              f"{result['headlines']}")
+
+    if 'lxml' in results and 'html.parser' in results:
+        print(f"\nlxml speedup over html.parser: "
+              f"{results['lxml']['pages_per_sec'] / results['html.parser']['pages_per_sec']:.2f}x")
+
+if __name__ == "__main__":
+    main()
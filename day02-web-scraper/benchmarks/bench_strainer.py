@@ -0,0 +1,81 @@
+"""
+헤드라인 추출 벤치마크: 전체 파싱 vs 선택자 기반 부분 파싱
+
+저장된 뉴스 첫 페이지(없으면 합성 페이지)에서 사이트 선택자로 헤드라인 HEADLINE_LIMIT개를
+찾는 시간을 세 가지 방식으로 잰다. 세 방식의 헤드라인이 모두 같은지도 확인한다.
+
+    full        BeautifulSoup(content) 전체 파싱 후 select
+    strained    선택자에 맞을 수 있는 하위 트리만 파싱 (문서 끝까지)
+    limited     strained + HEADLINE_LIMIT개를 찾으면 파싱 중단 (스크래퍼 기본값)
+
+사용법:
+    uv run python benchmarks/bench_strainer.py [--pages DIR] [--parser lxml] [--rounds 5]
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+
+from frontpages import PAGES_DIR, load_pages
+from src.web_scraper.scraper import FALLBACK_PARSER, HEADLINE_LIMIT, resolve_parser
+from src.web_scraper.strainer import partial_soup, selector_strainer
+
+def headlines(soup: BeautifulSoup, selector: str) -> List[str]:
+    return [str(tag) for tag in soup.select(selector)[:HEADLINE_LIMIT]]
+
+def methods(parser: str) -> Dict[str, Callable[[bytes, str], List[str]]]:
+    return {
+        'full': lambda content, selector: headlines(BeautifulSoup(content, parser), selector),
+        'strained': lambda content, selector: headlines(partial_soup(content, parser, selector), selector),
+        'limited': lambda content, selector: headlines(
+            partial_soup(content, parser, selector, HEADLINE_LIMIT), selector),
+    }
+
+def time_method(method: Callable[[bytes, str], List[str]], pages: List[Tuple[Dict[str, str], bytes]],
+                rounds: int) -> List[float]:
+    """사이트별 가장 빠른 라운드의 시간 (초)"""
+    best = [float('inf')] * len(pages)
+    for _ in range(max(1, rounds)):
+        for i, (site, content) in enumerate(pages):
+            started = time.perf_counter()
+            method(content, site['selector'])
+            best[i] = min(best[i], time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full and selector-driven partial parsing for headlines")
+    parser.add_argument("--pages", default=PAGES_DIR, help="directory of saved <site>.html front pages")
+    parser.add_argument("--parser", nargs="+", default=['lxml', FALLBACK_PARSER])
+    parser.add_argument("--rounds", type=int, default=3)
+    options = parser.parse_args()
+
+    pages, real = load_pages(options.pages)
+    print(f"{len(pages)} {'saved' if real else 'synthetic'} pages, "
+          f"{sum(len(content) for _, content in pages) / 1e6:.1f} MB total, limit {HEADLINE_LIMIT}")
+
+    for name in dict.fromkeys(resolve_parser(name) for name in options.parser):
+        candidates = methods(name)
+        for site, content in pages:
+            expected = candidates['full'](content, site['selector'])
+            for method, run in candidates.items():
+                assert run(content, site['selector']) == expected, f"{method} differs on {site['name']}"
+
+        timings = {method: time_method(run, pages, options.rounds) for method, run in candidates.items()}
+        print(f"\n[{name}]")
+        print(f"{'site':<14} {'full (ms)':>10} {'strained':>9} {'limited':>8} {'speedup':>8}  selector")
+        for i, (site, _) in enumerate(pages):
+            full, strained, limited = (timings[method][i] * 1000 for method in ('full', 'strained', 'limited'))
+            note = '' if selector_strainer(site['selector']) else '  (not strainable, full parse)'
+            print(f"{site['name']:<14} {full:10.1f} {strained:9.1f} {limited:8.1f} {full / limited:7.1f}x  "
+                  f"{site['selector']}{note}")
+        total = {method: sum(values) for method, values in timings.items()}
+        print(f"{'total':<14} {total['full'] * 1000:10.1f} {total['strained'] * 1000:9.1f} "
+              f"{total['limited'] * 1000:8.1f} {total['full'] / total['limited']:7.1f}x")
+
+if __name__ == "__main__":
+    main()
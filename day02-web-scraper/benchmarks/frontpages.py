@@ -0,0 +1,90 @@
+"""
+벤치마크용 뉴스 사이트 첫 페이지
+
+benchmarks/pages/에 저장해 둔 실제 첫 페이지(<사이트>.html)를 읽는다. 저장된 페이지가 없으면
+네트워크 없이도 돌 수 있도록, 사이트 선택자에 맞는 헤드라인 카드와 내비게이션 / 스크립트 /
+광고 블록이 섞인 비슷한 크기의 합성 페이지를 만든다.
+
+    uv run python benchmarks/bench_parsers.py --save     # 현재 첫 페이지를 pages/에 저장
+"""
+import os
+import re
+import sys
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.web_scraper.news_sites import NEWS_SITES, TECH_NEWS_SITES
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), 'pages')
+
+# (이름, URL, 선택자) - 중복 사이트 제외
+SITES = list({site['name']: site for site in NEWS_SITES + TECH_NEWS_SITES}.values())
+
+# 사이트 선택자에 맞는 헤드라인 마크업 ({title}, {href})
+_HEADLINES = {
+    'Hacker News': '<tr class="athing"><td class="title"><span class="titleline"><a href="{href}">{title}</a></span></td></tr>',
+    'BBC News': '<div data-testid="card-headline"><h3>{title}</h3></div><a href="{href}">more</a>',
+    'Reuters': '<div data-testid="Heading"><a href="{href}">{title}</a></div>',
+    'CNN': '<span class="container__headline"><a href="{href}">{title}</a></span>',
+    'TechCrunch': '<h2 class="post-block__title"><a class="post-block__title__link" href="{href}">{title}</a></h2>',
+    'The Verge': '<h2 class="duet--title"><a href="{href}">{title}</a></h2>',
+}
+
+def filename(site: Dict[str, str]) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', site['name'].lower()).strip('_') + '.html'
+
+def synthetic_page(site: Dict[str, str], cards: int = 400) -> bytes:
+    """헤드라인 cards개와 그보다 훨씬 많은 주변 마크업이 있는 첫 페이지 (약 0.5~1MB)"""
+    headline = _HEADLINES.get(site['name'], '<h2><a href="{href}">{title}</a></h2>')
+    parts = ['<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">',
+             f'<title>{site["name"]}</title>',
+             '<style>' + ''.join(f'.c{i}{{margin:{i % 7}px;color:#{i:06x}}}' for i in range(300)) + '</style>',
+             '<script>window.__STATE__=' + '{"k":"' + 'x' * 20000 + '"}' + ';</script></head><body>',
+             '<nav class="site-nav"><ul>']
+    parts += [f'<li class="nav-item"><a href="/section/{i}">Section {i}</a></li>' for i in range(60)]
+    parts.append('</ul></nav><main>')
+    for i in range(cards):
+        parts.append(f'<article class="card c{i % 300}" data-id="{i}"><div class="card__media">'
+                     f'<img src="/img/{i}.jpg" alt="image {i}" loading="lazy"></div>'
+                     f'<div class="card__body">')
+        parts.append(headline.format(title=f'Headline number {i} about topic {i % 17}', href=f'/story/{i}'))
+        parts.append(f'<p class="card__summary">Summary for story {i}. ' + 'Lorem ipsum dolor sit amet. ' * 4 +
+                     '</p><ul class="tags">' + ''.join(f'<li><a href="/tag/{t}">tag{t}</a></li>' for t in range(4)) +
+                     f'</ul><time datetime="2025-01-01T00:{i % 60:02d}:00Z">{i} minutes ago</time></div></article>')
+        if i % 25 == 24:
+            parts.append('<div class="ad-slot"><iframe src="about:blank"></iframe><script>void 0;</script></div>')
+    parts.append('</main><footer>' + ''.join(f'<a href="/f/{i}">Footer {i}</a>' for i in range(80)) + '</footer></body></html>')
+    return ''.join(parts).encode('utf-8')
+
+def load_pages(directory: str = PAGES_DIR) -> Tuple[List[Tuple[Dict[str, str], bytes]], bool]:
+    """
+    [(사이트, 페이지 본문)]과 저장된 실제 페이지인지 여부
+
+    directory에 저장된 페이지가 하나도 없으면 모든 사이트의 합성 페이지를 돌려준다.
+    """
+    saved = []
+    for site in SITES:
+        path = os.path.join(directory, filename(site))
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                saved.append((site, f.read()))
+    if saved:
+        return saved, True
+    return [(site, synthetic_page(site)) for site in SITES], False
+
+def save_pages(directory: str = PAGES_DIR):
+    """각 사이트의 현재 첫 페이지를 directory에 저장"""
+    from src.web_scraper.scraper import WebScraper
+    os.makedirs(directory, exist_ok=True)
+    scraper = WebScraper(delay=0)
+    for site in SITES:
+        try:
+            response = scraper.session.get(site['url'], timeout=scraper.timeout)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"  skip {site['name']}: {e}")
+            continue
+        with open(os.path.join(directory, filename(site)), 'wb') as f:
+            f.write(response.content)
+        print(f"  saved {site['name']} ({len(response.content) / 1024:.0f} KB)")
@@ -0,0 +1,194 @@
+"""
+컴파일된 CSS 선택자 레지스트리
+
+사이트 설정과 scrape_generic_content의 필드 선택자를 처음 등록할 때 한 번만 soupsieve로
+컴파일해 두고, 페이지마다(필드 선택자는 요소마다) 컴파일된 선택자를 그대로 쓴다.
+tag.select(문자열)은 호출할 때마다 선택자 캐시를 찾고 네임스페이스를 다시 구성한다.
+등록할 때 문법을 검사하므로 잘못된 선택자는 설정을 읽을 때(첫 요청 전에) 드러난다.
+
+태그 이름 / .class / #id / [attr] / [attr=value]로 된 단순 선택자를 자손( ) / 자식(>) 결합자로
+이은 선택자는 (결합자, Compound) 목록으로도 풀어 둔다. 부분 파싱과 필드 추출은 이 목록으로
+soupsieve를 거치지 않고 태그를 바로 검사한다.
+"""
+import re
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import soupsieve
+
+# 단순 선택자: 태그 이름, .class, #id, [attr], [attr=value]
+_COMPOUND_RE = re.compile(
+    r'''(?P<tag>[a-zA-Z][\w-]*)?(?P<rest>(?:\.[\w-]+|\#[\w-]+|\[\s*[\w-]+\s*(?:=\s*(?:"[^"]*"|'[^']*'|[\w-]+)\s*)?\])*)''')
+_PART_RE = re.compile(r'''\.(?P<cls>[\w-]+)|\#(?P<id>[\w-]+)|\[\s*(?P<attr>[\w-]+)\s*(?:=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[\w-]+))\s*)?\]''')
+
+class Compound:
+    """단순 선택자 하나 (태그 이름, 클래스, 속성 조건)"""
+    __slots__ = ('name', 'classes', 'attrs')
+
+    def __init__(self, name: Optional[str], classes: FrozenSet[str], attrs: Tuple[Tuple[str, Optional[str]], ...]):
+        self.name = name
+        self.classes = classes
+        self.attrs = attrs
+
+    def matches(self, name: str, attrs: Dict[str, Any]) -> bool:
+        """태그 이름과 속성(파싱 중의 원시 문자열이든 bs4의 리스트 값이든)이 맞는지"""
+        if self.name is not None and name != self.name:
+            return False
+        if self.classes:
+            value = attrs.get('class') or ''
+            classes = value.split() if isinstance(value, str) else value
+            if not self.classes.issubset(classes):
+                return False
+        for attr, expected in self.attrs:
+            value = attrs.get(attr)
+            if value is None:
+                return False
+            if expected is not None and (value if isinstance(value, str) else ' '.join(value)) != expected:
+                return False
+        return True
+
+def split_selector(text: str, separators: str) -> List[str]:
+    """괄호 / 따옴표 밖의 separators 문자로 나누기"""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, char in enumerate(text):
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '"\'':
+            quote = char
+        elif char in '[(':
+            depth += 1
+        elif char in '])':
+            depth -= 1
+        elif depth == 0 and char in separators:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+def parse_compound(text: str) -> Optional[Compound]:
+    """단순 선택자 파싱 ('*', 의사 클래스, =가 아닌 속성 연산자 등은 None)"""
+    match = _COMPOUND_RE.fullmatch(text)
+    if match is None or not text:
+        return None
+    classes, attrs = set(), []
+    for item in _PART_RE.finditer(match.group('rest')):
+        if item.group('cls'):
+            classes.add(item.group('cls'))
+        elif item.group('id'):
+            attrs.append(('id', item.group('id')))
+        else:
+            attr = item.group('attr').lower()
+            value = next((v for v in (item.group('dq'), item.group('sq'), item.group('bare')) if v is not None), None)
+            if attr == 'type' and value is not None:
+                return None  # HTML의 type 값은 대소문자를 구분하지 않음 - soupsieve에 맡김
+            attrs.append((attr, value))
+    name = match.group('tag')
+    return Compound(name.lower() if name else None, frozenset(classes), tuple(attrs))
+
+Chain = List[Tuple[str, Compound]]
+
+def parse_chain(part: str) -> Optional[Chain]:
+    """
+    쉼표 없는 선택자 한 부분 -> [(결합자, Compound)] (첫 결합자는 '')
+
+    자손(' ') / 자식('>') 결합자와 단순 선택자만 있는 경우만, 나머지(+, ~, 의사 클래스 등)는 None.
+    """
+    part = part.strip()
+    if not part or len(split_selector(part, '+~:')) > 1:
+        return None
+    chain: Chain = []
+    combinator = ''
+    for token in split_selector(re.sub(r'\s*>\s*', ' > ', part), ' '):
+        if not token:
+            continue
+        if token == '>':
+            if combinator == '>' or not chain:
+                return None
+            combinator = '>'
+            continue
+        compound = parse_compound(token)
+        if compound is None:
+            return None
+        chain.append((combinator if chain else '', compound))
+        combinator = ' '
+    if not chain or combinator == '>':
+        return None
+    return chain
+
+class CompiledSelector:
+    """
+    컴파일된 선택자 하나 (soupsieve.SoupSieve 래퍼)
+
+    chains: 쉼표로 나뉜 각 부분의 (결합자, Compound) 목록 (풀 수 없는 부분이 있으면 None)
+    """
+    __slots__ = ('pattern', 'matcher', 'chains')
+
+    def __init__(self, pattern: str, matcher: Any):
+        self.pattern = pattern
+        self.matcher = matcher
+        chains = [parse_chain(part) for part in split_selector(pattern, ',')]
+        self.chains: Optional[List[Chain]] = None if None in chains else chains
+
+    @property
+    def compounds(self) -> Optional[List[Compound]]:
+        """모든 부분이 단순 선택자 하나뿐이면 그 목록 (태그 하나만 보고 판단 가능), 아니면 None"""
+        if self.chains is None or any(len(chain) > 1 for chain in self.chains):
+            return None
+        return [chain[0][1] for chain in self.chains]
+
+    def select(self, tag: Any, limit: int = 0) -> List[Any]:
+        """tag의 하위 요소 중 맞는 것들 (문서 순서, limit=0이면 전부)"""
+        return self.matcher.select(tag, limit)
+
+    def select_one(self, tag: Any) -> Optional[Any]:
+        return self.matcher.select_one(tag)
+
+    def match(self, tag: Any) -> bool:
+        """tag 자신이 맞는지"""
+        return self.matcher.match(tag)
+
+    def __repr__(self) -> str:
+        return f"CompiledSelector({self.pattern!r})"
+
+class SelectorRegistry:
+    """선택자 문자열 -> 컴파일된 선택자 (스레드 안전, 한 번 컴파일한 선택자는 계속 재사용)"""
+
+    def __init__(self):
+        self._compiled: Dict[str, CompiledSelector] = {}
+        self._lock = threading.Lock()
+
+    def compile(self, pattern: str) -> CompiledSelector:
+        """
+        선택자 컴파일 (이미 컴파일했으면 그대로 반환)
+
+        Raises:
+            ValueError: 문자열이 아니거나 문법이 잘못된 선택자
+        """
+        compiled = self._compiled.get(pattern) if isinstance(pattern, str) else None
+        if compiled is not None:
+            return compiled
+        if not isinstance(pattern, str) or not pattern.strip():
+            raise ValueError(f"CSS 선택자는 비어 있지 않은 문자열이어야 합니다: {pattern!r}")
+        try:
+            matcher = soupsieve.compile(pattern)
+        except soupsieve.SelectorSyntaxError as e:
+            raise ValueError(f"잘못된 CSS 선택자: {pattern!r} - {str(e).splitlines()[0]}")
+        with self._lock:
+            return self._compiled.setdefault(pattern, CompiledSelector(pattern, matcher))
+
+    def compile_sites(self, sites: Iterable[Dict[str, Any]]):
+        """사이트 설정들의 'selector'를 모두 컴파일 (잘못된 선택자가 있으면 사이트 이름과 함께 ValueError)"""
+        for site in sites:
+            try:
+                self.compile(site.get('selector'))
+            except ValueError as e:
+                raise ValueError(f"{site.get('name', site.get('url'))}: {e}")
+
+    def __contains__(self, pattern: str) -> bool:
+        return pattern in self._compiled
+
+    def __len__(self) -> int:
+        return len(self._compiled)
+
+# 기본 레지스트리 (news_sites의 설정 선택자는 모듈을 읽을 때 여기에 컴파일됨)
+SELECTORS = SelectorRegistry()
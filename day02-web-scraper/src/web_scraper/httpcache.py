@@ -0,0 +1,249 @@
+"""
+HTTP 조건부 요청 캐시 (디스크)
+
+URL마다 응답 본문과 검증자(ETag / Last-Modified)를 저장해 두고, 다음 요청에
+If-None-Match / If-Modified-Since를 붙인다. 서버가 304 Not Modified로 답하면 본문을
+다시 받지 않고, 최근에 파싱한 결과가 메모리에 있으면 다시 파싱하지도 않는다.
+
+    <directory>/<sha1(url)>.body   응답 본문
+    <directory>/<sha1(url)>.json   URL, 검증자, 크기, 마지막 사용 시각
+
+본문 크기의 합이 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 지운다. 파싱 결과는
+(URL, 검증자, 파싱 방식)을 키로 최근 max_parsed개만 메모리에 두며, 같은 객체를 모든 호출자가
+공유하므로 수정하면 안 된다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# 기본 최대 캐시 크기 (본문 합계)
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+# 메모리에 둘 파싱 결과 수 (트리 하나가 본문의 수 배 크기이므로 작게)
+DEFAULT_MAX_PARSED = 16
+
+# (URL, ETag, Last-Modified, 파싱 방식)
+ParsedKey = Tuple[str, Optional[str], Optional[str], str]
+
+class CacheEntry:
+    """캐시된 응답 하나"""
+    __slots__ = ('url', 'key', 'etag', 'last_modified', 'size', 'accessed')
+
+    def __init__(self, url: str, key: str, etag: Optional[str], last_modified: Optional[str],
+                 size: int, accessed: float):
+        self.url = url
+        self.key = key
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size = size
+        self.accessed = accessed
+
+    def validators(self) -> Dict[str, str]:
+        """조건부 요청 헤더"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_json(self) -> Dict[str, Any]:
+        return {'url': self.url, 'etag': self.etag, 'last_modified': self.last_modified,
+                'size': self.size, 'accessed': self.accessed}
+
+    def parsed_key(self, parse_key: str) -> ParsedKey:
+        return self.url, self.etag, self.last_modified, parse_key
+
+class HttpCache:
+    """
+    URL -> 응답 본문 디스크 캐시 (스레드 안전)
+
+    Args:
+        directory: 캐시 디렉터리 (없으면 생성, 기존 항목은 다시 읽어 들임)
+        max_bytes: 본문 크기 합계 상한 (넘으면 LRU 순서로 삭제)
+        max_parsed: 메모리에 둘 파싱 결과 수 (LRU, 0이면 304 응답마다 저장된 본문을 다시 파싱)
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES, max_parsed: int = DEFAULT_MAX_PARSED):
+        if max_bytes < 1:
+            raise ValueError("max_bytes는 1 이상이어야 합니다")
+        if max_parsed < 0:
+            raise ValueError("max_parsed는 0 이상이어야 합니다")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_parsed = max_parsed
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._parsed: 'OrderedDict[ParsedKey, Any]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key + suffix)
+
+    def _load(self):
+        """디렉터리의 메타데이터를 읽어 LRU 순서로 색인 (본문이 없거나 깨진 항목은 무시)"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            key = name[:-5]
+            try:
+                with open(self._path(key, '.json'), encoding='utf-8') as f:
+                    meta = json.load(f)
+                size = os.path.getsize(self._path(key, '.body'))
+            except (OSError, ValueError):
+                continue
+            entries.append(CacheEntry(meta['url'], key, meta.get('etag'), meta.get('last_modified'),
+                                      size, meta.get('accessed', 0.0)))
+        for entry in sorted(entries, key=lambda entry: entry.accessed):
+            self._entries[entry.url] = entry
+            self._bytes += entry.size
+        self._evict()
+
+    def _write(self, path: str, data: bytes):
+        """임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않도록)"""
+        temp = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp, 'wb') as f:
+            f.write(data)
+        os.replace(temp, path)
+
+    def _write_meta(self, entry: CacheEntry):
+        self._write(self._path(entry.key, '.json'), json.dumps(entry.to_json()).encode('utf-8'))
+
+    def _remove(self, entry: CacheEntry):
+        self._forget_parsed(entry.url)
+        for suffix in ('.body', '.json'):
+            try:
+                os.remove(self._path(entry.key, suffix))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._remove(entry)
+            self.evictions += 1
+
+    def _forget_parsed(self, url: str):
+        for key in [key for key in self._parsed if key[0] == url]:
+            del self._parsed[key]
+
+    # ------------------------------------------------------------------ 파싱 결과
+    def parsed(self, entry: CacheEntry, parse_key: str) -> Optional[Any]:
+        """entry 본문을 parse_key 방식으로 파싱한 결과 (메모리에 없으면 None, 공유 객체이므로 수정 금지)"""
+        key = entry.parsed_key(parse_key)
+        with self._lock:
+            page = self._parsed.get(key)
+            if page is not None:
+                self._parsed.move_to_end(key)
+            return page
+
+    def keep_parsed(self, entry: CacheEntry, parse_key: str, page: Any):
+        """파싱 결과를 메모리에 보관 (max_parsed개를 넘으면 가장 오래 쓰지 않은 것부터 버림)"""
+        if self.max_parsed == 0:
+            return
+        with self._lock:
+            if self._entries.get(entry.url) is not entry:
+                return  # 그 사이 새 버전이 저장되었거나 삭제됨
+            key = entry.parsed_key(parse_key)
+            self._parsed[key] = page
+            self._parsed.move_to_end(key)
+            while len(self._parsed) > self.max_parsed:
+                self._parsed.popitem(last=False)
+
+    # ------------------------------------------------------------------ 조회 / 저장
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """url의 캐시 항목 (없으면 None)"""
+        with self._lock:
+            return self._entries.get(url)
+
+    def hit(self, entry: CacheEntry):
+        """304 응답 - 항목을 최근 사용으로 표시"""
+        with self._lock:
+            self.hits += 1
+            entry.accessed = time.time()
+            if self._entries.get(entry.url) is entry:
+                self._entries.move_to_end(entry.url)
+                self._write_meta(entry)
+
+    def read(self, entry: CacheEntry) -> Optional[bytes]:
+        """저장된 본문 (그 사이 삭제되었으면 None)"""
+        try:
+            with open(self._path(entry.key, '.body'), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def miss(self):
+        """본문 전체를 다시 받은 요청"""
+        with self._lock:
+            self.misses += 1
+
+    def store(self, url: str, content: bytes, etag: Optional[str], last_modified: Optional[str],
+              parsed: Optional[Dict[str, Any]] = None) -> Optional[CacheEntry]:
+        """
+        응답 저장 (검증자가 없으면 조건부 요청을 할 수 없으므로 저장하지 않음)
+
+        parsed: 이 본문을 이미 파싱한 결과 {파싱 방식: 결과} (keep_parsed로 보관)
+
+        Returns:
+            저장된 항목 (저장하지 않았으면 None)
+        """
+        if not etag and not last_modified:
+            return None
+        if len(content) > self.max_bytes:
+            return None
+        entry = CacheEntry(url, self.key(url), etag, last_modified, len(content), time.time())
+        with self._lock:
+            self._write(self._path(entry.key, '.body'), content)
+            self._write_meta(entry)
+            previous = self._entries.pop(url, None)
+            if previous is not None:
+                self._bytes -= previous.size
+                self._forget_parsed(url)
+            self._entries[url] = entry
+            self._bytes += entry.size
+            self._evict()
+        for parse_key, page in (parsed or {}).items():
+            self.keep_parsed(entry, parse_key, page)
+        return entry
+
+    def clear(self):
+        """모든 항목 삭제 (통계는 유지)"""
+        with self._lock:
+            for entry in self._entries.values():
+                self._remove(entry)
+            self._entries.clear()
+            self._parsed.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """항목 수, 크기, 적중 / 실패 / 삭제 횟수"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'parsed': len(self._parsed),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / requests if requests else 0.0,
+            }
@@ -2,9 +2,13 @@
 웹 스크래퍼 CLI 메인 진입점
 """
 import sys
+from .httpcache import HttpCache
 from .scraper import WebScraper, ScraperError
 from .news_sites import NEWS_SITES, TECH_NEWS_SITES
 
+# 변경되지 않은 페이지는 다시 받지 않도록 실행 간에 공유하는 HTTP 캐시
+HTTP_CACHE_DIR = ".http_cache"
+
 def print_help():
     """도움말 출력"""
     print("Web Scraper CLI")
@@ -17,7 +21,7 @@ def print_help():
 def scrape_news():
     """뉴스 스크래핑"""
     try:
-        scraper = WebScraper(delay=2.0)  # 2초 지연
+        scraper = WebScraper(delay=2.0, cache=HttpCache(HTTP_CACHE_DIR))  # 2초 지연
         print("🔍 Scraping major news sites...")
         
         headlines = scraper.scrape_news_headlines(NEWS_SITES)
@@ -47,7 +51,7 @@ def scrape_news():
 def scrape_tech():
     """기술 뉴스 스크래핑"""
     try:
-        scraper = WebScraper(delay=2.0)
+        scraper = WebScraper(delay=2.0, cache=HttpCache(HTTP_CACHE_DIR))
         print("🔍 Scraping tech news sites...")
         
         headlines = scraper.scrape_news_headlines(TECH_NEWS_SITES)
@@ -69,9 +73,9 @@ def scrape_tech():
 def interactive_mode():
     """대화형 모드"""
     print("🤖 Web Scraper Interactive Mode")
-    print("Commands: news, tech, summary, clear, quit")
+    print("Commands: news, tech, summary, cache, clear, quit")
     
-    scraper = WebScraper(delay=1.0)
+    scraper = WebScraper(delay=1.0, cache=HttpCache(HTTP_CACHE_DIR))
     
     while True:
         try:
@@ -85,6 +89,7 @@ def interactive_mode():
                 print("  news    - Scrape news headlines")
                 print("  tech    - Scrape tech news")
                 print("  summary - Show data summary")
+                print("  cache   - Show HTTP cache statistics")
                 print("  clear   - Clear collected data")
                 print("  quit    - Exit")
             elif command == "news":
@@ -98,6 +103,11 @@ def interactive_mode():
                 print(f"Total items: {summary['total_items']}")
                 for source, count in summary['sources'].items():
                     print(f"  {source}: {count}")
+            elif command == "cache":
+                stats = scraper.cache.stats()
+                print(f"Entries: {stats['entries']} ({stats['bytes'] / 1024:.1f} KB / {stats['max_bytes'] / 1024:.0f} KB)")
+                print(f"Hits: {stats['hits']}, misses: {stats['misses']}, "
+                      f"hit rate: {stats['hit_rate']:.0%}, evictions: {stats['evictions']}")
             elif command == "clear":
                 scraper.clear_data()
                 print("Data cleared")
@@ -1,27 +1,35 @@
 """
 뉴스 사이트 설정
+
+'delay'는 같은 호스트에 대한 최소 요청 간격(초)이다. 호스트마다 따로 제한하므로
+서로 다른 사이트는 동시에 요청하고, 같은 호스트의 여러 페이지만 이 간격을 지킨다.
 """
+from .css import SELECTORS
 
 # 주요 뉴스 사이트 설정 (안전하고 공개적인 사이트들)
 NEWS_SITES = [
     {
         'name': 'Hacker News',
         'url': 'https://news.ycombinator.com/',
+        'delay': 2.0,
         'selector': '.storylink, .titleline > a'
     },
     {
         'name': 'BBC News',
         'url': 'https://www.bbc.com/news',
+        'delay': 1.0,
         'selector': '[data-testid="card-headline"] h3, .gs-c-promo-heading__title'
     },
     {
         'name': 'Reuters',
         'url': 'https://www.reuters.com/',
+        'delay': 2.0,
         'selector': '[data-testid="Heading"] a, .story-title a'
     },
     {
         'name': 'CNN',
         'url': 'https://www.cnn.com/',
+        'delay': 1.0,
         'selector': '.container__headline a, h3.cd__headline a'
     }
 ]
@@ -31,16 +39,19 @@ TECH_NEWS_SITES = [
     {
         'name': 'Hacker News',
         'url': 'https://news.ycombinator.com/',
+        'delay': 2.0,
         'selector': '.storylink, .titleline > a'
     },
     {
         'name': 'TechCrunch',
         'url': 'https://techcrunch.com/',
+        'delay': 1.0,
         'selector': '.post-block__title__link'
     },
     {
         'name': 'The Verge',
         'url': 'https://www.theverge.com/',
+        'delay': 1.0,
         'selector': 'h2 a, h3 a'
     }
 ]
@@ -50,6 +61,11 @@ DEMO_SITES = [
     {
         'name': 'Example News',
         'url': 'https://example.com',
+        'delay': 0.5,
         'selector': 'h1, h2, h3'
     }
-]
\ No newline at end of file
+]
+
+# 설정을 읽을 때 선택자를 미리 컴파일 (잘못된 선택자는 여기서 바로 오류)
+for _sites in (NEWS_SITES, TECH_NEWS_SITES, DEMO_SITES):
+    SELECTORS.compile_sites(_sites)
@@ -0,0 +1,82 @@
+"""
+호스트별 요청 속도 제한 (토큰 버킷)
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+class TokenBucket:
+    """
+    요청 하나에 토큰 하나를 쓰는 버킷
+
+    interval초마다 토큰이 하나씩 차고 최대 burst개까지 모인다. 토큰이 없으면 다음 토큰이
+    찰 때까지 기다려야 하는 시간을 돌려주고 그 토큰을 미리 예약한다 (잠금을 쥔 채 자지 않도록).
+    """
+    __slots__ = ('interval', 'burst', 'tokens', 'updated')
+
+    def __init__(self, interval: float, burst: int = 1, now: float = 0.0):
+        self.interval = interval
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """토큰 하나 예약, 기다려야 하는 시간(초) 반환"""
+        if self.interval <= 0:
+            return 0.0
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) / self.interval)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens * self.interval
+
+class HostRateLimiter:
+    """
+    호스트마다 따로 속도를 제한 (다른 호스트 요청은 서로 기다리지 않음)
+
+    Args:
+        interval: 같은 호스트에 대한 기본 최소 요청 간격 (초, 0이면 제한 없음)
+        burst: 쉬었다가 연달아 보낼 수 있는 요청 수
+    """
+
+    def __init__(self, interval: float = 1.0, burst: int = 1,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        if interval < 0 or burst < 1:
+            raise ValueError("interval은 0 이상, burst는 1 이상이어야 합니다")
+        self.interval = interval
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def configure(self, url: str, interval: float, burst: Optional[int] = None):
+        """url의 호스트에 별도 간격 지정 (이미 쌓인 토큰은 유지)"""
+        if interval < 0 or (burst is not None and burst < 1):
+            raise ValueError("interval은 0 이상, burst는 1 이상이어야 합니다")
+        host = self.host(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                self._buckets[host] = TokenBucket(interval, burst or self.burst, self._clock())
+            else:
+                bucket.interval = interval
+                bucket.burst = burst or bucket.burst
+                bucket.tokens = min(bucket.tokens, bucket.burst)
+
+    def acquire(self, url: str) -> float:
+        """url의 호스트로 요청을 보내도 될 때까지 대기, 기다린 시간(초) 반환"""
+        host = self.host(url)
+        with self._lock:
+            now = self._clock()
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.interval, self.burst, now)
+            wait = bucket.reserve(now)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
@@ -3,60 +3,154 @@
 """
 import requests
 from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple, TypeVar
 import logging
 from urllib.parse import urljoin, urlparse
 
+from .css import SELECTORS, CompiledSelector
+from .extract import ExtractionPlan, extraction_plan, parse_document
+from .httpcache import CacheEntry, HttpCache
+from .ratelimit import HostRateLimiter
+from .sink import RowSink
+from .strainer import partial_soup
+
+T = TypeVar('T')
+R = TypeVar('R')
+
 class ScraperError(Exception):
     """스크래퍼 예외"""
     pass
 
+# BeautifulSoup 파서: lxml이 가장 빠르고, html.parser는 표준 라이브러리라 항상 사용 가능
+DEFAULT_PARSER = 'lxml'
+FALLBACK_PARSER = 'html.parser'
+PARSERS = ('lxml', 'html.parser', 'html5lib')
+
+# 사이트마다 수집할 최대 헤드라인 수
+HEADLINE_LIMIT = 10
+
+@lru_cache(maxsize=None)
+def resolve_parser(name: str) -> str:
+    """
+    실제로 쓸 파서 이름 (설치되지 않은 파서는 경고 후 html.parser로 대체)
+    
+    Raises:
+        ScraperError: 알 수 없는 파서 이름
+    """
+    if name not in PARSERS:
+        raise ScraperError(f"지원하지 않는 파서: {name} ({', '.join(PARSERS)})")
+    if builder_registry.lookup(name) is None:
+        logging.getLogger(__name__).warning(f"Parser {name!r} is not installed, falling back to {FALLBACK_PARSER!r}")
+        return FALLBACK_PARSER
+    return name
+
 class WebScraper:
-    def __init__(self, delay: float = 1.0, timeout: int = 10):
+    def __init__(self, delay: float = 1.0, timeout: int = 10, max_workers: int = 4,
+                 cache: Optional[HttpCache] = None, parser: str = DEFAULT_PARSER, partial_parse: bool = True,
+                 sink: Optional[RowSink] = None):
         """
         웹 스크래퍼 초기화
         
         Args:
-            delay: 요청 간 지연 시간 (초)
+            delay: 같은 호스트에 대한 요청 간 최소 간격 (초, 사이트 설정의 'delay'로 사이트별 지정)
             timeout: 요청 타임아웃 (초)
+            max_workers: 동시에 가져올 최대 페이지 수 (1이면 순차 실행)
+            cache: HTTP 조건부 요청 캐시 (None이면 매번 전체 본문을 받음)
+            parser: BeautifulSoup 파서 (사이트 설정의 'parser'로 사이트별 지정)
+            partial_parse: 헤드라인 수집 시 사이트 선택자에 맞을 수 있는 부분만 파싱하고
+                           HEADLINE_LIMIT개를 찾으면 파싱 중단 (False면 전체 파싱)
+            sink: 수집한 행을 (사이트 / 페이지마다) 바로 덧붙여 쓸 저장소 (닫는 것은 호출한 쪽)
         """
+        if max_workers < 1:
+            raise ScraperError("max_workers는 1 이상이어야 합니다")
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        # 동시 요청 수만큼 연결을 재사용할 수 있도록 커넥션 풀 크기 지정
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.delay = delay
         self.timeout = timeout
+        self.max_workers = max_workers
+        # 호스트별 토큰 버킷 (다른 호스트 요청은 서로 기다리지 않음)
+        self.rate_limiter = HostRateLimiter(delay)
+        self.cache = cache
+        self.parser = resolve_parser(parser)
+        self.partial_parse = partial_parse
         self.scraped_data: List[Dict[str, Any]] = []
+        self.sink = sink
         
         # 로깅 설정
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
     
-    def fetch_page(self, url: str) -> BeautifulSoup:
+    def fetch_page(self, url: str, parser: Optional[str] = None, selector: Optional[str] = None,
+                   limit: Optional[int] = None) -> BeautifulSoup:
         """
         웹 페이지를 가져와서 BeautifulSoup 객체로 반환
         
+        캐시가 있으면 저장된 ETag / Last-Modified로 조건부 요청을 보내고, 304 응답이면
+        캐시된 파싱 결과(없으면 저장된 본문을 파싱한 결과)를 반환한다. 캐시가 있을 때 반환한
+        트리는 같은 페이지를 다시 요청한 호출자와 공유하므로 수정하지 말 것 (수정하려면
+        copy.copy(soup)으로 복사본을 만들어서)
+        
         Args:
             url: 스크래핑할 URL
+            parser: 이 페이지에 쓸 파서 (None이면 스크래퍼 기본값)
+            selector: 지정하면 이 선택자에 맞을 수 있는 하위 트리만 파싱 (부분 파싱)
+            limit: 부분 파싱에서 선택자 결과가 이만큼 나오면 나머지 문서는 파싱하지 않음
             
         Returns:
             BeautifulSoup 객체
         """
+        parser = self.parser if parser is None else resolve_parser(parser)
+        if selector is None:
+            return self._fetch(url, parser, lambda content: BeautifulSoup(content, parser))
+        return self._fetch(url, f"{parser} {limit} {selector}",
+                           lambda content: partial_soup(content, parser, selector, limit))
+    
+    def _fetch(self, url: str, key: str, parse: Callable[[bytes], T]) -> T:
+        """
+        url을 요청해서 parse(본문) 결과 반환 (캐시가 있으면 조건부 요청, key: 캐시에 둘 파싱 결과의 이름)
+        
+        Raises:
+            ScraperError: 요청 또는 파싱 실패
+        """
         try:
+            # 같은 호스트에 대한 요청 간격 유지
+            waited = self.rate_limiter.acquire(url)
+            if waited:
+                self.logger.debug(f"Rate limited {url}: waited {waited:.2f}s")
             self.logger.info(f"Fetching: {url}")
             
-            response = self.session.get(url, timeout=self.timeout)
+            entry = self.cache.lookup(url) if self.cache is not None else None
+            if entry is None:
+                response = self.session.get(url, timeout=self.timeout)
+            else:
+                response = self.session.get(url, timeout=self.timeout, headers=entry.validators())
+                if response.status_code == 304:
+                    page = self._cached_page(entry, key, parse)
+                    if page is not None:
+                        return page
+                    # 그 사이 캐시에서 지워짐 - 조건 없이 다시 요청
+                    response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            page = parse(response.content)
             
-            # 요청 간 지연
-            time.sleep(self.delay)
+            if self.cache is not None:
+                self.cache.miss()
+                self.cache.store(url, response.content, response.headers.get('ETag'),
+                                 response.headers.get('Last-Modified'), {key: page})
             
-            return soup
+            return page
             
         except requests.exceptions.RequestException as e:
             raise ScraperError(f"페이지 요청 실패: {url} - {str(e)}")
@@ -65,95 +159,213 @@ class WebScraper:
                 raise ScraperError(f"페이지 요청 실패: {url} - {str(e)}")
             raise ScraperError(f"페이지 파싱 실패: {url} - {str(e)}")
     
+    def _cached_page(self, entry: CacheEntry, key: str, parse: Callable[[bytes], T]) -> Optional[T]:
+        """304 응답에 대한 캐시된 페이지 (같은 방식으로 파싱한 결과가 없으면 저장된 본문을 파싱, 본문이 지워졌으면 None)"""
+        page = self.cache.parsed(entry, key)
+        if page is None:
+            content = self.cache.read(entry)
+            if content is None:
+                return None
+            page = parse(content)
+            self.cache.keep_parsed(entry, key, page)
+        self.cache.hit(entry)
+        self.logger.info(f"Not modified: {entry.url} (cached)")
+        return page
+    
+    def configure_site(self, site: Dict[str, Any]):
+        """
+        사이트 설정 적용 - 'delay' / 'burst'로 해당 호스트의 요청 속도 지정, 'selector' / 'parser' 검사
+        
+        Raises:
+            ScraperError: 설정 값이 올바르지 않은 경우
+        """
+        if 'selector' in site:
+            self.compile_selector(site['selector'], site.get('name', site['url']))
+        if 'parser' in site:
+            resolve_parser(site['parser'])
+        if 'delay' in site or 'burst' in site:
+            try:
+                self.rate_limiter.configure(site['url'], site.get('delay', self.delay), site.get('burst'))
+            except ValueError as e:
+                raise ScraperError(f"사이트 설정 오류: {site.get('name', site['url'])} - {str(e)}")
+    
+    def compile_selector(self, selector: str, owner: Optional[str] = None) -> CompiledSelector:
+        """
+        레지스트리에서 컴파일된 선택자 가져오기 (처음 보는 선택자면 컴파일)
+        
+        Raises:
+            ScraperError: 잘못된 선택자 (owner: 오류 메시지에 넣을 사이트 / 필드 이름)
+        """
+        try:
+            return SELECTORS.compile(selector)
+        except ValueError as e:
+            raise ScraperError(f"선택자 오류 ({owner}): {str(e)}" if owner else str(e))
+    
+    def _map_concurrent(self, function: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        """
+        items마다 function 실행 (최대 max_workers개 동시)
+        
+        결과는 완료 순서와 관계없이 입력 순서대로 반환한다.
+        """
+        items = list(items)
+        if self.max_workers == 1 or len(items) <= 1:
+            return [function(item) for item in items]
+        workers = min(self.max_workers, len(items))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scraper') as pool:
+            return list(pool.map(function, items))
+    
+    def fetch_pages(self, urls: Iterable[str]) -> List[Tuple[str, Optional[BeautifulSoup], Optional[str]]]:
+        """
+        여러 페이지를 동시에 가져오기
+        
+        Args:
+            urls: 가져올 URL들
+            
+        Returns:
+            [(URL, BeautifulSoup 객체, 오류)] - 입력 순서, 실패한 페이지는 (URL, None, 오류 메시지)
+        """
+        def fetch(url: str) -> Tuple[str, Optional[BeautifulSoup], Optional[str]]:
+            try:
+                return url, self.fetch_page(url), None
+            except ScraperError as e:
+                self.logger.error(f"Error fetching {url}: {e}")
+                return url, None, str(e)
+        
+        return self._map_concurrent(fetch, urls)
+    
     def scrape_news_headlines(self, news_sites: List[Dict[str, str]]) -> List[Dict[str, Any]]:
         """
         뉴스 사이트에서 헤드라인 수집
         
+        사이트들은 동시에(최대 max_workers개) 가져오고, 결과는 news_sites 순서대로 합친다.
+        한 사이트의 실패는 로그만 남기고 다른 사이트에 영향을 주지 않는다.
+        
         Args:
             news_sites: [{'name': '사이트명', 'url': 'URL', 'selector': 'CSS선택자'}] 형태의 리스트
+                        ('delay': 호스트별 요청 간격, 'burst': 연속 요청 수, 'parser': 파서는 선택)
             
         Returns:
             수집된 뉴스 데이터 리스트
         """
-        all_headlines = []
-        
         for site in news_sites:
-            try:
-                self.logger.info(f"Scraping {site['name']}...")
-                
-                soup = self.fetch_page(site['url'])
-                headlines = soup.select(site['selector'])
-                
-                for headline in headlines[:10]:  # 상위 10개만
-                    text = headline.get_text(strip=True)
-                    if text:
-                        link = headline.get('href', '')
-                        if link and not link.startswith('http'):
-                            link = urljoin(site['url'], link)
-                        
-                        news_data = {
-                            'title': text,
-                            'link': link,
-                            'source': site['name'],
-                            'scraped_at': datetime.now().isoformat()
-                        }
-                        all_headlines.append(news_data)
-                        
-            except ScraperError as e:
-                self.logger.error(f"Error scraping {site['name']}: {e}")
-                continue
+            self.configure_site(site)
+        all_headlines = []
+        for headlines in self._map_concurrent(self._scrape_site_headlines, news_sites):
+            all_headlines.extend(headlines)
         
         self.scraped_data.extend(all_headlines)
         return all_headlines
     
-    def scrape_generic_content(self, url: str, selectors: Dict[str, str]) -> List[Dict[str, Any]]:
+    def _scrape_site_headlines(self, site: Dict[str, str]) -> List[Dict[str, Any]]:
+        """사이트 하나의 헤드라인 (가져오기에 실패하면 빈 리스트, sink 저장 실패는 로그만)"""
+        site_headlines = []
+        try:
+            self.logger.info(f"Scraping {site['name']}...")
+            
+            if self.partial_parse:
+                soup = self.fetch_page(site['url'], parser=site.get('parser'),
+                                       selector=site['selector'], limit=HEADLINE_LIMIT)
+            else:
+                soup = self.fetch_page(site['url'], parser=site.get('parser'))
+            headlines = SELECTORS.compile(site['selector']).select(soup)
+            
+            for headline in headlines[:HEADLINE_LIMIT]:  # 상위 HEADLINE_LIMIT개만
+                text = headline.get_text(strip=True)
+                if text:
+                    link = headline.get('href', '')
+                    if link and not link.startswith('http'):
+                        link = urljoin(site['url'], link)
+                    
+                    news_data = {
+                        'title': text,
+                        'link': link,
+                        'source': site['name'],
+                        'scraped_at': datetime.now().isoformat()
+                    }
+                    site_headlines.append(news_data)
+                    
+        except ScraperError as e:
+            self.logger.error(f"Error scraping {site['name']}: {e}")
+            return []
+        
+        # 저장 실패는 이 사이트의 로그로만 남김 (예외가 pool.map으로 올라가면 다른 사이트 결과도 버려짐)
+        try:
+            self._emit(site_headlines)
+        except ScraperError as e:
+            self.logger.error(f"Error writing {site['name']} to sink: {e}")
+        return site_headlines
+    
+    def scrape_generic_content(self, url: str, selectors: Dict[str, str], xpath: bool = False) -> List[Dict[str, Any]]:
         """
         일반적인 콘텐츠 스크래핑
         
+        첫 번째 필드의 선택자로 찾은 요소마다 한 행을 만든다. 요소의 하위 노드를 한 번만 훑어서
+        모든 필드를 채우고(ExtractionPlan), 한 페이지의 행은 모두 같은 scraped_at을 갖는다.
+        
         Args:
             url: 스크래핑할 URL
             selectors: {'field_name': 'CSS선택자'} 형태의 딕셔너리
+            xpath: True면 BeautifulSoup 대신 lxml 트리와 XPath로 추출 (선택자를 XPath로 바꿀 수
+                   없으면 BeautifulSoup 경로 사용)
             
         Returns:
             스크래핑된 데이터 리스트
+            
+        Raises:
+            ScraperError: 잘못된 선택자 (페이지를 요청하기 전에 검사)
         """
+        plan = self.extraction_plan(selectors)
         try:
-            soup = self.fetch_page(url)
-            results = []
-            
-            # 각 선택자로 요소 찾기
-            first_selector = list(selectors.keys())[0]
-            main_elements = soup.select(selectors[first_selector])
-            
-            for element in main_elements:
-                data = {'scraped_at': datetime.now().isoformat()}
-                
-                for field, selector in selectors.items():
-                    if field == first_selector:
-                        data[field] = element.get_text(strip=True)
-                    else:
-                        # 현재 요소 내에서 찾기
-                        sub_element = element.select_one(selector)
-                        if sub_element:
-                            if selector.endswith('[href]') or selector.endswith('[src]'):
-                                data[field] = sub_element.get('href') or sub_element.get('src')
-                            else:
-                                data[field] = sub_element.get_text(strip=True)
-                        else:
-                            data[field] = None
-                
-                results.append(data)
-            
-            self.scraped_data.extend(results)
-            return results
+            if xpath and plan.xpath_ready:
+                document = self._fetch(url, 'lxml.html', parse_document)
+                results = plan.xpath_rows(document, datetime.now().isoformat())
+            else:
+                if xpath:
+                    self.logger.debug(f"XPath extraction not available for {selectors}, using BeautifulSoup")
+                soup = self.fetch_page(url)
+                results = plan.rows(soup, datetime.now().isoformat())
             
         except ScraperError as e:
             self.logger.error(f"Error scraping {url}: {e}")
             return []
+        
+        self.scraped_data.extend(results)
+        self._emit(results)
+        return results
+    
+    def _emit(self, rows: List[Dict[str, Any]]):
+        """
+        수집한 행을 sink에 바로 기록 (sink가 없으면 아무것도 하지 않음)
+        
+        Raises:
+            ScraperError: 파일 쓰기 실패
+        """
+        if self.sink is None or not rows:
+            return
+        try:
+            self.sink.write_many(rows)
+        except (OSError, ValueError) as e:
+            raise ScraperError(f"데이터 저장 실패: {str(e)}")
+    
+    def extraction_plan(self, selectors: Dict[str, str]) -> ExtractionPlan:
+        """
+        {필드: 선택자}의 추출 계획 (선택자 컴파일 / 검사 포함, 같은 선택자면 재사용)
+        
+        Raises:
+            ScraperError: 필드가 없거나 잘못된 선택자
+        """
+        for field, selector in selectors.items():
+            self.compile_selector(selector, field)
+        try:
+            return extraction_plan(selectors)
+        except ValueError as e:
+            raise ScraperError(str(e))
     
     def save_to_csv(self, filename: str, data: Optional[List[Dict[str, Any]]] = None) -> str:
         """
-        데이터를 CSV 파일로 저장
+        데이터를 CSV 파일로 저장 (RowSink로 한 번에 쓰는 호환용 래퍼)
+        
+        수집하면서 바로 쓰려면 WebScraper(sink=RowSink(...))를 사용한다.
         
         Args:
             filename: 파일명
@@ -169,9 +381,11 @@ class WebScraper:
             raise ScraperError("저장할 데이터가 없습니다")
         
         try:
-            df = pd.DataFrame(data)
-            filepath = f"{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            df.to_csv(filepath, index=False, encoding='utf-8-sig')
+            # 열은 모든 행의 키를 처음 나온 순서대로 (DataFrame과 같음)
+            fieldnames = dict.fromkeys(key for row in data for key in row)
+            with RowSink(filename, 'csv', fieldnames=fieldnames, flush_rows=0, flush_interval=0) as sink:
+                sink.write_many(data)
+            filepath = sink.path
             
             self.logger.info(f"Data saved to {filepath}")
             return filepath
@@ -0,0 +1,174 @@
+"""
+수집한 행을 바로 파일에 쓰는 스트리밍 저장소 (CSV / JSONL)
+
+save_to_csv는 실행이 끝난 뒤 scraped_data 전체로 DataFrame을 만들어 한 번에 쓴다. RowSink는
+행이 수집될 때마다 파일 끝에 덧붙이고, flush_rows행 또는 flush_interval초마다 디스크로
+내보낸다. 파일이 max_bytes를 넘거나 rotate_interval초가 지나면 새 파일을 연다.
+
+    <base>_<YYYYmmdd_HHMMSS>.csv        (같은 초에 이미 있으면 <base>_<시각>_<n>.csv)
+    <base>_<YYYYmmdd_HHMMSS>.jsonl.gz   (compress=True)
+
+CSV의 열은 파일의 첫 행(또는 fieldnames 뒤에 첫 행에만 있는 키를 붙인 것)으로 정해진다. 이후
+새 열이 있는 행이 오면 헤더를 넓힌 새 파일로 넘어가므로, 파일마다 헤더는 항상 그 안의 모든 행을
+담는다.
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+FORMATS = ('csv', 'jsonl')
+
+class RowSink:
+    """
+    행 단위 스트리밍 저장소 (스레드 안전, with 문으로 쓰면 끝날 때 닫힘)
+
+    Args:
+        base: 파일 이름 앞부분 (경로 포함 가능, 시각과 확장자가 붙음)
+        format: 'csv' 또는 'jsonl'
+        compress: gzip으로 압축 (.gz)
+        fieldnames: CSV 열 순서 (None이면 첫 행의 키 순서, 여기에 없는 키는 뒤에 열로 추가)
+        flush_rows: 이만큼 쓸 때마다 flush (0이면 행 수로는 flush하지 않음)
+        flush_interval: 마지막 flush 후 이만큼(초) 지나면 다음 쓰기 때 flush (0이면 사용 안 함)
+        max_bytes: 파일 크기(압축 후, 버퍼 크기 정도의 오차)가 이를 넘으면 새 파일 (None이면 제한 없음)
+        rotate_interval: 파일을 연 뒤 이만큼(초) 지나면 새 파일 (None이면 제한 없음)
+        encoding: CSV 인코딩 (기본 utf-8-sig, 엑셀 호환), JSONL은 항상 utf-8
+    """
+
+    def __init__(self, base: str, format: str = 'csv', compress: bool = False,
+                 fieldnames: Optional[Iterable[str]] = None, flush_rows: int = 100, flush_interval: float = 5.0,
+                 max_bytes: Optional[int] = None, rotate_interval: Optional[float] = None,
+                 encoding: str = 'utf-8-sig', clock: Callable[[], float] = time.monotonic):
+        if format not in FORMATS:
+            raise ValueError(f"지원하지 않는 저장 형식: {format} ({', '.join(FORMATS)})")
+        if flush_rows < 0 or flush_interval < 0:
+            raise ValueError("flush_rows와 flush_interval은 0 이상이어야 합니다")
+        if (max_bytes is not None and max_bytes <= 0) or (rotate_interval is not None and rotate_interval <= 0):
+            raise ValueError("max_bytes와 rotate_interval은 0보다 커야 합니다")
+        self.base = base
+        self.format = format
+        self.compress = compress
+        self.fieldnames: Optional[List[str]] = list(fieldnames) if fieldnames is not None else None
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.encoding = encoding if format == 'csv' else 'utf-8'
+        self.paths: List[str] = []
+        self.rows_written = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._raw: Any = None
+        self._text: Optional[io.TextIOWrapper] = None
+        self._writer: Any = None
+        self._columns: frozenset = frozenset()
+        self._opened = 0.0
+        self._flushed = 0.0
+        self._pending = 0
+        self._closed = False
+
+    @property
+    def path(self) -> Optional[str]:
+        """지금(또는 마지막으로) 쓰는 파일"""
+        return self.paths[-1] if self.paths else None
+
+    def _new_path(self) -> str:
+        extension = f".{self.format}{'.gz' if self.compress else ''}"
+        stem = f"{self.base}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        path, n = stem + extension, 1
+        while os.path.exists(path) or path in self.paths:
+            path, n = f"{stem}_{n}{extension}", n + 1
+        return path
+
+    def _open(self, row: Dict[str, Any]):
+        path = self._new_path()
+        raw = open(path, 'wb')
+        stream = gzip.GzipFile(filename=os.path.basename(path), fileobj=raw, mode='wb') if self.compress else raw
+        self._raw = raw
+        self._text = io.TextIOWrapper(stream, encoding=self.encoding, newline='')
+        if self.format == 'csv':
+            if self.fieldnames is None:
+                self.fieldnames = list(row)
+            else:
+                self.fieldnames = self.fieldnames + [key for key in row if key not in self.fieldnames]
+            self._columns = frozenset(self.fieldnames)
+            self._writer = csv.DictWriter(self._text, self.fieldnames, lineterminator='\n')
+            self._writer.writeheader()
+        self.paths.append(path)
+        self._opened = self._flushed = self._clock()
+
+    def _close_file(self):
+        if self._text is not None:
+            self._text.close()
+            if not self._raw.closed:  # GzipFile은 압축 스트림만 끝내고 원본 파일은 닫지 않음
+                self._raw.close()
+        self._raw = self._text = self._writer = None
+        self._pending = 0
+
+    def _needs_rotation(self, row: Dict[str, Any], now: float) -> bool:
+        if self._writer is not None and not self._columns.issuperset(row):
+            # 새 열 - 헤더를 넓혀서 새 파일
+            self.fieldnames = self.fieldnames + [key for key in row if key not in self.fieldnames]
+            return True
+        if self.max_bytes is not None and self._raw.tell() >= self.max_bytes:
+            return True
+        return self.rotate_interval is not None and now - self._opened >= self.rotate_interval
+
+    def write(self, row: Dict[str, Any]):
+        """행 하나 추가"""
+        self.write_many([row])
+
+    def write_many(self, rows: Iterable[Dict[str, Any]]):
+        """
+        행들 추가 (필요하면 flush / 새 파일)
+
+        Raises:
+            ValueError: 이미 닫힌 저장소
+            OSError: 파일 쓰기 실패
+        """
+        with self._lock:
+            if self._closed:
+                raise ValueError("닫힌 저장소에는 쓸 수 없습니다")
+            for row in rows:
+                now = self._clock()
+                if self._text is None:
+                    self._open(row)
+                elif self._needs_rotation(row, now):
+                    self._close_file()
+                    self._open(row)
+                if self._writer is not None:
+                    self._writer.writerow(row)
+                else:
+                    self._text.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+                self.rows_written += 1
+                self._pending += 1
+                if ((self.flush_rows and self._pending >= self.flush_rows)
+                        or (self.flush_interval and now - self._flushed >= self.flush_interval)):
+                    self._flush(now)
+
+    def _flush(self, now: float):
+        self._text.flush()  # GzipFile이면 지금까지의 압축 데이터까지 내보냄
+        self._flushed = now
+        self._pending = 0
+
+    def flush(self):
+        """버퍼에 남은 행을 디스크로"""
+        with self._lock:
+            if self._text is not None:
+                self._flush(self._clock())
+
+    def close(self):
+        with self._lock:
+            self._close_file()
+            self._closed = True
+
+    def __enter__(self) -> 'RowSink':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,110 @@
+"""
+선택자 기반 부분 파싱 (SoupStrainer)
+
+헤드라인은 사이트 선택자 하나로 최대 몇 개만 찾으므로, 문서 전체 트리를 만들 필요가 없다.
+선택자(쉼표로 나뉜 각 부분)의 맨 왼쪽 단순 선택자에 맞는 요소만 하위 트리째로 만들고,
+나머지 태그 / 문자열은 파서가 읽기만 하고 버린다. 남은 트리에서 원래 선택자로 찾으므로
+결과는 전체 파싱과 같고, 찾은 개수가 limit에 이르면 문서의 나머지는 파싱하지 않는다.
+
+    '.titleline > a'                        -> class="titleline" 요소만
+    '[data-testid="card-headline"] h3'      -> data-testid="card-headline" 요소만
+    'h2 a, h3 a'                            -> h2, h3 요소만
+
+형제 결합자(+, ~)나 의사 클래스(:)처럼 하위 트리 밖을 봐야 하는 선택자, '*'로 시작하는
+선택자는 줄일 수 없으므로 전체 파싱한다.
+
+하위 트리를 남기는 것은 공개 API(parse_only)지만, limit에서 멈추는 것은 BeautifulSoup에 공개된
+방법이 없어 내부 메서드 _feed / popTag를 재정의한다. 그래서 pyproject.toml에서 beautifulsoup4
+버전 범위를 고정하고, 이 메서드들이 더 이상 불리지 않으면 test_partial_parse_bs4_hooks가 실패한다.
+(그 경우에도 결과는 같고 조기 중단만 되지 않음)
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+from bs4.filter import ElementFilter
+
+from .css import SELECTORS, CompiledSelector, Compound
+
+class SelectorStrainer(ElementFilter):
+    """
+    선택자에 맞을 수 있는 하위 트리만 만드는 필터 (BeautifulSoup의 parse_only)
+
+    최상위(아직 남긴 조상이 없는) 태그가 어느 부분의 맨 왼쪽 단순 선택자에 맞으면 그 하위 트리
+    전체를 남기고, 최상위 문자열은 버린다.
+    """
+
+    def __init__(self, selector: CompiledSelector, compounds: List[Compound]):
+        super().__init__()
+        self.selector = selector
+        self.compounds = compounds
+
+    def allow_tag_creation(self, nsprefix: Optional[str], name: str, attrs: Optional[Dict[str, Any]]) -> bool:
+        attrs = attrs or {}
+        return any(compound.matches(name, attrs) for compound in self.compounds)
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return f"SelectorStrainer({self.selector.pattern!r})"
+
+@lru_cache(maxsize=256)
+def selector_strainer(selector: str) -> Optional[SelectorStrainer]:
+    """
+    선택자의 부분 파싱 필터 (줄일 수 없는 선택자면 None - 전체 파싱)
+
+    Raises:
+        ValueError: 문법이 잘못된 선택자
+    """
+    compiled = SELECTORS.compile(selector)
+    if compiled.chains is None:
+        return None
+    return SelectorStrainer(compiled, [chain[0][1] for chain in compiled.chains])
+
+class _LimitReached(Exception):
+    """필요한 만큼 찾았으므로 파싱 중단"""
+
+class _PartialSoup(BeautifulSoup):
+    """남긴 하위 트리가 닫힐 때마다 선택자 결과 수를 세고, limit개가 되면 파싱을 멈추는 soup"""
+
+    def __init__(self, markup: Any, features: str, strainer: SelectorStrainer, limit: Optional[int]):
+        self.limit = limit
+        self.found = 0
+        self.truncated = False
+        super().__init__(markup, features, parse_only=strainer)
+
+    def _feed(self):
+        try:
+            super()._feed()
+        except _LimitReached:
+            self.truncated = True
+            self.endData()
+            while self.currentTag is not None and self.currentTag.name != self.ROOT_TAG_NAME:
+                self.popTag()
+
+    def popTag(self):
+        closed = self.tagStack[-1] if self.tagStack else None
+        current = super().popTag()
+        if self.limit is not None and not self.truncated and current is self and closed is not self:
+            # 최상위 하위 트리 하나가 완성됨
+            selector = self.parse_only.selector
+            self.found += len(selector.select(closed)) + (1 if selector.match(closed) else 0)
+            if self.found >= self.limit:
+                raise _LimitReached()
+        return current
+
+def partial_soup(content: Any, parser: str, selector: str, limit: Optional[int] = None) -> BeautifulSoup:
+    """
+    selector에 맞을 수 있는 부분만 파싱한 soup (soup.select(selector)의 앞 limit개는 전체 파싱과 같음)
+
+    Args:
+        content: HTML 본문
+        parser: BeautifulSoup 파서 ('lxml' 또는 'html.parser', html5lib은 부분 파싱을 지원하지 않음)
+        selector: 찾을 CSS 선택자
+        limit: 이만큼 찾으면 나머지 문서는 파싱하지 않음 (None이면 끝까지)
+    """
+    strainer = selector_strainer(selector)
+    if strainer is None or parser == 'html5lib':
+        return BeautifulSoup(content, parser)
+    return _PartialSoup(content, parser, strainer, limit)
@@ -3,12 +3,23 @@
 """
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+import bs4
 from bs4 import BeautifulSoup
 import pandas as pd
+import gzip
+import json
 import os
+import threading
+import time
 from datetime import datetime
 
-from src.web_scraper.scraper import WebScraper, ScraperError
+from src.web_scraper.scraper import WebScraper, ScraperError, resolve_parser
+from src.web_scraper.css import SELECTORS, SelectorRegistry
+from src.web_scraper.httpcache import HttpCache
+from src.web_scraper.news_sites import NEWS_SITES, TECH_NEWS_SITES
+from src.web_scraper.ratelimit import HostRateLimiter
+from src.web_scraper.sink import RowSink
+from src.web_scraper.strainer import _PartialSoup, partial_soup, selector_strainer
 
 class TestWebScraper:
     
@@ -179,6 +190,349 @@ class TestWebScraper:
         
         assert headlines == []
     
+    def test_scrape_news_headlines_concurrent(self, mock_html):
+        """사이트들을 동시에 가져오되 결과는 사이트 순서, 실패는 해당 사이트만"""
+        scraper = WebScraper(delay=0, max_workers=2)
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+        
+        def fake_fetch(url, **options):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.1 if url.endswith('0') else 0.02)  # 첫 사이트가 가장 늦게 끝남
+            with lock:
+                state['active'] -= 1
+            if url.endswith('2'):
+                raise ScraperError("Test error")
+            return BeautifulSoup(mock_html, 'html.parser')
+        
+        news_sites = [{'name': f'Site {i}', 'url': f'https://site{i}.com/{i}', 'selector': 'h1 a'}
+                      for i in range(4)]
+        with patch.object(scraper, 'fetch_page', side_effect=fake_fetch):
+            started = time.perf_counter()
+            headlines = scraper.scrape_news_headlines(news_sites)
+            elapsed = time.perf_counter() - started
+        
+        assert [item['source'] for item in headlines] == ['Site 0', 'Site 1', 'Site 3']
+        assert state['peak'] == 2
+        assert elapsed < 0.1 + 0.02 * 3
+        assert scraper.scraped_data == headlines
+    
+    @patch('src.web_scraper.scraper.requests.Session.get')
+    def test_fetch_pages(self, mock_get, mock_html):
+        """여러 페이지 동시 요청 (실패한 URL은 오류 메시지와 함께)"""
+        def fake_get(url, timeout):
+            if 'bad' in url:
+                raise Exception("Network error")
+            response = Mock()
+            response.content = mock_html.encode('utf-8')
+            return response
+        mock_get.side_effect = fake_get
+        
+        scraper = WebScraper(delay=0)
+        pages = scraper.fetch_pages(["https://a.com", "https://bad.com", "https://c.com"])
+        
+        assert [url for url, _, _ in pages] == ["https://a.com", "https://bad.com", "https://c.com"]
+        assert pages[0][1].find('h1').get_text() == "Test Headline 1"
+        assert pages[1][1] is None and "페이지 요청 실패" in pages[1][2]
+    
+    def test_host_rate_limiter(self):
+        """같은 호스트만 간격을 지키고 다른 호스트는 기다리지 않음 (가짜 시계)"""
+        clock = {'now': 0.0}
+        waits = []
+        def fake_sleep(seconds):
+            waits.append(seconds)
+            clock['now'] += seconds
+        limiter = HostRateLimiter(1.0, clock=lambda: clock['now'], sleep=fake_sleep)
+        limiter.configure("https://slow.com/", 3.0, burst=2)
+        
+        assert limiter.acquire("https://a.com/1") == 0
+        assert limiter.acquire("https://b.com/1") == 0
+        assert limiter.acquire("https://A.com/2") == 1.0
+        clock['now'] += 5.0  # 쉬는 동안 쌓인 토큰은 burst까지만
+        assert limiter.acquire("https://a.com/3") == 0
+        assert limiter.acquire("https://a.com/4") == 1.0
+        # burst=2: 두 번은 바로, 세 번째부터 3초 간격
+        assert [limiter.acquire("https://slow.com/") for _ in range(3)] == [0, 0, 3.0]
+        assert waits == [1.0, 1.0, 3.0]
+        
+        with pytest.raises(ValueError):
+            HostRateLimiter(-1)
+    
+    def test_site_delay_configuration(self, mock_html):
+        """사이트 설정의 delay가 해당 호스트의 요청 간격이 됨"""
+        scraper = WebScraper(delay=0)
+        waits = []
+        scraper.rate_limiter._sleep = waits.append
+        news_sites = [{'name': 'Slow', 'url': 'https://slow.com/', 'delay': 30.0, 'selector': 'h1 a'},
+                      {'name': 'Fast', 'url': 'https://fast.com/', 'selector': 'h1 a'}]
+        with patch('src.web_scraper.scraper.requests.Session.get') as mock_get:
+            mock_get.return_value.content = mock_html.encode('utf-8')
+            scraper.scrape_news_headlines(news_sites)
+            scraper.fetch_page("https://fast.com/other")
+            scraper.fetch_page("https://slow.com/other")
+        
+        assert len(waits) == 1 and 29.0 < waits[0] <= 30.0
+        with pytest.raises(ScraperError, match="사이트 설정 오류"):
+            scraper.configure_site({'name': 'Bad', 'url': 'https://bad.com/', 'delay': -1})
+    
+    @patch('src.web_scraper.scraper.requests.Session.get')
+    def test_http_cache_conditional_requests(self, mock_get, mock_html, tmp_path):
+        """ETag / Last-Modified로 조건부 요청, 304면 캐시된 파싱 결과 반환"""
+        def fake_get(url, timeout, headers=None):
+            response = Mock()
+            if headers and headers.get('If-None-Match') == '"v1"':
+                response.status_code = 304
+                return response
+            response.status_code = 200
+            response.content = mock_html.encode('utf-8')
+            response.headers = {'ETag': '"v1"', 'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'}
+            return response
+        mock_get.side_effect = fake_get
+        
+        scraper = WebScraper(delay=0, cache=HttpCache(str(tmp_path)))
+        first = scraper.fetch_page("https://example.com/news")
+        second = scraper.fetch_page("https://example.com/news")
+        
+        assert second is first
+        assert mock_get.call_args.kwargs['headers'] == {
+            'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 01 Jan 2025 00:00:00 GMT'}
+        stats = scraper.cache.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+        
+        # 새 프로세스: 디스크의 본문을 파싱해서 반환
+        restarted = WebScraper(delay=0, cache=HttpCache(str(tmp_path)))
+        soup = restarted.fetch_page("https://example.com/news")
+        assert soup.find('h1').get_text() == "Test Headline 1"
+        assert restarted.cache.stats()['hits'] == 1
+    
+    def test_http_cache_parsed_lru(self, tmp_path):
+        """파싱 결과는 (URL, 검증자, 파싱 방식)별로 max_parsed개까지만 메모리에 보관"""
+        cache = HttpCache(str(tmp_path), max_parsed=2)
+        entries = [cache.store(f"https://{name}.com/", b'<p>x</p>', f'"{name}"', None, {'lxml': name})
+                   for name in ('a', 'b', 'c')]
+        assert cache.parsed(entries[0], 'lxml') is None  # 가장 오래된 결과는 버려짐
+        assert [cache.parsed(entry, 'lxml') for entry in entries[1:]] == ['b', 'c']
+        assert cache.parsed(entries[1], 'html.parser') is None
+        
+        # 새 버전을 저장하면 이전 버전의 파싱 결과는 쓰지 않음
+        updated = cache.store("https://b.com/", b'<p>y</p>', '"b2"', None)
+        assert cache.parsed(updated, 'lxml') is None and cache.stats()['parsed'] == 1
+        cache.keep_parsed(entries[1], 'lxml', 'stale')  # 이미 교체된 항목
+        assert cache.stats()['parsed'] == 1
+        with pytest.raises(ValueError):
+            HttpCache(str(tmp_path), max_parsed=-1)
+    
+    def test_http_cache_eviction(self, tmp_path):
+        """본문 합계가 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 삭제"""
+        cache = HttpCache(str(tmp_path), max_bytes=250)
+        for name in ('a', 'b', 'c'):
+            cache.store(f"https://{name}.com/", b'x' * 100, f'"{name}"', None)
+        assert cache.lookup("https://a.com/") is None
+        cache.hit(cache.lookup("https://b.com/"))  # b를 최근 사용으로
+        cache.store("https://d.com/", b'x' * 100, None, 'Thu, 02 Jan 2025 00:00:00 GMT')
+        
+        assert cache.lookup("https://b.com/") is not None and cache.lookup("https://c.com/") is None
+        assert cache.stats()['evictions'] == 2 and cache.stats()['bytes'] == 200
+        assert cache.store("https://e.com/", b'x', None, None) is None  # 검증자 없음
+        assert len(os.listdir(tmp_path)) == 4
+        assert HttpCache(str(tmp_path)).stats()['entries'] == 2
+    
+    @patch('src.web_scraper.scraper.requests.Session.get')
+    def test_parser_backend(self, mock_get, mock_html):
+        """기본 lxml, 스크래퍼 / 사이트별 파서 지정, 미설치 파서는 html.parser로 대체"""
+        mock_get.return_value.content = mock_html.encode('utf-8')
+        
+        assert WebScraper().fetch_page("https://example.com").builder.NAME == 'lxml'
+        scraper = WebScraper(delay=0, parser='html.parser')
+        assert scraper.fetch_page("https://example.com").builder.NAME == 'html.parser'
+        assert scraper.fetch_page("https://example.com", parser='lxml').builder.NAME == 'lxml'
+        
+        sites = [{'name': 'Test', 'url': 'https://example.com', 'selector': 'h1 a', 'parser': 'lxml'}]
+        with patch.object(scraper, 'fetch_page', wraps=scraper.fetch_page) as fetch:
+            assert len(scraper.scrape_news_headlines(sites)) == 1
+        assert fetch.call_args.kwargs['parser'] == 'lxml'
+        
+        with pytest.raises(ScraperError, match="지원하지 않는 파서"):
+            WebScraper(parser='regex')
+        with pytest.raises(ScraperError, match="지원하지 않는 파서"):
+            scraper.scrape_news_headlines([dict(sites[0], parser='xml')])
+        
+        resolve_parser.cache_clear()
+        try:
+            with patch('src.web_scraper.scraper.builder_registry.lookup', return_value=None):
+                assert WebScraper(parser='lxml').parser == 'html.parser'
+        finally:
+            resolve_parser.cache_clear()
+    
+    def test_partial_parse(self):
+        """선택자에 맞을 수 있는 하위 트리만 파싱, limit개를 찾으면 중단 - 결과는 전체 파싱과 같음"""
+        cards = ''.join(f'<div class="card"><span class="headline" data-kind="news"><a href="/{i}">Story {i}</a></span>'
+                        f'<p>Summary {i}</p><h3><a href="/more/{i}">More {i}</a></h3></div>' for i in range(50))
+        html = f'<html><body><nav><a href="/">Home</a></nav><main>{cards}</main></body></html>'
+        
+        for parser in ('lxml', 'html.parser'):
+            for selector in ('.headline > a', '[data-kind="news"] a, h3 a', 'span.headline', 'h3'):
+                full = BeautifulSoup(html, parser).select(selector)[:10]
+                soup = partial_soup(html, parser, selector, limit=10)
+                assert [str(tag) for tag in soup.select(selector)[:10]] == [str(tag) for tag in full]
+                assert soup.truncated and soup.find('p') is None
+            assert len(partial_soup(html, parser, 'h3 a').select('h3 a')) == 50
+        
+        for selector in ('h2 + a', 'li:first-child a', '* a', '.a ~ .b'):
+            assert selector_strainer(selector) is None
+        assert partial_soup(html, 'lxml', 'h2 + p').find('p') is not None  # 전체 파싱
+    
+    def test_partial_parse_bs4_hooks(self):
+        """조기 중단이 기대는 BeautifulSoup 내부 메서드(_feed, popTag)가 여전히 불리는지"""
+        html = '<html><body>' + ''.join(f'<h3><a href="/{i}">Story {i}</a></h3>' for i in range(30)) + '</body></html>'
+        for parser in ('lxml', 'html.parser'):
+            calls = {'_feed': 0, 'popTag': 0}
+            class Spy(_PartialSoup):
+                def _feed(self):
+                    calls['_feed'] += 1
+                    super()._feed()
+                def popTag(self):
+                    calls['popTag'] += 1
+                    return super().popTag()
+            soup = Spy(html, parser, selector_strainer('h3 a'), 5)
+            assert calls['_feed'] == 1 and calls['popTag'] > 0, \
+                f"beautifulsoup4 {bs4.__version__} no longer calls _feed/popTag - update strainer._PartialSoup"
+            # 다섯 번째 하위 트리가 닫히는 순간 멈춤 (나머지 문서는 트리로 만들지 않음)
+            assert soup.truncated and soup.found == 5 and len(soup.find_all('h3')) == 5
+    
+    @patch('src.web_scraper.scraper.requests.Session.get')
+    def test_partial_parse_headlines(self, mock_get, mock_html):
+        """부분 파싱 모드와 전체 파싱 모드의 헤드라인이 같음"""
+        mock_get.return_value.content = mock_html.encode('utf-8')
+        sites = [{'name': 'Test', 'url': 'https://example.com', 'selector': 'h1 a, h2 a'},
+                 {'name': 'Items', 'url': 'https://example.com', 'selector': '.news-item a'}]
+        
+        partial = WebScraper(delay=0).scrape_news_headlines(sites)
+        full = WebScraper(delay=0, partial_parse=False).scrape_news_headlines(sites)
+        
+        strip = lambda items: [{k: v for k, v in item.items() if k != 'scraped_at'} for item in items]
+        assert strip(partial) == strip(full) and len(partial) == 3
+    
+    def test_selector_registry(self, mock_html):
+        """선택자는 한 번만 컴파일해서 재사용, 잘못된 선택자는 등록할 때 오류"""
+        assert all(site['selector'] in SELECTORS for site in NEWS_SITES + TECH_NEWS_SITES)
+        
+        registry = SelectorRegistry()
+        compiled = registry.compile('h1 a, h2 a')
+        assert registry.compile('h1 a, h2 a') is compiled and len(registry) == 1
+        soup = BeautifulSoup(mock_html, 'html.parser')
+        assert [tag.get_text() for tag in compiled.select(soup)] == ["Test Headline 1", "Test Headline 2"]
+        assert compiled.select_one(soup.find('div')) is None and compiled.match(soup.find('a'))
+        
+        for bad in ('h1 a[', '', None, '> > a'):
+            with pytest.raises(ValueError):
+                registry.compile(bad)
+        with pytest.raises(ValueError, match="Broken"):
+            registry.compile_sites([{'name': 'Broken', 'url': 'https://example.com', 'selector': 'div:unknown'}])
+    
+    def test_invalid_selectors_fail_before_request(self, scraper):
+        """잘못된 사이트 / 필드 선택자는 페이지를 요청하기 전에 ScraperError"""
+        with patch.object(scraper, 'fetch_page') as fetch:
+            with pytest.raises(ScraperError, match="Broken"):
+                scraper.scrape_news_headlines([{'name': 'Broken', 'url': 'https://example.com', 'selector': 'h1 a['}])
+            with pytest.raises(ScraperError, match="link"):
+                scraper.scrape_generic_content("https://example.com", {'title': 'h1', 'link': 'a[href'})
+        fetch.assert_not_called()
+    
+    @patch('src.web_scraper.scraper.requests.Session.get')
+    def test_extraction_plan(self, mock_get):
+        """한 번 훑는 필드 추출과 XPath 경로의 결과가 필드별 select_one과 같음, 타임스탬프는 페이지당 하나"""
+        items = ''.join(f'<li class="item"><h3 class="title"><a href="/p/{i}">Item {i}</a></h3>'
+                        f'<img src="/img/{i}.png"><script>skip()</script><div class="meta"><span class="by">by {i}</span>'
+                        f'</div>{"<b class=price>9.99</b>" if i % 2 else ""}</li>' for i in range(20))
+        html = f'<html><body><ul class="listing">{items}</ul><p class="by">outside</p></body></html>'
+        mock_get.return_value.content = html.encode('utf-8')
+        simple = {'item': 'ul > li.item', 'title': '.title', 'link': 'a[href]', 'image': 'img[src]', 'price': '.price'}
+        nested = dict(simple, author='.meta span.by', heading='h3 > a')
+        
+        soup = BeautifulSoup(html, 'lxml')
+        for selectors in (simple, nested):
+            expected = []
+            for element in soup.select(selectors['item']):
+                row = {'item': element.get_text(strip=True)}
+                for field, selector in list(selectors.items())[1:]:
+                    tag = element.select_one(selector)
+                    row[field] = None if tag is None else (
+                        tag.get('href') or tag.get('src') if selector.endswith(('[href]', '[src]')) else tag.get_text(strip=True))
+                expected.append(row)
+        
+            scraper = WebScraper(delay=0)
+            assert scraper.extraction_plan(selectors).xpath_ready == (selectors is simple)
+            for xpath in (False, True):
+                rows = scraper.scrape_generic_content("https://example.com", selectors, xpath=xpath)
+                assert len({row.pop('scraped_at') for row in rows}) == 1
+                assert rows == expected
+        assert expected[0]['price'] is None and expected[1]['price'] == '9.99' and expected[0]['image'] == '/img/0.png'
+    
+    def test_row_sink(self, tmp_path):
+        """행을 바로 덧붙여 쓰고 flush_rows마다 디스크로, 크기 / 시간 / 새 열에 따라 새 파일"""
+        now = [0.0]
+        base = str(tmp_path / "rows")
+        sink = RowSink(base, 'csv', flush_rows=2, flush_interval=0, rotate_interval=60, clock=lambda: now[0])
+        sink.write_many([{'title': 'A', 'source': 'X'}, {'title': 'B', 'source': 'X'}])
+        assert pd.read_csv(sink.path, encoding='utf-8-sig')['title'].tolist() == ['A', 'B']  # 닫기 전에도 읽힘
+        sink.write({'title': 'C', 'source': 'Y', 'link': '/c'})  # 새 열 -> 새 파일
+        now[0] = 61
+        sink.write({'title': 'D', 'source': 'Y'})  # rotate_interval 초과 -> 새 파일
+        sink.close()
+        assert len(sink.paths) == 3 and sink.rows_written == 4
+        assert all(os.path.basename(path).startswith("rows_") for path in sink.paths)
+        last = pd.read_csv(sink.paths[2], encoding='utf-8-sig')
+        assert list(last.columns) == ['title', 'source', 'link'] and last['title'].tolist() == ['D']
+        with pytest.raises(ValueError):
+            sink.write({'title': 'E'})
+        
+        with RowSink(str(tmp_path / "big"), 'jsonl', compress=True, max_bytes=2048, flush_rows=10) as sink:
+            sink.write_many({'title': f'제목 {i}', 'payload': os.urandom(64).hex()} for i in range(200))
+        assert len(sink.paths) > 1 and all(path.endswith('.jsonl.gz') for path in sink.paths)
+        rows = [json.loads(line) for path in sink.paths for line in gzip.open(path, 'rt', encoding='utf-8')]
+        assert [row['title'] for row in rows] == [f'제목 {i}' for i in range(200)]
+        
+        with pytest.raises(ValueError):
+            RowSink(base, 'xml')
+        
+        # fieldnames에 없는 키가 첫 행에 있으면 그 뒤에 열로 추가
+        with RowSink(str(tmp_path / "fields"), 'csv', fieldnames=['source', 'title']) as sink:
+            sink.write({'title': 'A', 'source': 'X', 'link': '/a'})
+        assert list(pd.read_csv(sink.path, encoding='utf-8-sig').columns) == ['source', 'title', 'link']
+    
+    @patch('src.web_scraper.scraper.requests.Session.get')
+    def test_scraper_streams_to_sink(self, mock_get, mock_html, tmp_path):
+        """sink가 있으면 사이트마다 수집한 행을 바로 기록"""
+        mock_get.return_value.content = mock_html.encode('utf-8')
+        sites = [{'name': 'A', 'url': 'https://a.example.com', 'selector': 'h1 a, h2 a'},
+                 {'name': 'B', 'url': 'https://b.example.com', 'selector': '.news-item a'}]
+        with RowSink(str(tmp_path / "news"), 'jsonl', flush_rows=1) as sink:
+            scraper = WebScraper(delay=0, sink=sink)
+            headlines = scraper.scrape_news_headlines(sites)
+            with open(sink.path, encoding='utf-8') as f:
+                streamed = [json.loads(line) for line in f]
+        assert sorted(row['title'] for row in streamed) == sorted(item['title'] for item in headlines)
+        assert len(streamed) == 3
+    
+    @patch('src.web_scraper.scraper.requests.Session.get')
+    def test_sink_failure_keeps_other_sites(self, mock_get, mock_html):
+        """한 사이트의 저장 실패가 다른 사이트의 결과를 버리지 않음"""
+        mock_get.return_value.content = mock_html.encode('utf-8')
+        sites = [{'name': 'A', 'url': 'https://a.example.com', 'selector': 'h1 a, h2 a'},
+                 {'name': 'B', 'url': 'https://b.example.com', 'selector': '.news-item a'}]
+        def write_many(rows):
+            if rows[0]['source'] == 'A':
+                raise OSError("disk full")
+        sink = Mock()
+        sink.write_many.side_effect = write_many
+        scraper = WebScraper(delay=0, sink=sink)
+        headlines = scraper.scrape_news_headlines(sites)
+        assert {item['source'] for item in headlines} == {'A', 'B'}
+        assert sink.write_many.call_count == 2
+    
     def test_session_headers(self, scraper):
         """세션 헤더 설정 테스트"""
         assert 'User-Agent' in scraper.session.headers